@@ -0,0 +1,62 @@
+"""
+Benchmark of the date-range filter on a large synthetic conversation
+
+Compares the binary-searched window on sorted (newest first) columns with
+the full scan used for unsorted ones, for ranges of decreasing width.
+
+Usage: python benchmarks/date_filter.py [messages]
+"""
+import sys
+from os.path import abspath, dirname
+from timeit import repeat
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from columns import UNSORTED, FileColumns  # noqa: E402
+
+DAY = 24 * 60 * 60 * 1000
+NOW = 1700000000000
+
+
+def make_columns(messages):
+    """Builds a newest-first conversation spanning ten years"""
+    columns = FileColumns('Benchmark', ['A', 'B'], False)
+    columns.senders = ['A', 'B']
+    step = 10 * 365 * DAY // messages
+    for index in range(messages):
+        columns.timestamps.append(NOW - index * step)
+        columns.sender_ids.append(index % 2)
+        columns.chars.append(index % 40)
+        columns.call_durations.append(0)
+        columns.photos.append(index % 50 == 0)
+        columns.gifs.append(0)
+        columns.videos.append(0)
+        columns.files.append(0)
+    columns.detect_order()
+    return columns
+
+
+def best_of(function, number=3):
+    """Returns the best run time of a function, in milliseconds"""
+    return min(repeat(function, number=1, repeat=number)) * 1000
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    columns = make_columns(messages)
+    order = columns.order
+    print(f'{messages} messages, newest first')
+    print(f'{"range":>10} {"window ms":>10} {"scan ms":>10} {"speedup":>8}')
+
+    for label, days in (('10 years', 3650), ('1 year', 365), ('1 month', 30), ('1 day', 1)):
+        start, end = NOW - days * DAY, NOW + 1
+
+        columns.order = order
+        windowed = best_of(lambda: columns.summarize(start, end))
+        columns.order = UNSORTED
+        scanned = best_of(lambda: columns.summarize(start, end))
+        print(f'{label:>10} {windowed:>10.1f} {scanned:>10.1f} {scanned / windowed:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+Headless stand-ins for the GUI libraries
+
+Installs dummy tkinter, PIL and tkcalendar modules (the way
+tests/test_main_page.py does), so the application modules can be imported
+and their methods benchmarked without a display or the GUI dependencies.
+Must be called before any application module importing tkinter.
+"""
+import sys
+from unittest.mock import MagicMock
+
+
+class DummyWidget:
+    """Base class for the widget classes the application subclasses; every method is a no-op"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def install():
+    """Registers the stand-in modules in sys.modules"""
+    tk = MagicMock()
+    ttk = MagicMock()
+    tk.Tk = tk.Toplevel = tk.Frame = ttk.Frame = DummyWidget
+    tk.NO = 'no'
+    # IMPORTANT: Link them, `from tkinter import ttk` and `tk.ttk` must be the same module
+    tk.ttk = ttk
+    sys.modules.update({
+        'tkinter': tk,
+        'tkinter.ttk': ttk,
+        'tkinter.filedialog': tk.filedialog,
+        'tkinter.messagebox': tk.messagebox,
+        'PIL': MagicMock(),
+        'tkcalendar': MagicMock(),
+    })
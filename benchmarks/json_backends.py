@@ -0,0 +1,56 @@
+"""
+Benchmark of the JSON backends on a scaled-up copy of SampleData
+
+Every SampleData conversation is inflated to the requested number of
+messages (repeating its own messages with shifted timestamps), then each
+installed backend decodes the resulting documents.
+
+Usage: python benchmarks/json_backends.py [messages per conversation]
+"""
+import glob
+import json
+import sys
+from os.path import abspath, dirname, join
+from timeit import repeat
+
+ROOT = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import json_backend  # noqa: E402
+
+
+def scaled_documents(messages):
+    """Returns the SampleData documents, each inflated to `messages` messages, as bytes"""
+    documents = []
+    for file in sorted(glob.glob(join(ROOT, 'SampleData', '*', '*.json'))):
+        with open(file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        original = data['messages']
+        data['messages'] = [
+            dict(original[index % len(original)],
+                 timestamp_ms=original[index % len(original)]['timestamp_ms'] - index * 60000)
+            for index in range(messages)
+        ]
+        documents.append(json.dumps(data).encode('utf-8'))
+    return documents
+
+
+def best_of(function, number=3):
+    """Returns the best run time of a function, in milliseconds"""
+    return min(repeat(function, number=1, repeat=number)) * 1000
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    documents = scaled_documents(messages)
+    megabytes = sum(map(len, documents)) / 1024 / 1024
+    print(f'{len(documents)} documents, {messages} messages each, {megabytes:.1f} MB')
+    print(f'{"backend":>8} {"ms":>9} {"MB/s":>8}')
+
+    for backend in json_backend.available_backends():
+        elapsed = best_of(lambda: [json_backend.loads(document, backend) for document in documents])
+        print(f'{backend:>8} {elapsed:>9.1f} {megabytes / elapsed * 1000:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
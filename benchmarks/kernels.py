@@ -0,0 +1,75 @@
+"""
+Micro-benchmark of the per-message extraction loops
+
+Writes a synthetic export file of each schema, then times the generic loop
+(probing both schemas for every field) against the loop specialized for
+the file's schema.
+
+Usage: python benchmarks/kernels.py [messages]
+"""
+import json
+import os
+import sys
+import tempfile
+from os.path import abspath, dirname
+from timeit import repeat
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import extraction  # noqa: E402
+
+
+def legacy_message(index):
+    message = {
+        'sender_name': 'JaÅ\u009b' if index % 2 else 'John Doe',
+        'timestamp_ms': 1700000000000 - index * 1000,
+        'content': 'ZaÅ¼Ã³Å\u0082Ä\u0087' if index % 10 == 0 else 'hello there',
+        'is_geoblocked_for_viewer': False,
+    }
+    if index % 50 == 0:
+        message['photos'] = [{'uri': 'photo.jpg'}]
+    return message
+
+
+def camel_case_message(index):
+    message = {
+        'senderName': 'Jaś' if index % 2 else 'John Doe',
+        'timestamp': 1700000000000 - index * 1000,
+        'text': 'Zażółć' if index % 10 == 0 else 'hello there',
+        'type': 'text',
+        'isUnsent': False,
+    }
+    if index % 50 == 0:
+        message['media'] = [{'uri': 'photo.jpg'}]
+    return message
+
+
+def load_synthetic(make_message, messages):
+    """Writes a synthetic export file and loads its messages back like the extractor does"""
+    with tempfile.TemporaryDirectory() as directory:
+        file = os.path.join(directory, 'message_1.json')
+        with open(file, 'w', encoding='utf-8') as f:
+            json.dump({'messages': [make_message(index) for index in range(messages)]}, f)
+        with open(file, 'r', encoding='utf-8') as f:
+            return json.load(f)['messages']
+
+
+def best_of(function, number=3):
+    """Returns the best run time of a function, in milliseconds"""
+    return min(repeat(function, number=1, repeat=number)) * 1000
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print(f'{messages} messages per file')
+    print(f'{"schema":>10} {"generic ms":>11} {"kernel ms":>10} {"speedup":>8}')
+
+    for label, make_message in (('legacy', legacy_message), ('camelCase', camel_case_message)):
+        data = load_synthetic(make_message, messages)
+        generic = best_of(lambda: list(extraction._generic_rows(data)))
+        specialized = best_of(lambda: list(extraction._message_rows(data)))
+        print(f'{label:>10} {generic:>11.1f} {specialized:>10.1f} {generic / specialized:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
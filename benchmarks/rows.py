@@ -0,0 +1,146 @@
+"""
+Benchmarks of the main list's row model at 10k and 100k conversations
+
+Real exports of that many conversations are rare and slow to generate, so
+the rows are made up directly, the way LoadingPopup builds them, and the
+real MainPage methods are timed on them (see run.make_page):
+
+    build            RowModel.set_row for every row (typed sort keys and
+                     the search index)
+    sort_number      MainPage.sort_treeview on the message column
+    sort_string      MainPage.sort_treeview on the name column
+    multi_sort       MainPage.apply_multi_sort, type then messages descending
+                     (mixed directions, chained stable sorts)
+    multi_sort_same  MainPage.apply_multi_sort, type then messages ascending
+                     (one sort on a composite key)
+    render           VirtualTable.refresh after a sort
+    search           MainPage.search for part of a surname, from scratch
+    search_typing    MainPage.search for every prefix of a name being typed,
+                     each refining the previous one
+
+    python benchmarks/rows.py [--tiers rows-10k,rows-100k] [--repeat 9] [--check] [--save-baseline]
+
+Results are gated against the same baselines file as run.py.
+"""
+import argparse
+import random
+import sys
+from types import SimpleNamespace
+
+import run
+from row_model import RowModel
+from synthetic_export import person_name
+from utils import PREFIX
+
+# Tier name -> number of rows
+TIERS = {
+    'rows-10k': 10_000,
+    'rows-100k': 100_000,
+}
+
+
+def make_rows(count, seed=0):
+    """Returns (row index, values) pairs shaped like LoadingPopup's rows"""
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        people = {person_name(rng) for _ in range(rng.choice((1, 1, 1, 2, 5)))}
+        title = next(iter(people)) if len(people) == 1 else f'Group {rng.randrange(count)}'
+        room = 'Private chat' if len(people) == 1 else 'Group chat'
+        messages = int(rng.paretovariate(1.2) * 10)
+        rows.append((index, (
+            title, people, room, messages, rng.randrange(10000), messages // 30, messages // 200,
+            messages // 100, messages // 500, messages * 40, f'{PREFIX}all#{index}',
+        )))
+    return rows
+
+
+def run_tier(name, count, repeat):
+    """Times every benchmark on one tier's rows, returns the result records"""
+    rows = make_rows(count)
+    page = run.make_page()
+
+    def build():
+        model = RowModel()
+        for index, values in rows:
+            model.set_row(index, values)
+        return model
+
+    def fresh_page():
+        page.rows.clear()
+        for index, values in rows:
+            page.rows.set_row(index, values)
+
+    stats = {}
+    stats['build'], _ = run.measure(build, repeat)
+    fresh_page()
+    stats['sort_number'], _ = run.measure(lambda: page.sort_treeview('msg', True, 'numberwise'), repeat, fresh_page)
+    stats['sort_string'], _ = run.measure(lambda: page.sort_treeview('name', False, 'stringwise'), repeat, fresh_page)
+    stats['multi_sort'], _ = run.measure(lambda: page.apply_multi_sort(), repeat, fresh_page)
+    page.columns_reversed['msg'] = False
+    stats['multi_sort_same'], _ = run.measure(lambda: page.apply_multi_sort(), repeat, fresh_page)
+    stats['render'], _ = run.measure(lambda: page.table.refresh(), repeat)
+
+    def search(*queries):
+        def function():
+            for query in queries:
+                page.search_entry = SimpleNamespace(get=lambda: query)
+                page.search()
+        return function
+
+    def forget_last_search():
+        page.rows.index.last = None
+
+    stats['search'], _ = run.measure(search('wiśn'), repeat, forget_last_search)
+    stats['search_typing'], _ = run.measure(search('m', 'mü', 'mül', 'müll', 'mülle'), repeat, forget_last_search)
+
+    return [
+        dict({'tier': name, 'rows': count, 'benchmark': benchmark}, **values)
+        for benchmark, values in stats.items()
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Times building, sorting and rendering the row model.')
+    parser.add_argument('--tiers', default='rows-10k,rows-100k', help=f"comma-separated tiers: {', '.join(TIERS)}")
+    parser.add_argument('--repeat', type=int, default=9, help='timed runs per benchmark')
+    parser.add_argument('--baseline', default=run.BASELINE_PATH, help='baseline file (default benchmarks/baselines.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baselines')
+    parser.add_argument('--check', action='store_true', help='fail when a benchmark regressed against its baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed regression, fraction of the baseline')
+    args = parser.parse_args(argv)
+
+    tiers = [tier.strip() for tier in args.tiers.split(',') if tier.strip()]
+    unknown = [tier for tier in tiers if tier not in TIERS]
+    if unknown:
+        parser.error(f"unknown tier(s) {', '.join(unknown)}")
+
+    def measure_tier(tier):
+        records = run_tier(tier, TIERS[tier], args.repeat)
+        for record in records:
+            print(f'{record["tier"]:>10} {record["benchmark"]:>16} {record["median"]:>10.4f} '
+                  f'{record["p95"]:>10.4f} {record["peak_kb"]:>10.0f}')
+        return records
+
+    results = []
+    print(f'{"tier":>10} {"benchmark":>16} {"median s":>10} {"p95 s":>10} {"peak KiB":>10}')
+    for tier in tiers:
+        results.extend(measure_tier(tier))
+
+    if args.save_baseline:
+        run.save_baselines(args.baseline, results)
+        print(f'Baselines written to {args.baseline}')
+    if args.check:
+        regressions = run.confirm_regressions(
+            results, run.load_baselines(args.baseline), args.threshold, measure_tier
+        )
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            return 1
+        print(f'No regressions beyond {args.threshold:.0%}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
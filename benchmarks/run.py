@@ -0,0 +1,454 @@
+"""
+Scalable benchmark suite and performance regression gate for CounterForMessenger
+
+For every size tier a synthetic export is generated (see synthetic_export)
+and the main user-facing operations are timed:
+
+    ingest_cold      MasterWindow.extract_all_conversations without any cache
+    ingest_disk      the same with a warm persistent ingestion cache
+    ingest_memory    a new date range, answered from the column store
+    popup_data       extract_data and the statistics popup's derived values
+                     for the largest conversation
+    populate         LoadingPopup filling the row model batch by batch,
+                     keeping it sorted by messages and rendered
+    sort_number      MainPage.sort_treeview on the message column
+    sort_string      MainPage.sort_treeview on the name column
+    multi_sort       MainPage.apply_multi_sort on type, then messages
+    search           MainPage.search for a common substring of the names
+
+Everything runs headless: tkinter and PIL are replaced by stand-ins (see
+headless) and the real MasterWindow, LoadingPopup and MainPage methods are
+called on plain objects holding a row model and a virtual table drawing
+into an in-memory treeview. Each benchmark gets one untimed warm-up run,
+then records the fastest, median and 95th percentile run time and the
+peak memory allocated during one extra traced run.
+
+    python benchmarks/run.py [--tiers small,medium] [--repeat 9] [--output results.json]
+    python benchmarks/run.py --save-baseline        stores the results in baselines.json
+    python benchmarks/run.py --check [--threshold 0.25]
+
+With --check the results are compared to the stored baselines and the
+exit code is 1 when a benchmark's peak memory or run time grew by more
+than the threshold (a fraction of the baseline) and by more than an
+absolute noise floor (MIN_KB, MIN_SECONDS). A run time only counts as
+grown when both the median and the fastest run exceed the baseline's
+median: a busy machine slows some runs down, but rarely all of them.
+A tier with regressions is run once more and only the regressions that
+show up again are reported, each benchmark keeping its faster round.
+p95 is stored for reference but not gated, it is too noisy with few runs.
+"""
+import argparse
+import importlib
+import inspect
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from collections import deque
+from contextlib import redirect_stdout
+from datetime import datetime
+from glob import glob
+from os import listdir
+from os.path import abspath, dirname, getsize, join
+from time import perf_counter
+from types import SimpleNamespace
+
+ROOT = dirname(abspath(__file__))
+sys.path.insert(0, dirname(ROOT))
+
+import headless  # noqa: E402
+
+headless.install()
+
+from Main import MasterWindow  # noqa: E402
+from columns import ColumnStore  # noqa: E402
+from gui.main_page import MainPage  # noqa: E402
+from gui.virtual_table import VirtualTable  # noqa: E402
+from json_backend import resolve_backend  # noqa: E402
+from popups.loading_popup import LoadingPopup  # noqa: E402
+from row_model import RowModel  # noqa: E402
+from synthetic_export import generate_export  # noqa: E402
+
+# Tier name -> (conversations, average messages per conversation)
+TIERS = {
+    'small': (50, 200),
+    'medium': (500, 1000),
+    'large': (2000, 2500),
+}
+
+# Stored baselines, keyed '<tier>/<benchmark>'
+BASELINE_PATH = join(ROOT, 'baselines.json')
+
+# Differences below these are never a regression (timer and allocator noise)
+MIN_SECONDS = 0.005
+MIN_KB = 64
+
+USERNAME = 'John Doe'
+
+class MemoryTreeview:
+    """The parts of ttk.Treeview the virtual table uses, kept in memory"""
+
+    def __init__(self, height=20):
+        self.height = height
+        self.rows = {}
+        self.order = []
+        self.selected = ()
+
+    def cget(self, option):
+        return self.height
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def insert(self, parent='', index='end', values=()):
+        item = f'I{len(self.rows):06X}'
+        self.rows[item] = {'values': list(values), 'tags': ()}
+        self.order.append(item)
+        return item
+
+    def delete(self, *items):
+        for item in items:
+            del self.rows[item]
+            self.order.remove(item)
+
+    def item(self, item, **options):
+        if options:
+            self.rows[item].update(options)
+            return None
+        return dict(self.rows[item])
+
+    def selection_set(self, items):
+        self.selected = tuple(items)
+
+    def selection(self):
+        return self.selected
+
+    def bbox(self, item):
+        return ''
+
+    def tag_configure(self, *args, **kwargs):
+        pass
+
+    def heading(self, *args, **kwargs):
+        pass
+
+
+def bind(instance, cls, *names):
+    """Attaches methods of cls to a stand-in instance, so they can call each other like bound methods"""
+    for name in names:
+        # Looked up statically, so staticmethods stay unbound
+        setattr(instance, name, inspect.getattr_static(cls, name).__get__(instance, cls))
+    return instance
+
+
+def make_window(inbox, cache_path, column_store, from_date, workers):
+    """Builds a stand-in MasterWindow holding the user data of one benchmark run"""
+    window = SimpleNamespace(
+        directory=inbox, username=USERNAME, from_date_entry=from_date, to_date_entry='',
+        lang_mdl=importlib.import_module('langs.English'), workers=workers, json_backend=resolve_backend(),
+        column_store=column_store, cache_path=cache_path, conversations=None, index_path=None,
+    )
+    return bind(window, MasterWindow, '_engine', '_normalize_dates', 'get_username', 'get_workers',
+                'extract_data', 'extract_all_conversations')
+
+
+def make_page(rows=()):
+    """Builds a stand-in MainPage whose row model holds one row per conversation"""
+    theme = SimpleNamespace(TREEVIEW_EVEN_ROW='#ffffff', TREEVIEW_ODD_ROW='#eeeeee')
+    treeview, model = MemoryTreeview(), RowModel()
+    page = SimpleNamespace(
+        treeview=treeview,
+        rows=model,
+        table=VirtualTable(treeview, SimpleNamespace(set=lambda first, last: None), model),
+        controller=SimpleNamespace(get_theme=lambda: theme),
+        module=importlib.import_module('langs.English'),
+        search_entry=SimpleNamespace(get=lambda: 'an'),
+        search_job=None,
+        sort_state=None,
+        sort_columns=['type', 'msg'],
+        columns_reversed={'type': False, 'msg': True},
+        column_biases={
+            'name': 'stringwise', 'type': 'stringwise', 'msg': 'numberwise', 'call': 'numberwise',
+            'photos': 'numberwise', 'gifs': 'numberwise', 'videos': 'numberwise', 'files': 'numberwise',
+        },
+    )
+    bind(page, MainPage, 'sort_treeview', 'apply_multi_sort', 'search', 'set_treeview_theme', 'refresh_row_order')
+    if rows:
+        populate(page, rows)
+    return page
+
+
+def populate(page, rows):
+    """Fills a page's row model through LoadingPopup, as rows arrive during an upload"""
+    popup = SimpleNamespace(
+        rows=page.rows,
+        controller=SimpleNamespace(sent_messages=0, total_messages=0, total_chars=0, total_conversations=0),
+        pending_changes=deque((index, row, True) for index, row in enumerate(rows)),
+        items={},
+        on_rows_changed=page.refresh_row_order,
+        profile_session=None,
+    )
+    bind(popup, LoadingPopup, '_apply_changes', '_insert_batch', '_count')
+    while popup.pending_changes:
+        popup._apply_changes()
+
+
+def popup_data(conversation):
+    """Derives what the statistics popup shows for a conversation, without the widgets"""
+    (_, people, _, all_msgs, _, calltime, _, start_date, _, _, _, _, participant_chars) = conversation
+    participants = [f'{participant} - {messages}' for participant, messages in people.items()]
+    chars = sorted(participant_chars.items(), key=lambda item: item[1], reverse=True)
+    seconds = max(1, int(datetime.now().timestamp() - start_date / 1000))
+    averages = [all_msgs / (seconds / period) for period in (86400, 7 * 86400, 30 * 86400, 365 * 86400)]
+    return participants, chars, averages, calltime
+
+
+def measure(function, repeat, setup=None):
+    """
+    Times a function
+
+    Args:
+        function: Callable to time, without arguments
+        repeat: Number of timed runs
+        setup: Optional callable run (untimed) before every run
+
+    Returns:
+        (stats, result): dict with the fastest, median and p95 run time in
+        seconds and the peak traced memory in KiB, and the last run's result
+    """
+    # Warm-up run, the first call pays for imports and cold caches
+    if setup is not None:
+        setup()
+    function()
+
+    times, result = [], None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = perf_counter()
+        result = function()
+        times.append(perf_counter() - started)
+
+    # Memory is traced in a separate run, tracing slows the code down
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    p95 = statistics.quantiles(times, n=20, method='inclusive')[-1] if len(times) > 1 else times[0]
+    return {
+        'min': round(min(times), 6),
+        'median': round(statistics.median(times), 6),
+        'p95': round(p95, 6),
+        'peak_kb': round(peak / 1024, 1),
+    }, result
+
+
+def run_tier(name, conversations, messages, repeat, workers):
+    """
+    Generates one tier's export and times every benchmark on it
+
+    Returns:
+        List of result records (dicts)
+    """
+    directory = tempfile.mkdtemp(prefix=f'cfm-{name}-')
+    try:
+        inbox = generate_export(join(directory, 'inbox'), conversations, messages, username=USERNAME, seed=0)
+        cache_path = join(directory, 'ingest-cache.sqlite3')
+        store = ColumnStore()
+
+        def window(cache=None, column_store=None, from_date=''):
+            column_store = column_store if column_store is not None else ColumnStore()
+            return make_window(inbox, cache, column_store, from_date, workers)
+
+        stats = {}
+        stats['ingest_cold'], rows = measure(lambda: window().extract_all_conversations(), repeat)
+        # Fill the disk cache once, then measure loading from it into an empty column store
+        window(cache_path).extract_all_conversations()
+        stats['ingest_disk'], _ = measure(lambda: window(cache_path).extract_all_conversations(), repeat)
+        window(column_store=store).extract_all_conversations()
+        stats['ingest_memory'], _ = measure(
+            lambda: window(column_store=store, from_date='2020-01-01').extract_all_conversations(), repeat
+        )
+
+        # The statistics popup of the biggest conversation, on disk
+        folder = max(
+            (folder for folder in listdir(inbox) if folder != 'e2e'),
+            key=lambda folder: sum(getsize(path) for path in glob(join(inbox, folder, '*.json')))
+        )
+        stats['popup_data'], _ = measure(lambda: popup_data(window(column_store=store).extract_data(folder)), repeat)
+
+        def sorted_page():
+            page = make_page()
+            page.sort_state = ('msg', True, 'numberwise')
+            return page
+
+        stats['populate'], _ = measure(lambda: populate(sorted_page(), rows), repeat)
+
+        page = None
+
+        def fresh_page():
+            nonlocal page
+            page = make_page(rows)
+
+        stats['sort_number'], _ = measure(lambda: page.sort_treeview('msg', True, 'numberwise'), repeat, fresh_page)
+        stats['sort_string'], _ = measure(lambda: page.sort_treeview('name', False, 'stringwise'), repeat, fresh_page)
+        stats['multi_sort'], _ = measure(lambda: page.apply_multi_sort(), repeat, fresh_page)
+        stats['search'], _ = measure(lambda: page.search(), repeat, fresh_page)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return [
+        dict({'tier': name, 'conversations': conversations, 'messages': messages, 'rows': len(rows),
+              'benchmark': benchmark}, **values)
+        for benchmark, values in stats.items()
+    ]
+
+
+def load_baselines(path):
+    """Returns the stored baselines, an empty dict if there are none"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(path, results):
+    """Stores the results as baselines, keeping those of tiers that weren't run"""
+    baselines = load_baselines(path)
+    for record in results:
+        baselines[f'{record["tier"]}/{record["benchmark"]}'] = {
+            key: record[key] for key in ('median', 'p95', 'peak_kb')
+        }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(baselines.items())), f, indent=2)
+        f.write('\n')
+
+
+def find_regressions(results, baselines, threshold):
+    """
+    Compares results to their baselines
+
+    Args:
+        results: Result records of this run
+        baselines: Stored baselines, keyed '<tier>/<benchmark>'
+        threshold: Allowed growth, as a fraction of the baseline
+
+    Returns:
+        List of messages, one per regressed measurement
+    """
+    regressions = []
+    for record in results:
+        key = f'{record["tier"]}/{record["benchmark"]}'
+        baseline = baselines.get(key)
+        if baseline is None:
+            print(f'No baseline for {key}')
+            continue
+        limit = max(baseline['median'] * (1 + threshold), baseline['median'] + MIN_SECONDS)
+        median, fastest = record['median'], record.get('min', record['median'])
+        if median > limit and fastest > limit:
+            regressions.append(
+                f'{key}: median {median:.4f}s, fastest {fastest:.4f}s, baseline {baseline["median"]:.4f}s'
+            )
+        peak = record['peak_kb']
+        if peak > baseline['peak_kb'] * (1 + threshold) and peak - baseline['peak_kb'] > MIN_KB:
+            regressions.append(
+                f'{key}: peak memory {peak:.0f} KiB, baseline {baseline["peak_kb"]:.0f} KiB'
+            )
+    return regressions
+
+
+def confirm_regressions(results, baselines, threshold, rerun):
+    """
+    Runs the tiers with regressions once more, to tell them from noise
+
+    Args:
+        results: Result records of this run, a benchmark's record is
+            replaced by its second round when that one is faster
+        baselines: Stored baselines, keyed '<tier>/<benchmark>'
+        threshold: Allowed growth, as a fraction of the baseline
+        rerun: Callable returning the new result records of a tier
+
+    Returns:
+        List of messages, one per measurement that regressed in both rounds
+    """
+    regressions = find_regressions(results, baselines, threshold)
+    tiers = {regression.split('/', 1)[0] for regression in regressions}
+    if not tiers:
+        return regressions
+    for tier in dict.fromkeys(record['tier'] for record in results):
+        if tier not in tiers:
+            continue
+        print(f'Running {tier} again to rule out noise')
+        second = {record['benchmark']: record for record in rerun(tier)}
+        for i, record in enumerate(results):
+            again = second.get(record['benchmark']) if record['tier'] == tier else None
+            if again is not None and again['median'] < record['median']:
+                results[i] = again
+    return find_regressions(results, baselines, threshold)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Times ingestion, sorting, searching and popup data preparation.')
+    parser.add_argument('--tiers', default='small,medium', help=f"comma-separated tiers: {', '.join(TIERS)}")
+    parser.add_argument('--repeat', type=int, default=9, help='timed runs per benchmark')
+    parser.add_argument('--workers', type=int, default=1, help='extraction worker processes')
+    parser.add_argument('--output', '-o', default='benchmark-results.json', help='JSON file for the results')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline file (default benchmarks/baselines.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baselines')
+    parser.add_argument('--check', action='store_true', help='fail when a benchmark regressed against its baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed regression, fraction of the baseline')
+    args = parser.parse_args(argv)
+
+    tiers = [tier.strip() for tier in args.tiers.split(',') if tier.strip()]
+    unknown = [tier for tier in tiers if tier not in TIERS]
+    if unknown:
+        parser.error(f"unknown tier(s) {', '.join(unknown)}")
+
+    def measure_tier(tier):
+        conversations, messages = TIERS[tier]
+        # Extraction diagnostics go to stderr, so stdout only carries the table
+        with redirect_stdout(sys.stderr):
+            records = run_tier(tier, conversations, messages, args.repeat, args.workers)
+        for record in records:
+            print(f'{record["tier"]:>8} {record["benchmark"]:>14} {record["median"]:>10.4f} {record["p95"]:>10.4f} '
+                  f'{record["peak_kb"]:>10.0f}')
+        return records
+
+    results = []
+    print(f'{"tier":>8} {"benchmark":>14} {"median s":>10} {"p95 s":>10} {"peak KiB":>10}')
+    for tier in tiers:
+        results.extend(measure_tier(tier))
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'workers': args.workers,
+            'repeat': args.repeat,
+            'results': results,
+        }, f, indent=2)
+        f.write('\n')
+    print(f'Results written to {args.output}')
+
+    if args.save_baseline:
+        save_baselines(args.baseline, results)
+        print(f'Baselines written to {args.baseline}')
+    if args.check:
+        regressions = confirm_regressions(results, load_baselines(args.baseline), args.threshold, measure_tier)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            return 1
+        print(f'No regressions beyond {args.threshold:.0%}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Deterministic synthetic Messenger export generator
+
+Writes an inbox folder shaped like a real Facebook export, of any size:
+regular conversation folders (legacy or camelCase schema, mojibake-encoded
+text in legacy files, split over message_N.json files newest first) and an
+e2e folder whose contacts partly match the private chats. The same
+arguments and seed always produce the same export.
+
+Usage: python benchmarks/synthetic_export.py DIRECTORY [--conversations N] [--messages N] ...
+"""
+import argparse
+import json
+import os
+import random
+
+# Names with non-ASCII letters, so mojibake repair has work to do
+FIRST_NAMES = ['Jaś', 'Zoë', 'Łukasz', 'Émile', 'Ana', 'John', 'Mária', 'Søren', 'Ayşe', 'Chloé', 'Nguyễn', 'Olga']
+LAST_NAMES = ['Wiśniewski', 'Müller', 'Smith', 'Gonçalves', 'Dvořák', 'Öztürk', 'Brown', 'Nováková', 'García']
+WORDS = ['hello', 'zażółć', 'gęślą', 'jaźń', 'ok', 'see', 'you', 'tomorrow', 'café', 'naïve', '😂', 'lol', 'what']
+
+# Timestamps of the generated messages end here and go back in time
+NEWEST_TS = 1700000000000
+
+
+def mojibake(text):
+    """Encodes text the way legacy exports do (UTF-8 bytes read as Latin-1)"""
+    return text.encode('utf-8').decode('latin1')
+
+
+def person_name(rng):
+    return f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.randrange(1000)}'
+
+
+def legacy_message(rng, sender, timestamp):
+    message = {
+        'sender_name': mojibake(sender),
+        'timestamp_ms': timestamp,
+        'content': mojibake(' '.join(rng.choice(WORDS) for _ in range(rng.randrange(1, 12)))),
+        'is_geoblocked_for_viewer': False,
+    }
+    roll = rng.random()
+    if roll < 0.03:
+        message['photos'] = [{'uri': 'photo.jpg', 'creation_timestamp': timestamp // 1000}]
+    elif roll < 0.04:
+        message['videos'] = [{'uri': 'video.mp4'}]
+    elif roll < 0.045:
+        message['gifs'] = [{'uri': 'gif.gif'}]
+    elif roll < 0.05:
+        message['files'] = [{'uri': 'file.pdf'}]
+    elif roll < 0.055:
+        del message['content']
+        message['call_duration'] = rng.randrange(3600)
+    return message
+
+
+def camel_case_message(rng, sender, timestamp):
+    message = {
+        'isUnsent': False,
+        'media': [],
+        'reactions': [],
+        'senderName': sender,
+        'text': ' '.join(rng.choice(WORDS) for _ in range(rng.randrange(1, 12))),
+        'timestamp': timestamp,
+        'type': 'text',
+    }
+    if rng.random() < 0.05:
+        message['media'] = [{'uri': 'media.jpg'}]
+    return message
+
+
+def _write_json(path, data, schema):
+    with open(path, 'w', encoding='utf-8') as f:
+        # Legacy exports are pure ASCII, camelCase ones raw UTF-8
+        json.dump(data, f, ensure_ascii=schema == 'legacy', indent=2)
+
+
+def write_conversation(folder, rng, title, people, messages, schema, messages_per_file, group):
+    """Writes one conversation folder, split over message_N.json files with the newest messages first"""
+    os.makedirs(folder, exist_ok=True)
+    make_message = legacy_message if schema == 'legacy' else camel_case_message
+    timestamp = NEWEST_TS - rng.randrange(10 ** 9)
+    rows = []
+    for _ in range(messages):
+        rows.append(make_message(rng, rng.choice(people), timestamp))
+        timestamp -= rng.randrange(1000, 4 * 3600 * 1000)
+
+    for number, start in enumerate(range(0, max(messages, 1), messages_per_file), 1):
+        chunk = rows[start:start + messages_per_file]
+        if schema == 'legacy':
+            data = {
+                'participants': [{'name': mojibake(name)} for name in people],
+                'messages': chunk,
+                'title': mojibake(title),
+                'is_still_participant': True,
+                'thread_path': f'inbox/{os.path.basename(folder)}',
+                'magic_words': [],
+            }
+            if group:
+                data['joinable_mode'] = {'mode': 1, 'link': ''}
+        else:
+            data = {'participants': people, 'threadName': title, 'messages': chunk}
+        _write_json(os.path.join(folder, f'message_{number}.json'), data, schema)
+
+
+def generate_export(directory, conversations=100, messages=1000, participants=8, schema='legacy',
+                    group_ratio=0.3, messages_per_file=10000, e2e_contacts=10, username='John Doe', seed=0):
+    """
+    Writes a synthetic inbox folder
+
+    Args:
+        directory: Folder to create the inbox in (created if missing)
+        conversations: Number of regular conversation folders
+        messages: Average number of messages per conversation (each gets 50-150% of it)
+        participants: Number of participants of group chats (private chats have 2)
+        schema: 'legacy', 'camelCase' or 'mixed' for the regular folders
+        group_ratio: Share of the conversations that are group chats
+        messages_per_file: Messages per message_N.json file
+        e2e_contacts: Number of e2e contacts; half of them match a private chat
+        username: Name of the export's owner, sender of part of the messages
+        seed: Random seed, the same arguments always produce the same export
+
+    Returns:
+        Path of the inbox (with a trailing slash)
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    private_names = []
+
+    for index in range(conversations):
+        group = rng.random() < group_ratio
+        if group:
+            people = [username] + [person_name(rng) for _ in range(max(1, participants - 1))]
+            title = f'Group {index}'
+        else:
+            contact = person_name(rng)
+            people = [username, contact]
+            title = contact
+            private_names.append(contact)
+        folder_schema = schema if schema != 'mixed' else rng.choice(('legacy', 'camelCase'))
+        count = max(1, int(messages * rng.uniform(0.5, 1.5)))
+        slug = ''.join(character for character in title.lower() if character.isascii() and character.isalnum())
+        folder = os.path.join(directory, f'{slug}_{1000000 + index}')
+        write_conversation(folder, rng, title, people, count, folder_schema, messages_per_file, group)
+
+    if e2e_contacts:
+        e2e = os.path.join(directory, 'e2e')
+        os.makedirs(e2e, exist_ok=True)
+        for index in range(e2e_contacts):
+            # Every other contact continues an existing private chat
+            contact = private_names[index // 2] if index % 2 == 0 and index // 2 < len(private_names) \
+                else person_name(rng)
+            count = max(1, int(messages * rng.uniform(0.5, 1.5)))
+            rows = []
+            timestamp = NEWEST_TS
+            for _ in range(count):
+                rows.append(camel_case_message(rng, rng.choice((username, contact)), timestamp))
+                timestamp -= rng.randrange(1000, 4 * 3600 * 1000)
+            data = {'participants': [username, contact], 'threadName': f'{contact}_{index}', 'messages': rows}
+            _write_json(os.path.join(e2e, f'{contact}_{index}.json'), data, 'camelCase')
+
+    return f'{directory.rstrip(os.sep)}/'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Writes a synthetic Messenger export.')
+    parser.add_argument('directory')
+    parser.add_argument('--conversations', type=int, default=100)
+    parser.add_argument('--messages', type=int, default=1000)
+    parser.add_argument('--participants', type=int, default=8)
+    parser.add_argument('--schema', choices=('legacy', 'camelCase', 'mixed'), default='legacy')
+    parser.add_argument('--group-ratio', type=float, default=0.3)
+    parser.add_argument('--messages-per-file', type=int, default=10000)
+    parser.add_argument('--e2e-contacts', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    inbox = generate_export(
+        args.directory, args.conversations, args.messages, args.participants, args.schema, args.group_ratio,
+        args.messages_per_file, args.e2e_contacts, seed=args.seed
+    )
+    print(inbox)
+
+
+if __name__ == '__main__':
+    main()
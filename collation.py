@@ -0,0 +1,135 @@
+"""
+Collation of conversation titles for CounterForMessenger
+
+Sorting raw strings puts 'Émile' after 'Zoe' and every lowercase title
+after the uppercase ones. A Collator turns text into a sort key instead:
+the locale's collation (locale.strxfrm) for the selected language when
+that locale is installed, otherwise the text with its accents removed and
+case folded (see fold()). Keys are cached per distinct text, so they are
+computed once per title however often the list is sorted.
+
+LC_COLLATE is global to the process. The app switches it with
+set_collation_locale() once at startup and again only when the user picks
+another language (see MasterWindow); nothing else in the app depends on
+it, and building a Collator never changes it.
+"""
+import locale
+import unicodedata
+
+# Application language (langs/<language>.py) -> locale used to collate its text
+LANGUAGE_LOCALES = {
+    'Bengali': 'bn_IN',
+    'Chinese': 'zh_CN',
+    'Deutsch': 'de_DE',
+    'English': 'en_US',
+    'Español': 'es_ES',
+    'Farsi': 'fa_IR',
+    'Francais': 'fr_FR',
+    'Hindi': 'hi_IN',
+    'Italian': 'it_IT',
+    'Japanese': 'ja_JP',
+    'Korean': 'ko_KR',
+    'Marathi': 'mr_IN',
+    'Nederlands': 'nl_NL',
+    'Polski': 'pl_PL',
+    'Portugues': 'pt_PT',
+    'Russian': 'ru_RU',
+    'Slovensky': 'sk_SK',
+    'Tagalog': 'fil_PH',
+    'Turkish': 'tr_TR',
+    'Vietnamese': 'vi_VN',
+    'Ελληνικά': 'el_GR',
+    'العربية': 'ar_SA',
+}
+
+
+class _FoldTable(dict):
+    """
+    str.translate table folding one character at a time (NFKD, without the
+    combining marks, casefolded), filled in as characters are first seen
+    """
+
+    def __missing__(self, code):
+        folded = ''.join(
+            character for character in unicodedata.normalize('NFKD', chr(code))
+            if not unicodedata.combining(character)
+        ).casefold()
+        self[code] = folded
+        return folded
+
+
+_FOLD_TABLE = _FoldTable()
+
+
+def fold(text):
+    """
+    Removes accents and case from text ('Émile' -> 'emile')
+
+    Args:
+        text: Text to fold
+
+    Returns:
+        The NFKD decomposition of the text without its combining marks, casefolded
+    """
+    if text.isascii():
+        # Nothing to decompose
+        return text.lower()
+    # Characters decompose independently, so folding each one is the same as folding the text
+    return text.translate(_FOLD_TABLE)
+
+
+def set_collation_locale(language):
+    """
+    Switches the process-wide LC_COLLATE to the locale of an application language
+
+    Args:
+        language: Application language (e.g. 'Polski')
+
+    Returns:
+        Name of the locale that was set, to build a Collator with; None for an
+        unknown language or a locale that isn't installed (LC_COLLATE is left as is)
+    """
+    code = LANGUAGE_LOCALES.get(language)
+    return _set_locale(code) if code is not None else None
+
+
+def _set_locale(code):
+    """
+    Switches LC_COLLATE to a locale, trying the names it has on Linux, macOS and Windows
+
+    Returns:
+        Name of the locale that was set, None if it isn't installed
+    """
+    for name in (f'{code}.UTF-8', f'{code}.utf8', code, code.replace('_', '-')):
+        try:
+            locale.setlocale(locale.LC_COLLATE, name)
+            return name
+        except locale.Error:
+            continue
+    return None
+
+
+class Collator:
+    """Sort keys for text, in the collation of one language"""
+
+    def __init__(self, locale_name=None):
+        """
+        Args:
+            locale_name: LC_COLLATE locale set by set_collation_locale(), None for fold() keys
+        """
+        self.locale = locale_name
+        # Text -> sort key
+        self.keys = {}
+
+    def key(self, text):
+        """Returns the (cached) sort key of a text"""
+        key = self.keys.get(text)
+        if key is None:
+            if self.locale is not None:
+                # Case and compatibility forms are folded like in fold(), but the accents are kept:
+                # the locale's rules know where its own accented letters go (e.g. 'å' after 'z' in Swedish)
+                key = locale.strxfrm(unicodedata.normalize('NFKC', str(text).casefold()))
+            else:
+                key = fold(str(text))
+            self.keys[text] = key
+        return key
@@ -0,0 +1,228 @@
+"""
+Columnar message store for CounterForMessenger
+
+Every parsed export file is kept as a handful of compact typed arrays (one
+entry per message) instead of the raw JSON. All statistics are computed
+from these columns, so changing the date range only re-runs a filter over
+memory instead of re-reading and re-parsing the export.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, namedtuple
+from itertools import compress
+
+from identities import identities
+
+# Timestamp order of a file's messages, see FileColumns.detect_order()
+UNSORTED = 0
+ASCENDING = 1
+DESCENDING = -1
+
+
+def _negate(timestamp):
+    return -timestamp
+
+
+# Aggregate of the messages of a single JSON file within the date range.
+# Independent of the username and language; sent messages are derived from
+# sender_counts and the chat type from joinable/participants. People are
+# referred to by their ids in the process-wide identity table.
+FileStats = namedtuple('FileStats', [
+    'title', 'participants', 'joinable', 'sender_counts', 'participant_chars', 'total_messages',
+    'total_chars', 'call_duration', 'start_date', 'total_photos', 'total_gifs', 'total_videos',
+    'total_files'
+])
+
+
+class FileColumns:
+    """
+    All messages of one export file, stored column by column.
+
+    Senders are interned into a per-file table, so the sender column holds
+    small integer ids. The chars column holds -1 for messages without a
+    countable body (they count as messages but not towards characters).
+    """
+
+    __slots__ = (
+        'path', 'size', 'mtime', 'title', 'participants', 'joinable', 'senders', 'order',
+        'timestamps', 'sender_ids', 'chars', 'call_durations', 'photos', 'gifs', 'videos', 'files',
+        'identity_ids'
+    )
+
+    # Per-process ids, rebuilt after unpickling instead of being stored
+    _transient = ('identity_ids',)
+
+    def __init__(self, title, participants, joinable):
+        """
+        Args:
+            title: Chat title (mojibake already fixed)
+            participants: Participant names listed in the file header
+            joinable: Whether the file marks the chat as joinable (legacy group chats)
+        """
+        # Identity of the file the columns were read from, set by the loader
+        self.path = None
+        self.size = None
+        self.mtime = None
+
+        self.title = title
+        self.participants = participants
+        self.joinable = joinable
+        self.senders = []
+        self.order = UNSORTED
+        self.timestamps = array('q')
+        self.sender_ids = array('i')
+        self.chars = array('i')
+        self.call_durations = array('q')
+        self.photos = array('I')
+        self.gifs = array('I')
+        self.videos = array('I')
+        self.files = array('I')
+        self.identity_ids = None
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name not in self._transient}
+
+    def __setstate__(self, state):
+        self.identity_ids = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def _identity_ids(self):
+        """Returns the identity table ids of the participants and of the file's senders"""
+        # Interned again once the table has been cleared since
+        if self.identity_ids is None or self.identity_ids[0] != identities.generation:
+            self.identity_ids = (
+                identities.generation,
+                [identities.intern(name) for name in self.participants],
+                [identities.intern(name) for name in self.senders]
+            )
+        return self.identity_ids[1:]
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def detect_order(self):
+        """
+        Records whether the timestamps are sorted, so summarize() can
+        binary-search the date range instead of testing every message.
+        Facebook lists messages newest first, but nothing guarantees it.
+        """
+        timestamps = self.timestamps
+        if all(previous >= current for previous, current in zip(timestamps, timestamps[1:])):
+            self.order = DESCENDING
+        elif all(previous <= current for previous, current in zip(timestamps, timestamps[1:])):
+            self.order = ASCENDING
+        else:
+            self.order = UNSORTED
+
+    def window(self, start_ts, end_ts):
+        """
+        Locates the messages within [start_ts, end_ts) in sorted columns
+
+        Args:
+            start_ts: Inclusive lower bound, in milliseconds
+            end_ts: Exclusive upper bound, in milliseconds
+
+        Returns:
+            (low, high) slice bounds of the matching messages, or None if
+            the timestamps aren't sorted
+        """
+        timestamps = self.timestamps
+        if self.order == ASCENDING:
+            return bisect_left(timestamps, start_ts), bisect_left(timestamps, end_ts)
+        if self.order == DESCENDING:
+            # Newest first: the window starts at the first message older than
+            # end_ts and ends at the first one older than start_ts
+            low = bisect_right(timestamps, -end_ts, key=_negate)
+            return low, max(low, bisect_right(timestamps, -start_ts, key=_negate))
+        return None
+
+    def summarize(self, start_ts, end_ts):
+        """
+        Computes the aggregate of the messages within [start_ts, end_ts)
+
+        Sorted columns are cut to the date range with two binary searches;
+        unsorted ones fall back to testing every timestamp.
+
+        Args:
+            start_ts: Inclusive lower bound, in milliseconds
+            end_ts: Exclusive upper bound, in milliseconds
+
+        Returns:
+            FileStats aggregate of the messages within the date range
+        """
+        bounds = self.window(start_ts, end_ts)
+        if bounds is not None:
+            low, high = bounds
+
+            def select(column):
+                return column[low:high]
+        else:
+            mask = bytes(start_ts <= timestamp < end_ts for timestamp in self.timestamps)
+
+            def select(column):
+                return compress(column, mask)
+
+        timestamps = select(self.timestamps)
+        total_messages = len(timestamps) if bounds is not None else mask.count(1)
+
+        participant_ids, identity_ids = self._identity_ids()
+        sender_ids = list(select(self.sender_ids))
+        # Counter keeps first-seen order, matching the order messages are read in
+        sender_counts = {identity_ids[sender_id]: count for sender_id, count in Counter(sender_ids).items()}
+
+        # Characters per sender, indexed by the file's sender ids
+        sender_chars = [0] * len(identity_ids)
+        has_chars = bytearray(len(identity_ids))
+        for sender_id, chars in zip(sender_ids, select(self.chars)):
+            if chars >= 0:
+                sender_chars[sender_id] += chars
+                has_chars[sender_id] = 1
+        participant_chars = {
+            identity_ids[sender_id]: sender_chars[sender_id]
+            for sender_id in range(len(identity_ids)) if has_chars[sender_id]
+        }
+
+        return FileStats(
+            self.title, participant_ids, self.joinable, sender_counts, participant_chars,
+            total_messages, sum(sender_chars), sum(select(self.call_durations)), min(timestamps, default=0),
+            sum(select(self.photos)), sum(select(self.gifs)), sum(select(self.videos)), sum(select(self.files))
+        )
+
+
+class ColumnStore:
+    """
+    In-memory store of FileColumns, keyed by absolute file path and
+    validated against the file's size and modification time
+    """
+
+    def __init__(self):
+        self.files = {}
+
+    def get(self, path, size, mtime):
+        """
+        Returns the stored columns of a file, or None if missing or stale
+
+        Args:
+            path: Absolute path of the file
+            size: Current size of the file in bytes
+            mtime: Current modification time of the file (st_mtime_ns)
+        """
+        columns = self.files.get(path)
+        if columns is None or columns.size != size or columns.mtime != mtime:
+            return None
+        return columns
+
+    def put(self, columns):
+        """
+        Stores the columns of a file (replacing any older version)
+
+        Args:
+            columns: FileColumns with path, size and mtime set
+        """
+        self.files[columns.path] = columns
+
+    def clear(self):
+        """Drops every stored file, and the people of the identity table with them"""
+        self.files.clear()
+        identities.clear()
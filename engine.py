@@ -0,0 +1,365 @@
+"""
+Headless analysis engine for CounterForMessenger
+
+Computes the same statistics as the application without importing tkinter
+or PIL, so exports can be analyzed in batch jobs and on servers without a
+display. MasterWindow delegates its extraction to AnalysisEngine, and the
+module doubles as a command-line tool:
+
+    python -m engine DIRECTORY --username NAME [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+                     [--format json|csv] [--output FILE] [--workers N] [--report FILE]
+                     [--profile DIRECTORY] [--index]
+
+DIRECTORY is an inbox folder or one or more export ZIP archives joined
+with '|'. Results are written to stdout (or --output), progress and the
+timing summary to stderr, and the per-phase timing report (see
+instrumentation) to --report. --index also brings the full-text message
+index (see message_index) up to date.
+"""
+import argparse
+import csv
+import importlib
+import json
+import sys
+from contextlib import redirect_stdout
+from datetime import date, datetime, timedelta
+from os.path import isdir
+from time import perf_counter
+
+import extraction
+import instrumentation
+import profiling
+import regex_scan
+from columns import ColumnStore
+from extraction import ExtractOptions, STREAM_MIN_BYTES
+from ingest_cache import CACHE_PATH
+from json_backend import BACKENDS, resolve_backend
+from message_index import INDEX_PATH, MessageIndex
+from sources import is_archive
+
+# Used when no start date is given, matching the application's default
+DEFAULT_FROM_DATE = date(2000, 1, 1)
+
+
+def parse_date(value, default):
+    """
+    Converts a YYYY-MM-DD string (or a date) to a date
+
+    Args:
+        value: Date, string or None
+        default: Date returned when value is missing or invalid
+
+    Returns:
+        date object
+    """
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d").date()
+    except (ValueError, TypeError):
+        return default
+
+
+def date_range_ms(from_date, to_date):
+    """
+    Converts an inclusive date range to the [start_ts, end_ts) timestamps used by the extractors
+
+    Args:
+        from_date: First day of the range
+        to_date: Last day of the range
+
+    Returns:
+        (start_ts, end_ts) in milliseconds, local time
+    """
+    start_ts = datetime.combine(from_date, datetime.min.time()).timestamp() * 1000
+    # End timestamp: We want to include the entire end date.
+    # So we go to the next day at 00:00:00 and use strictly less than.
+    end_ts = datetime.combine(to_date + timedelta(days=1), datetime.min.time()).timestamp() * 1000
+    return start_ts, end_ts
+
+
+class AnalysisEngine:
+    """Extracts conversation statistics for one data source and set of filters"""
+
+    def __init__(self, directory, username, from_date, to_date, group_label, private_label, workers=1,
+                 cache_path=CACHE_PATH, json_backend=None, column_store=None, index_path=None):
+        """
+        Args:
+            directory: Inbox directory (with a trailing slash) or export archive(s), see sources
+            username: Name of the export's owner, whose messages count as sent
+            from_date: First day of the analyzed period
+            to_date: Last day of the analyzed period
+            group_label: Chat type label used for group chats
+            private_label: Chat type label used for private chats
+            workers: Number of worker processes, 1 for serial extraction
+            cache_path: Path of the persistent ingestion cache, None to disable it
+            json_backend: JSON backend name, None to pick it from the environment
+            column_store: ColumnStore shared between extractions, a new one if None
+            index_path: Path of the message index updated after each extraction, None to skip it
+        """
+        self.directory = directory
+        self.username = username
+        self.from_date = from_date
+        self.to_date = to_date
+        self.group_label = group_label
+        self.private_label = private_label
+        self.workers = max(1, workers)
+        self.cache_path = cache_path
+        self.json_backend = json_backend or resolve_backend()
+        self.column_store = column_store if column_store is not None else ColumnStore()
+        self.index_path = index_path
+
+    def options(self):
+        """
+        Builds the extraction settings
+
+        Returns:
+            ExtractOptions with the date range, username and chat type labels
+        """
+        start_ts, end_ts = date_range_ms(self.from_date, self.to_date)
+        return ExtractOptions(
+            start_ts, end_ts, self.username, self.group_label, self.private_label,
+            self.cache_path, STREAM_MIN_BYTES, self.json_backend
+        )
+
+    def extract_data(self, conversation):
+        """
+        Extracts data from JSON files for a given conversation
+
+        Args:
+            conversation: Conversation folder to process
+
+        Returns:
+            Tuple containing various conversation statistics
+        """
+        options = self.options()
+        return extraction.summarize_folder(
+            extraction.load_folder_columns(self.directory, conversation, options, self.column_store), options
+        )
+
+    def extract_e2e_data(self):
+        """
+        Extracts data from JSON files in the e2e folder, one entry per person
+
+        Returns:
+            List of tuples, each in the same format as extract_data() returns
+        """
+        options = self.options()
+        return extraction.summarize_e2e(
+            extraction.load_folder_columns(self.directory, 'e2e', options, self.column_store), options
+        )
+
+    def extract_all_conversations(self, progress=None, cancel=None):
+        """
+        Extracts stats for every conversation, merging e2e contacts into
+        their regular private chat (see extraction.extract_all_conversations)
+
+        Args:
+            progress: Optional callable(done, total) invoked after each processed folder
+            cancel: Optional threading.Event that stops extraction once set
+
+        Returns:
+            List of conversation tuples, same format as extract_data(), one
+            per unique conversation/contact.
+        """
+        conversations = extraction.extract_all_conversations(
+            self.directory, self.options(), self.workers, progress, cancel, self.column_store
+        )
+        if self.index_path is not None:
+            self.update_message_index(cancel)
+        return conversations
+
+    def stream_conversations(self, cancel=None, on_start=None):
+        """
+        Extracts every conversation like extract_all_conversations(), but
+        reports the rows as soon as each folder is done. The e2e contacts are
+        merged into their private chat row whichever of the two arrives first.
+        The message index isn't updated, so the caller can show the rows
+        first and call update_message_index() afterwards.
+
+        Args:
+            cancel: Optional threading.Event that stops extraction once set
+            on_start: Optional callable receiving the list the rows are
+                collected in, before the first folder is extracted
+
+        Yields:
+            (changes, done, total): list of (index, conversation, is_new)
+            row changes, and the number of processed/total folders
+        """
+        options = self.options()
+        merger = extraction.ConversationMerger(options.private_label)
+        if on_start is not None:
+            on_start(merger.rows)
+        for kind, result, done, total in extraction.iter_extracted(
+                self.directory, options, self.workers, cancel, self.column_store):
+            with instrumentation.phase('merge'):
+                changes = merger.add_e2e(result) if kind == 'e2e' else merger.add_folder(result)
+            yield changes, done, total
+
+    def update_message_index(self, cancel=None):
+        """
+        Brings the message index at index_path up to date with the data
+        source, reading only the files that are new or changed
+
+        Args:
+            cancel: Optional threading.Event that stops the update once set
+
+        Returns:
+            Number of files (re)indexed
+        """
+        index = MessageIndex(self.index_path or INDEX_PATH)
+        try:
+            return index.update(self.directory, self.options(), self.workers, cancel)
+        finally:
+            index.close()
+
+    def scan_messages(self, pattern, flags=0, cancel=None):
+        """
+        Runs a regular expression over the text of every message in the
+        analyzed period (see regex_scan.iter_scan)
+
+        Args:
+            pattern: Regular expression
+            flags: re flags of the pattern
+            cancel: Optional threading.Event that stops the scan once set
+
+        Yields:
+            (scans, done, total, elapsed): list of regex_scan.FileScan, the
+            number of scanned/total folders and the seconds since the start
+        """
+        yield from regex_scan.iter_scan(self.directory, pattern, self.options(), self.workers, cancel, flags)
+
+    @staticmethod
+    def merge_conversation_tuples(a, b):
+        """
+        Merges two conversation stat tuples that refer to the same private-chat
+        contact (see extraction.merge_conversation_tuples)
+        """
+        return extraction.merge_conversation_tuples(a, b)
+
+
+# Output columns of the command-line tool, in conversation tuple order
+FIELDS = (
+    'title', 'participants', 'chat_type', 'messages', 'chars', 'call_duration', 'sent_messages', 'start_date',
+    'photos', 'gifs', 'videos', 'files', 'participant_chars'
+)
+
+
+def conversation_record(conversation):
+    """
+    Converts a conversation tuple to a JSON-serializable dict
+
+    Args:
+        conversation: Conversation tuple, as returned by extract_all_conversations()
+
+    Returns:
+        Dict keyed by FIELDS, start_date as an ISO date (None without messages)
+    """
+    record = dict(zip(FIELDS, conversation))
+    record['participants'] = dict(record['participants'])
+    record['participant_chars'] = dict(record['participant_chars'])
+    record['start_date'] = (
+        datetime.fromtimestamp(record['start_date'] / 1000).date().isoformat() if record['start_date'] else None
+    )
+    return record
+
+
+def write_results(conversations, output, output_format):
+    """
+    Writes conversation records as JSON or CSV
+
+    In CSV, the participants column holds the number of participants and
+    participant_chars is left out, as neither fits in a single cell.
+
+    Args:
+        conversations: List of conversation tuples
+        output: Text file object to write to
+        output_format: 'json' or 'csv'
+    """
+    records = [conversation_record(conversation) for conversation in conversations]
+    if output_format == 'json':
+        json.dump(records, output, ensure_ascii=False, indent=2)
+        output.write('\n')
+        return
+    writer = csv.DictWriter(output, fieldnames=[field for field in FIELDS if field != 'participant_chars'],
+                            extrasaction='ignore')
+    writer.writeheader()
+    for record in records:
+        writer.writerow(dict(record, participants=len(record['participants'])))
+
+
+def main(argv=None):
+    """
+    Command-line entry point: analyzes an export and writes the statistics of every conversation
+
+    Args:
+        argv: Arguments (without the program name), sys.argv[1:] if None
+
+    Returns:
+        Process exit code
+    """
+    started = perf_counter()
+    parser = argparse.ArgumentParser(prog='python -m engine', description='Counts Messenger export statistics.')
+    parser.add_argument('directory', help="inbox folder, or export ZIP archive(s) joined with '|'")
+    parser.add_argument('--username', default='', help='your name as it appears in the export')
+    parser.add_argument('--from', dest='from_date', help='first day, YYYY-MM-DD (default 2000-01-01)')
+    parser.add_argument('--to', dest='to_date', help='last day, YYYY-MM-DD (default today)')
+    parser.add_argument('--format', choices=('json', 'csv'), default='json', help='output format')
+    parser.add_argument('--output', '-o', help='file to write the results to (default stdout)')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes (default 1)')
+    parser.add_argument('--language', default='English', help='language of the chat type labels')
+    parser.add_argument('--json-backend', choices=BACKENDS + ('auto',), help='JSON parser (default auto)')
+    parser.add_argument('--no-cache', action='store_true', help="don't use the persistent ingestion cache")
+    parser.add_argument('--report', help='JSON file to write the per-phase timing report to')
+    parser.add_argument('--profile', metavar='DIRECTORY',
+                        help='write cProfile and tracemalloc diagnostics to DIRECTORY (see profiling)')
+    parser.add_argument('--index', action='store_true',
+                        help=f'update the full-text message index ({INDEX_PATH}, see message_index)')
+    args = parser.parse_args(argv)
+
+    directory = args.directory
+    if not is_archive(directory):
+        if not isdir(directory):
+            parser.error(f'{directory} is neither a directory nor a .zip archive')
+        directory = directory if directory.endswith(('/', '\\')) else f'{directory}/'
+    try:
+        module = importlib.import_module(f'langs.{args.language}')
+    except ImportError:
+        parser.error(f'unknown language {args.language}')
+
+    try:
+        # An unknown CFM_JSON_BACKEND value, --json-backend is checked by argparse
+        json_backend = resolve_backend(args.json_backend)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.profile:
+        profiling.enable(args.profile)
+    engine = AnalysisEngine(
+        directory, args.username, parse_date(args.from_date, DEFAULT_FROM_DATE),
+        parse_date(args.to_date, date.today()), module.TITLE_GROUP_CHAT, module.TITLE_PRIVATE_CHAT, args.workers,
+        None if args.no_cache else CACHE_PATH, json_backend,
+        index_path=INDEX_PATH if args.index else None
+    )
+    # Diagnostics go to stderr, so stdout only carries the results
+    with redirect_stdout(sys.stderr):
+        conversations = engine.extract_all_conversations()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            write_results(conversations, f, args.format)
+    else:
+        write_results(conversations, sys.stdout, args.format)
+    if args.report:
+        instrumentation.current().write_json(args.report)
+
+    print(
+        f'{len(conversations)} conversations, {sum(conversation[3] for conversation in conversations)} messages '
+        f'in {perf_counter() - started:.2f}s',
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
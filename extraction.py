@@ -0,0 +1,1082 @@
+"""
+Conversation extraction for CounterForMessenger
+
+Parses Facebook's JSON message exports into per-conversation statistics.
+This module deliberately doesn't import tkinter: every extractor is plain
+module-level code, so it can be pickled into worker processes and fanned
+out over a ProcessPoolExecutor by extract_all_conversations().
+"""
+import io
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from time import perf_counter
+
+from columns import FileColumns, FileStats
+from identities import Tally, identities
+from ingest_cache import open_cache
+import instrumentation
+import json_backend
+import profiling
+from json_stream import iter_object
+from sources import file_identity, file_size, list_conversations, list_files, open_binary
+
+# Everything an extractor needs to know about the current user settings.
+# Passed explicitly (instead of reading it from the MasterWindow) so it can
+# be shipped to worker processes. cache_path is None when caching is disabled;
+# files of at least stream_min_bytes are parsed incrementally (None: never);
+# json_backend names the parser of the other files (see json_backend).
+ExtractOptions = namedtuple(
+    'ExtractOptions', [
+        'start_ts', 'end_ts', 'username', 'group_label', 'private_label', 'cache_path', 'stream_min_bytes',
+        'json_backend'
+    ],
+    defaults=(None, None, 'stdlib')
+)
+
+
+class ExtractionCancelled(Exception):
+    """Raised by extract_all_conversations() when extraction is cancelled midway"""
+
+
+# Files this large are parsed incrementally instead of with json.load()
+STREAM_MIN_BYTES = 64 * 1024 * 1024
+
+
+def fix_mojibake(text):
+    """
+    Fixes Facebook's well-known JSON export encoding bug: legacy (pre-2024)
+    exports store non-ASCII characters as raw UTF-8 bytes, but since the
+    export's declared encoding is effectively Latin-1, Python's json module
+    decodes them as individual Latin-1 codepoints instead of proper UTF-8
+    text (e.g. 'ś' turns into 'Å\x9b'). Round-tripping through
+    encode('latin1').decode('utf-8') reverses this corruption.
+
+    This is safe to attempt unconditionally: correctly-decoded UTF-8 text
+    (as used by the newer camelCase schema) contains codepoints above 255
+    (e.g. Polish 'ą' = U+0105), so encode('latin1') fails for it and the
+    original text is returned unchanged.
+
+    Args:
+        text: String to fix (or any other type, passed through unchanged)
+
+    Returns:
+        The corrected string, or the original value if it wasn't mojibake
+    """
+    if not isinstance(text, str):
+        return text
+    try:
+        return text.encode('latin1').decode('utf-8')
+    except (UnicodeDecodeError, UnicodeEncodeError):
+        return text
+
+
+def get_participant_name(participant):
+    """
+    Extracts a participant's name, supporting both the legacy schema
+    (dict with a 'name' key) and the newer schema (plain string)
+
+    Args:
+        participant: Participant entry as provided by Facebook's export
+
+    Returns:
+        Participant's name as a string
+    """
+    name = participant['name'] if isinstance(participant, dict) else participant
+    return fix_mojibake(name)
+
+
+def get_sender(message):
+    """Extracts the sender's name, supporting old (sender_name) and new (senderName) schemas"""
+    return fix_mojibake(message.get('sender_name') or message.get('senderName', ''))
+
+
+def get_message_text(message):
+    """Extracts the message body, supporting old (content) and new (text) schemas"""
+    content = message.get('content')
+    content = content if content is not None else message.get('text', '')
+    return fix_mojibake(content)
+
+
+def get_timestamp(message):
+    """Extracts the message timestamp, supporting old (timestamp_ms) and new (timestamp) schemas"""
+    timestamp = message.get('timestamp_ms')
+    if timestamp is None:
+        timestamp = message.get('timestamp', 0)
+    return int(timestamp)
+
+
+def get_chat_title(data):
+    """Extracts the chat title, supporting old (title) and new (threadName) schemas"""
+    return fix_mojibake(data.get('title') or data.get('threadName', ''))
+
+
+def count_media(message):
+    """
+    Counts multimedia attachments for a message, supporting both schemas.
+
+    The legacy (pre-2024) schema exposes separate 'photos'/'gifs'/'videos'/'files'
+    arrays per message. The newer schema (including E2EE exports) instead exposes
+    a single unified 'media' array with no type information (Meta doesn't expose
+    the original media type for encrypted/undownloadable attachments), so those
+    are counted under 'photos' as a best-effort approximation rather than being
+    silently dropped and always showing 0.
+
+    Args:
+        message: Message dict to inspect
+
+    Returns:
+        Tuple of (photos, gifs, videos, files) counts for this message
+    """
+    photos = len(message['photos']) if 'photos' in message else 0
+    gifs = len(message['gifs']) if 'gifs' in message else 0
+    videos = len(message['videos']) if 'videos' in message else 0
+    files = len(message['files']) if 'files' in message else 0
+
+    if 'media' in message:
+        photos += len(message['media'])
+
+    return photos, gifs, videos, files
+
+
+def read_columns(file, options):
+    """
+    Parses a single JSON export file into its message columns
+
+    Files of at least options.stream_min_bytes are parsed incrementally
+    (see json_stream), so their 'messages' array is never held in memory
+    as a whole; the result is identical to the eager path.
+
+    Args:
+        file: Path of the JSON file, or ZipMember inside an export archive
+        options: ExtractOptions with the streaming threshold
+
+    Returns:
+        FileColumns holding every message of the file
+    """
+    instrumentation.count('files_read')
+    with open_binary(file) as f:
+        size = file_size(file)
+        if options.stream_min_bytes is not None and size >= options.stream_min_bytes:
+            instrumentation.count('bytes_read', size)
+            # Reading, parsing and building the columns are interleaved
+            with instrumentation.phase('parse'), io.TextIOWrapper(f, encoding='utf-8') as text:
+                return _build_columns(iter_object(text))
+        with instrumentation.phase('read'):
+            raw = f.read()
+    instrumentation.count('bytes_read', len(raw))
+    with instrumentation.phase('parse'):
+        data = json_backend.loads(raw, options.json_backend)
+    with instrumentation.phase('build'):
+        return _build_columns(data.items())
+
+
+def _build_columns(items):
+    """
+    Builds the message columns of a parsed (or streaming) export document
+
+    Args:
+        items: (key, value) pairs of the document's top-level object; the
+            'messages' value may be any iterable of message dicts
+
+    Returns:
+        FileColumns holding every message of the document
+    """
+    # The header fields may come after the messages, they're filled in at the end
+    columns = FileColumns('', [], False)
+    header = {}
+
+    for key, value in items:
+        if key == 'participants':
+            # Collecting chat participants
+            columns.participants = [get_participant_name(participant) for participant in value]
+        elif key == 'messages':
+            # Streamed messages must be consumed right away, each one goes
+            # straight into the columns
+            _append_messages(columns, _message_rows(value))
+        else:
+            # Title, joinable mode and other small fields
+            header[key] = value
+
+    columns.title = get_chat_title(header)
+    columns.joinable = 'joinable_mode' in header
+    columns.detect_order()
+    return columns
+
+
+def _append_messages(columns, rows):
+    """Appends message rows (see _message_rows) to the columns, interning their senders"""
+    sender_index = {}
+    senders = columns.senders
+    timestamps, sender_ids, chars = columns.timestamps.append, columns.sender_ids.append, columns.chars.append
+    call_durations, photos_column = columns.call_durations.append, columns.photos.append
+    gifs_column, videos_column, files_column = columns.gifs.append, columns.videos.append, columns.files.append
+    for timestamp, sender, msg_chars, call_duration, photos, gifs, videos, files in rows:
+        # Intern the sender into the file's sender table
+        sender_id = sender_index.get(sender)
+        if sender_id is None:
+            sender_id = sender_index[sender] = len(senders)
+            senders.append(sender)
+
+        timestamps(timestamp)
+        sender_ids(sender_id)
+        chars(msg_chars)
+        call_durations(call_duration)
+        photos_column(photos)
+        gifs_column(gifs)
+        videos_column(videos)
+        files_column(files)
+
+
+def _message_row(message):
+    """
+    Reduces a message of either schema to the values the columns hold
+
+    Returns:
+        (timestamp, sender, chars, call_duration, photos, gifs, videos, files)
+        tuple, chars being -1 for messages without a countable body
+    """
+    try:
+        msg_chars = len(get_message_text(message))
+    except (KeyError, TypeError):
+        msg_chars = -1
+    return (
+        get_timestamp(message), get_sender(message), msg_chars, int(message.get('call_duration', 0)),
+        *count_media(message)
+    )
+
+
+def _generic_rows(messages):
+    """Reduces messages without knowing their schema, probing both for every field"""
+    return (_message_row(message) for message in messages)
+
+
+# Raw legacy sender name -> repaired name, shared by every file read in this process
+_repaired_senders = {}
+
+
+def _legacy_rows(messages):
+    """
+    Reduces messages of the legacy schema (timestamp_ms/sender_name/content,
+    per-type media arrays), repairing mojibake only on non-ASCII strings
+    """
+    # Senders repeat throughout (and across) chats, repair each name only once
+    senders = _repaired_senders
+    for message in messages:
+        timestamp = message.get('timestamp_ms')
+        if timestamp is None:
+            # Not this schema after all
+            yield _message_row(message)
+            continue
+
+        # Same fallbacks as get_sender() and get_message_text()
+        raw_sender = message.get('sender_name') or message.get('senderName', '')
+        sender = senders.get(raw_sender)
+        if sender is None:
+            sender = senders[raw_sender] = fix_mojibake(raw_sender)
+
+        content = message.get('content')
+        if content is None:
+            content = message.get('text', '')
+        if type(content) is str:
+            msg_chars = len(content if content.isascii() else fix_mojibake(content))
+        else:
+            try:
+                msg_chars = len(content)
+            except TypeError:
+                msg_chars = -1
+
+        yield (
+            int(timestamp), sender, msg_chars, int(message.get('call_duration', 0)),
+            len(message['photos']) if 'photos' in message else 0,
+            len(message['gifs']) if 'gifs' in message else 0,
+            len(message['videos']) if 'videos' in message else 0,
+            len(message['files']) if 'files' in message else 0
+        )
+
+
+def _camel_case_rows(messages):
+    """
+    Reduces messages of the camelCase schema (timestamp/senderName/text and a
+    single media array), whose strings are already decoded correctly
+    """
+    for message in messages:
+        timestamp = message.get('timestamp')
+        if timestamp is None or 'timestamp_ms' in message:
+            # Not this schema after all
+            yield _message_row(message)
+            continue
+
+        text = message.get('text', '')
+        try:
+            msg_chars = len(text)
+        except TypeError:
+            msg_chars = -1
+
+        yield (
+            int(timestamp), message.get('senderName', ''), msg_chars, int(message.get('call_duration', 0)),
+            len(message['media']) if 'media' in message else 0, 0, 0, 0
+        )
+
+
+def _message_rows(messages):
+    """
+    Reduces messages to the values the columns hold, with a loop specialized
+    for the schema of the file (detected from its first message)
+
+    Args:
+        messages: Iterable of message dicts
+
+    Returns:
+        Iterator of (timestamp, sender, chars, call_duration, photos, gifs, videos, files)
+        tuples, chars being -1 for messages without a countable body; messages
+        are read as it's consumed
+    """
+    messages = iter(messages)
+    first = next(messages, None)
+    if first is None:
+        return iter(())
+    messages = chain((first,), messages)
+
+    if 'timestamp_ms' in first:
+        return _legacy_rows(messages)
+    if 'timestamp' in first:
+        return _camel_case_rows(messages)
+    return _generic_rows(messages)
+
+
+def iter_message_bodies(file, options, info=None):
+    """
+    Reads the text of every message of a JSON export file, with the same
+    schema handling and mojibake repair as read_columns() (which only keeps
+    the length of each text)
+
+    Args:
+        file: Path of the JSON file, or ZipMember inside an export archive
+        options: ExtractOptions with the streaming threshold and JSON backend
+        info: Optional dict receiving the chat 'title' once the file has been read
+
+    Yields:
+        (position, timestamp, sender, text) for every message with a text,
+        position being the index of the message in the file
+    """
+    with open_binary(file) as f:
+        if options.stream_min_bytes is not None and file_size(file) >= options.stream_min_bytes:
+            with io.TextIOWrapper(f, encoding='utf-8') as text:
+                yield from _message_bodies(iter_object(text), info)
+            return
+        raw = f.read()
+    yield from _message_bodies(json_backend.loads(raw, options.json_backend).items(), info)
+
+
+def _message_bodies(items, info):
+    """Implementation of iter_message_bodies() on a parsed (or streaming) export document"""
+    header = {}
+    # Senders repeat throughout (and across) chats, repair each name only once
+    senders = _repaired_senders
+    for key, value in items:
+        if key != 'messages':
+            header[key] = value
+            continue
+        for position, message in enumerate(value):
+            if 'timestamp_ms' not in message and 'timestamp' in message:
+                # camelCase schema, already decoded correctly
+                text = message.get('text')
+                if type(text) is str and text:
+                    yield position, int(message['timestamp']), message.get('senderName', ''), text
+                continue
+
+            text = message.get('content')
+            text = text if text is not None else message.get('text')
+            if type(text) is not str or not text:
+                continue
+            raw_sender = message.get('sender_name') or message.get('senderName', '')
+            sender = senders.get(raw_sender)
+            if sender is None:
+                sender = senders[raw_sender] = fix_mojibake(raw_sender)
+            yield position, get_timestamp(message), sender, text if text.isascii() else fix_mojibake(text)
+    if info is not None:
+        info['title'] = get_chat_title(header)
+
+
+def load_columns(file, options, store=None):
+    """
+    Returns the message columns of a JSON file, answered from the in-memory
+    store or the persistent ingestion cache when the file is unchanged
+
+    Args:
+        file: Path of the JSON file, or ZipMember inside an export archive
+        options: ExtractOptions with the cache location and streaming threshold
+        store: Optional ColumnStore to look up and keep the columns in
+
+    Returns:
+        FileColumns, or None if the file couldn't be processed
+    """
+    try:
+        path, size, mtime = file_identity(file)
+
+        columns = store.get(path, size, mtime) if store is not None else None
+        if columns is not None:
+            instrumentation.count('files_from_memory')
+            return columns
+
+        with instrumentation.phase('cache'):
+            cache = open_cache(options.cache_path)
+            columns = cache.get(path, size, mtime) if cache is not None else None
+        if columns is None:
+            columns = read_columns(file, options)
+            columns.path, columns.size, columns.mtime = path, size, mtime
+            if cache is not None:
+                with instrumentation.phase('cache'):
+                    cache.put(path, size, mtime, columns)
+        else:
+            instrumentation.count('files_from_cache')
+
+        if store is not None:
+            store.put(columns)
+        return columns
+    except Exception as e:
+        print(f"Error processing file {file}: {e}")
+        return None
+
+
+def _flush_cache(options):
+    """Commits the cache writes queued while processing a folder"""
+    cache = open_cache(options.cache_path)
+    if cache is not None:
+        with instrumentation.phase('cache'):
+            cache.flush()
+
+
+def load_folder_columns(directory, conversation, options, store=None):
+    """
+    Returns the message columns of every JSON file in a conversation folder
+
+    Args:
+        directory: Inbox directory (with a trailing slash) or export archive(s), see sources
+        conversation: Conversation folder to process
+        options: ExtractOptions with the cache location and streaming threshold
+        store: Optional ColumnStore to look up and keep the columns in
+
+    Returns:
+        List of FileColumns, files that couldn't be processed are left out
+    """
+    started = perf_counter()
+    with instrumentation.phase('listdir'):
+        files = list_files(directory, conversation)
+    folder_columns = []
+    for file in files:
+        columns = load_columns(file, options, store)
+        if columns is not None:
+            folder_columns.append(columns)
+    _flush_cache(options)
+
+    report = instrumentation.current()
+    if report is not None:
+        title = folder_columns[0].title if folder_columns and folder_columns[0].title else conversation
+        report.add_conversation(
+            title, perf_counter() - started, sum(len(columns.timestamps) for columns in folder_columns)
+        )
+    return folder_columns
+
+
+def _stored_folder_columns(directory, conversation, store):
+    """
+    Returns the columns of a folder if every one of its files is unchanged in the store
+
+    Returns:
+        List of FileColumns, or None if any file has to be (re)loaded
+    """
+    folder_columns = []
+    with instrumentation.phase('listdir'):
+        files = list_files(directory, conversation)
+    for file in files:
+        try:
+            path, size, mtime = file_identity(file)
+        except OSError:
+            return None
+        columns = store.get(path, size, mtime)
+        if columns is None:
+            return None
+        folder_columns.append(columns)
+    return folder_columns
+
+
+def _load_folder_columns_safe(directory, conversation, options, store=None):
+    """
+    Worker entry point wrapping load_folder_columns(), so a single broken
+    folder is reported and skipped instead of aborting the whole pool
+
+    Returns:
+        List of FileColumns, or None if the folder couldn't be processed
+    """
+    try:
+        return load_folder_columns(directory, conversation, options, store)
+    except Exception as e:
+        print(f"Error loading conversation: {str(e)}")
+        return None
+
+
+def _summarize_columns(columns, options):
+    """Applies the date filter to the columns of a file, counting the scanned and matched messages"""
+    with instrumentation.phase('filter'):
+        file_stats = columns.summarize(options.start_ts, options.end_ts)
+    instrumentation.count('messages_scanned', len(columns.timestamps))
+    instrumentation.count('messages_matched', file_stats.total_messages)
+    return file_stats
+
+
+def extract_data(directory, conversation, options):
+    """
+    Extracts data from JSON files for a given conversation
+
+    Args:
+        directory: Inbox directory (with a trailing slash) or export archive(s), see sources
+        conversation: Conversation folder to process
+        options: ExtractOptions with the date range, username and chat type labels
+
+    Returns:
+        Tuple containing various conversation statistics
+    """
+    return summarize_folder(load_folder_columns(directory, conversation, options), options)
+
+
+def summarize_folder(folder_columns, options):
+    """
+    Computes the statistics of a conversation from the columns of its files
+
+    Args:
+        folder_columns: List of FileColumns of the conversation folder
+        options: ExtractOptions with the date range, username and chat type labels
+
+    Returns:
+        Tuple containing various conversation statistics
+    """
+    # Counters indexed by identity table ids, converted back to names at the end
+    tally = Tally(identities)
+    chat_title, chat_type = '', options.group_label
+    call_duration = total_messages = total_chars = start_date = 0
+    total_photos = total_gifs = total_videos = total_files = 0
+    user_id = identities.intern(options.username)
+
+    # Filtering the messages of each file by the selected period
+    for columns in folder_columns:
+        file_stats = _summarize_columns(columns, options)
+
+        # Collecting chat participants
+        for identity in file_stats.participants:
+            tally.add_participant(identity)
+
+        # Tracking participant messages and characters
+        for identity, count in file_stats.sender_counts.items():
+            tally.add_messages(identity, count)
+        for identity, chars in file_stats.participant_chars.items():
+            tally.add_chars(identity, chars)
+
+        # Updating counters
+        total_messages += file_stats.total_messages
+        total_chars += file_stats.total_chars
+        call_duration += file_stats.call_duration
+        total_photos += file_stats.total_photos
+        total_gifs += file_stats.total_gifs
+        total_videos += file_stats.total_videos
+        total_files += file_stats.total_files
+
+        # Save conversation creation date
+        if file_stats.total_messages and (start_date == 0 or file_stats.start_date < start_date):
+            start_date = file_stats.start_date
+
+        # Get chat name and type
+        chat_title = file_stats.title
+
+        # Check if it's a private chat
+        # Legacy schema exposes 'joinable_mode' only for group chats;
+        # newer schema omits it entirely, so fall back to participant count
+        if file_stats.joinable:
+            chat_type = options.group_label
+        elif len(file_stats.participants) <= 2:
+            chat_type = options.private_label
+        else:
+            chat_type = options.group_label
+
+    return (
+        chat_title, defaultdict(int, tally.message_names()), chat_type, total_messages, total_chars,
+        call_duration, tally.sent(user_id), start_date, total_photos, total_gifs,
+        total_videos, total_files, defaultdict(int, tally.char_names())
+    )
+
+
+def extract_e2e_data(directory, options):
+    """
+    Extracts data from JSON files in the e2e folder, producing one entry per
+    person rather than a single aggregated entry, so each E2EE contact is
+    listed the same way as a regular conversation
+
+    Args:
+        directory: Inbox directory (with a trailing slash) or export archive(s), see sources
+        options: ExtractOptions with the date range, username and chat type labels
+
+    Returns:
+        List of tuples, each in the same format as extract_data() returns
+    """
+    return summarize_e2e(load_folder_columns(directory, 'e2e', options), options)
+
+
+def summarize_e2e(folder_columns, options):
+    """
+    Computes the per-person statistics of the e2e folder from the columns of its files
+
+    Args:
+        folder_columns: List of FileColumns of the e2e folder
+        options: ExtractOptions with the date range, username and chat type labels
+
+    Returns:
+        List of tuples, each in the same format as extract_data() returns
+    """
+    # Store conversation data separately for each person/file
+    e2e_conversations = {}
+    user_id = identities.intern(options.username)
+
+    for columns in folder_columns:
+        file_stats = _summarize_columns(columns, options)
+
+        # Get thread name without number
+        thread_name = file_stats.title
+        person_name = thread_name.split('_')[0] if '_' in thread_name else thread_name
+
+        # Initialize conversation data for this person if not exists
+        if person_name not in e2e_conversations:
+            e2e_conversations[person_name] = {
+                'tally': Tally(identities),
+                'chat_title': person_name,
+                'chat_type': options.private_label,
+                'call_duration': 0,
+                'total_messages': 0,
+                'total_chars': 0,
+                'total_photos': 0,
+                'total_gifs': 0,
+                'total_videos': 0,
+                'total_files': 0,
+                'start_date': 0
+            }
+
+        conv = e2e_conversations[person_name]
+
+        # Add participants
+        tally = conv['tally']
+        for identity in file_stats.participants:
+            tally.add_participant(identity)
+
+        # Tracking participant messages and characters
+        for identity, count in file_stats.sender_counts.items():
+            tally.add_messages(identity, count)
+        for identity, chars in file_stats.participant_chars.items():
+            tally.add_chars(identity, chars)
+
+        conv['total_messages'] += file_stats.total_messages
+        conv['total_chars'] += file_stats.total_chars
+
+        # Counting multimedia
+        conv['total_photos'] += file_stats.total_photos
+        conv['total_gifs'] += file_stats.total_gifs
+        conv['total_videos'] += file_stats.total_videos
+        conv['total_files'] += file_stats.total_files
+
+        if file_stats.total_messages and (conv['start_date'] == 0 or file_stats.start_date < conv['start_date']):
+            conv['start_date'] = file_stats.start_date
+
+    return [
+        (
+            conv['chat_title'], defaultdict(int, conv['tally'].message_names()), conv['chat_type'],
+            conv['total_messages'], conv['total_chars'], conv['call_duration'], conv['tally'].sent(user_id),
+            conv['start_date'], conv['total_photos'], conv['total_gifs'], conv['total_videos'],
+            conv['total_files'], defaultdict(int, conv['tally'].char_names())
+        )
+        for conv in e2e_conversations.values()
+    ]
+
+
+def normalize_name(name):
+    """
+    Normalizes a display name for case/whitespace-insensitive matching across
+    schemas; the form memoized in the identity table is reused for people,
+    other names (chat titles) are normalized without being interned
+    """
+    if not isinstance(name, str):
+        return name
+    identity = identities.ids.get(name)
+    return identities.key(identity) if identity is not None else name.strip().casefold()
+
+
+def merge_conversation_tuples(a, b):
+    """
+    Merges two conversation stat tuples that refer to the same private-chat
+    contact (one from a regular export folder, one from the e2e folder)
+    into a single combined tuple, so the same person isn't shown as two
+    separate rows just because part of their history is a legacy export
+    and part is a newer E2EE export.
+
+    Args:
+        a: Conversation tuple as returned by extract_data()/extract_e2e_data()
+        b: Second conversation tuple for the same contact, same format as `a`
+
+    Returns:
+        A single merged conversation tuple in the same format
+    """
+    (title_a, participants_a, chat_type_a, total_messages_a, total_chars_a, call_duration_a,
+     sent_messages_a, start_date_a, total_photos_a, total_gifs_a, total_videos_a, total_files_a,
+     participant_chars_a) = a
+    (title_b, participants_b, _, total_messages_b, total_chars_b, call_duration_b,
+     sent_messages_b, start_date_b, total_photos_b, total_gifs_b, total_videos_b, total_files_b,
+     participant_chars_b) = b
+
+    participants = defaultdict(int, participants_a)
+    for name, count in participants_b.items():
+        participants[name] += count
+
+    participant_chars = defaultdict(int, participant_chars_a)
+    for name, chars in participant_chars_b.items():
+        participant_chars[name] += chars
+
+    start_dates = [d for d in (start_date_a, start_date_b) if d]
+    start_date = min(start_dates) if start_dates else 0
+
+    return (
+        title_a or title_b, participants, chat_type_a, total_messages_a + total_messages_b,
+        total_chars_a + total_chars_b, call_duration_a + call_duration_b,
+        sent_messages_a + sent_messages_b, start_date, total_photos_a + total_photos_b,
+        total_gifs_a + total_gifs_b, total_videos_a + total_videos_b, total_files_a + total_files_b,
+        participant_chars
+    )
+
+
+class ConversationMerger:
+    """
+    Incremental reduce step of the extraction: collects conversation tuples
+    as they are extracted, merging any e2e (E2EE) contact with their regular
+    private-chat folder (matched by normalized display name) whichever of the
+    two arrives first.
+
+    The outcome is the same as merging once everything is extracted: only
+    the first folder of a name is matched with the e2e contact of that name,
+    a group chat of that name drops the contact instead of merging it, and
+    of several contacts with the same normalized name the last one is kept.
+
+    Every call reports the rows it touched, so a view can insert new rows
+    right away and update a row in place once its merge partner arrives.
+    """
+
+    def __init__(self, private_label):
+        """
+        Args:
+            private_label: Chat type label used for private chats
+        """
+        self.private_label = private_label
+        # Conversation tuples, the index is the row's identifier
+        self.rows = []
+        # Normalized name -> row index of the e2e contact no folder claimed yet
+        self._unmatched_e2e = {}
+        # Normalized name -> row index of the first folder of that name, None for a group chat
+        self._folders = {}
+
+    def _append(self, conversation):
+        """Adds a new row and returns its change entry"""
+        self.rows.append(conversation)
+        return len(self.rows) - 1, conversation, True
+
+    def add_folder(self, data):
+        """
+        Adds the conversation tuple of a regular folder
+
+        Args:
+            data: Tuple returned by extract_data(), or None for a broken folder
+
+        Returns:
+            List of (index, conversation, is_new) changes
+        """
+        if data is None or len(data[1]) == 0:
+            # Broken folder, or no valid participants found (not an inbox folder)
+            return []
+
+        key = normalize_name(data[0])
+        private = data[2] == self.private_label
+        index = self._unmatched_e2e.pop(key, None)
+        if index is None:
+            change = self._append(data)
+            self._folders.setdefault(key, change[0] if private else None)
+            return [change]
+
+        self._folders.setdefault(key, index if private else None)
+        if private:
+            self.rows[index] = merge_conversation_tuples(data, self.rows[index])
+        else:
+            # A group chat of the same name drops the contact, and takes over its row
+            self.rows[index] = data
+        return [(index, self.rows[index], False)]
+
+    def add_e2e(self, e2e_results):
+        """
+        Adds the per-contact tuples of the e2e folder
+
+        Args:
+            e2e_results: List of tuples returned by extract_e2e_data()
+
+        Returns:
+            List of (index, conversation, is_new) changes
+        """
+        # Of several contacts with the same normalized name, the last one is kept
+        contacts = {}
+        for e2e_conversation in e2e_results:
+            if len(e2e_conversation[1]) != 0:
+                contacts[normalize_name(e2e_conversation[0])] = e2e_conversation
+
+        changes = []
+        for key, e2e_conversation in contacts.items():
+            if key not in self._folders:
+                change = self._append(e2e_conversation)
+                self._unmatched_e2e[key] = change[0]
+                changes.append(change)
+                continue
+            index = self._folders[key]
+            if index is not None:
+                self.rows[index] = merge_conversation_tuples(self.rows[index], e2e_conversation)
+                changes.append((index, self.rows[index], False))
+        return changes
+
+
+def merge_all_conversations(folder_results, e2e_results, private_label):
+    """
+    Reduce step of extract_all_conversations(): merges any e2e (E2EE)
+    contact with their pre-existing regular private-chat folder when both
+    exist for the same person (matched by normalized display name)
+
+    Args:
+        folder_results: Conversation tuples of the regular folders, in folder
+            order (None for folders that couldn't be processed)
+        e2e_results: Conversation tuples returned by extract_e2e_data()
+        private_label: Chat type label used for private chats
+
+    Returns:
+        List of conversation tuples, one per unique conversation/contact:
+        folders in order (merged ones in place), then unmatched e2e contacts
+    """
+    merger = ConversationMerger(private_label)
+    with instrumentation.phase('merge'):
+        for data in folder_results:
+            merger.add_folder(data)
+        merger.add_e2e(e2e_results)
+    return merger.rows
+
+
+def _check_cancelled(cancel):
+    """Raises ExtractionCancelled once the cancel event has been set"""
+    if cancel is not None and cancel.is_set():
+        raise ExtractionCancelled()
+
+
+def _summarize_folder_safe(folder_columns, options):
+    """
+    Wraps summarize_folder(), so a single broken folder is reported and
+    skipped instead of aborting the whole extraction
+
+    Returns:
+        Conversation tuple, or None if the folder couldn't be processed
+    """
+    if folder_columns is None:
+        return None
+    try:
+        return summarize_folder(folder_columns, options)
+    except Exception as e:
+        print(f"Error loading conversation: {str(e)}")
+        return None
+
+
+def _load_folder_worker(directory, conversation, options):
+    """
+    Worker process entry point: loads a folder (see _load_folder_columns_safe)
+    and reports the timers and counters recorded meanwhile
+
+    Returns:
+        (folder_columns, report): the folder's FileColumns (None if it
+        couldn't be processed) and the worker's IngestReport for it
+    """
+    report = instrumentation.begin()
+    with profiling.worker_recording():
+        folder_columns = _load_folder_columns_safe(directory, conversation, options)
+    return folder_columns, report
+
+
+def _collect(report, loaded):
+    """Merges a worker's report into the upload's one and returns the folder columns"""
+    folder_columns, worker_report = loaded
+    report.merge(worker_report)
+    return folder_columns
+
+
+def _store_columns(store, folder_columns):
+    """Keeps the columns returned by a worker process in the in-memory store"""
+    if store is not None and folder_columns is not None:
+        for columns in folder_columns:
+            store.put(columns)
+
+
+def iter_extracted(directory, options, workers=1, cancel=None, store=None):
+    """
+    Extracts every conversation folder of a directory (and its e2e folder),
+    yielding each result as soon as it's available
+
+    Folders whose files are all unchanged in the column store are summarized
+    straight from memory. With more than one worker, the remaining folders
+    are parsed in parallel worker processes; folder results are still yielded
+    in folder order, the e2e results as soon as they are done.
+
+    Args:
+        directory: Inbox directory (with a trailing slash) or export archive(s), see sources
+        options: ExtractOptions with the date range, username and chat type labels
+        workers: Number of worker processes, 1 (or less) for serial extraction
+        cancel: Optional threading.Event; once set, extraction stops between folders
+        store: Optional ColumnStore keeping the parsed files between extractions
+
+    Yields:
+        (kind, result, done, total) where kind is 'folder' (result is an
+        extract_data() tuple or None) or 'e2e' (result is the
+        extract_e2e_data() list), done/total count the processed folders
+
+    Raises:
+        ExtractionCancelled: If the cancel event was set before extraction finished
+    """
+    # Profiled as a whole when profiling is enabled, see profiling
+    with profiling.profiled('extract'):
+        yield from _iter_extracted(directory, options, workers, cancel, store)
+
+
+def _iter_extracted(directory, options, workers, cancel, store):
+    """Implementation of iter_extracted()"""
+    report = instrumentation.begin()
+    report.json_backend = options.json_backend
+    with instrumentation.phase('listdir'):
+        folders = list_conversations(directory)
+    has_e2e = 'e2e' in folders
+    folders = [conversation for conversation in folders if conversation != 'e2e']
+    total = len(folders) + (1 if has_e2e else 0)
+    done = 0
+    started = perf_counter()
+
+    # Folders already in memory don't need a worker
+    stored = {}
+    if store is not None:
+        for conversation in folders + (['e2e'] if has_e2e else []):
+            folder_columns = _stored_folder_columns(directory, conversation, store)
+            if folder_columns is not None:
+                stored[conversation] = folder_columns
+    stale = [conversation for conversation in folders if conversation not in stored]
+
+    if workers <= 1 or len(stale) <= 1:
+        if has_e2e:
+            _check_cancelled(cancel)
+            done += 1
+            e2e_columns = stored.get('e2e') or load_folder_columns(directory, 'e2e', options, store)
+            yield 'e2e', summarize_e2e(e2e_columns, options), done, total
+
+        for conversation in folders:
+            _check_cancelled(cancel)
+            done += 1
+            folder_columns = stored.get(conversation)
+            if folder_columns is None:
+                folder_columns = _load_folder_columns_safe(directory, conversation, options, store)
+            yield 'folder', _summarize_folder_safe(folder_columns, options), done, total
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            # The e2e folder is usually the largest one, start it first
+            e2e_future = None
+            if has_e2e and 'e2e' not in stored:
+                e2e_future = executor.submit(_load_folder_worker, directory, 'e2e', options)
+            elif has_e2e:
+                done += 1
+                yield 'e2e', summarize_e2e(stored['e2e'], options), done, total
+
+            # Batch folders so thousands of tiny conversations don't each pay a round-trip
+            chunksize = max(1, len(stale) // (workers * 4))
+            loaded = executor.map(
+                _load_folder_worker, [directory] * len(stale), stale, [options] * len(stale),
+                chunksize=chunksize
+            )
+            for conversation in folders:
+                folder_columns = stored.get(conversation)
+                if folder_columns is None:
+                    folder_columns = _collect(report, next(loaded))
+                    _store_columns(store, folder_columns)
+                _check_cancelled(cancel)
+                done += 1
+                yield 'folder', _summarize_folder_safe(folder_columns, options), done, total
+
+                if e2e_future is not None and e2e_future.done():
+                    done += 1
+                    e2e_columns = _collect(report, e2e_future.result()) or []
+                    _store_columns(store, e2e_columns)
+                    yield 'e2e', summarize_e2e(e2e_columns, options), done, total
+                    e2e_future = None
+
+            if e2e_future is not None:
+                done += 1
+                e2e_columns = _collect(report, e2e_future.result()) or []
+                _store_columns(store, e2e_columns)
+                yield 'e2e', summarize_e2e(e2e_columns, options), done, total
+        except (ExtractionCancelled, GeneratorExit):
+            # Drop queued folders, workers finish their current batch on their own
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+    # Keep the persistent cache within its size cap
+    cache = open_cache(options.cache_path)
+    if cache is not None:
+        with instrumentation.phase('cache'):
+            cache.evict()
+
+    report.finish()
+    print(
+        f"Ingested {total} folders in {perf_counter() - started:.2f}s "
+        f"({len(stored)} from memory, JSON backend: {options.json_backend}, workers: {max(1, workers)})"
+    )
+
+
+def extract_all_conversations(directory, options, workers=1, progress=None, cancel=None, store=None):
+    """
+    Extracts stats for every conversation in a directory, merging any e2e
+    (E2EE) contact with their pre-existing regular private-chat folder when
+    both exist for the same person, so each real-life contact is represented
+    as a single combined row instead of being duplicated between an old
+    export folder and the newer e2e export.
+
+    With more than one worker, conversation folders (and the e2e folder) are
+    parsed in parallel worker processes; the e2e merge is then done here as a
+    reduce step, so the result is identical to the serial path.
+
+    Args:
+        directory: Inbox directory (with a trailing slash) or export archive(s), see sources
+        options: ExtractOptions with the date range, username and chat type labels
+        workers: Number of worker processes, 1 (or less) for serial extraction
+        progress: Optional callable(done, total) invoked after each processed folder
+        cancel: Optional threading.Event; once set, extraction stops between folders
+        store: Optional ColumnStore keeping the parsed files between extractions
+
+    Returns:
+        List of conversation tuples, same format as extract_data(), one
+        per unique conversation/contact.
+
+    Raises:
+        ExtractionCancelled: If the cancel event was set before extraction finished
+    """
+    folder_results = []
+    e2e_results = []
+    for kind, result, done, total in iter_extracted(directory, options, workers, cancel, store):
+        if kind == 'e2e':
+            e2e_results = result
+        else:
+            folder_results.append(result)
+        if progress is not None:
+            progress(done, total)
+
+    return merge_all_conversations(folder_results, e2e_results, options.private_label)
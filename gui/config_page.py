@@ -5,6 +5,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog
 from tkcalendar import DateEntry
 from utils import existing_languages, apply_theme
+from sources import ZIP_SEPARATOR
 
 class ConfigurationPage(tk.Frame):
     """Configuration panel for initial setup"""
@@ -33,10 +34,15 @@ class ConfigurationPage(tk.Frame):
         self.directory_label = tk.Label(self, text=self.module.TITLE_NO_SELECTION)
         self.directory_label.pack(side='top', pady=5)
 
-        # Show 'Open File Explorer' button
+        # Show 'Open File Explorer' and 'Open ZIP archive' buttons side by side
+        source_buttons = tk.Frame(self)
+        source_buttons.pack(side='top', pady=5)
         ttk.Button(
-            self, text=f'{self.module.TITLE_OPEN_FE}...', padding=5, command=self.open_file_explorer
-        ).pack(side='top', pady=5)
+            source_buttons, text=f'{self.module.TITLE_OPEN_FE}...', padding=5, command=self.open_file_explorer
+        ).pack(side='left', padx=5)
+        ttk.Button(
+            source_buttons, text=f'{self.module.TITLE_OPEN_ZIP}...', padding=5, command=self.open_zip_explorer
+        ).pack(side='left', padx=5)
 
         # Create 'from' date entry using tkcalendar
         tk.Label(self, text=f'{self.module.TITLE_FROM}:').pack(side='top', pady=5)
@@ -97,3 +103,14 @@ class ConfigurationPage(tk.Frame):
         self.directory_label.config(
             text=(self.module.TITLE_NO_SELECTION if path == '' or path.isspace() or path == '/' else path)
         )
+
+    def open_zip_explorer(self):
+        """
+        Open file explorer to select the export's ZIP archive(s); all parts of
+        a split export can be selected at once
+        Invoked by pressing the 'Open ZIP archive...' button
+        """
+        paths = tk.filedialog.askopenfilenames(filetypes=[('ZIP', '*.zip')])
+        self.directory_label.config(
+            text=(ZIP_SEPARATOR.join(paths) if paths else self.module.TITLE_NO_SELECTION)
+        )
@@ -3,14 +3,19 @@ Main page module for CounterForMessenger
 """
 import tkinter as tk
 from tkinter import ttk
-from os import listdir
-from functools import cmp_to_key
+from zipfile import BadZipFile
 
 from popups.statistics_popup import StatisticsPopup
 from popups.multi_sort_popup import MultiSortPopup
 from popups.loading_popup import LoadingPopup
+from gui.virtual_table import VirtualTable
+from row_model import RowModel
+from sources import list_conversations
 from utils import PREFIX
 
+# Milliseconds without typing before the search runs
+SEARCH_DELAY = 150
+
 class MainPage(tk.Frame):
     """Main panel of the application showing message statistics"""
 
@@ -34,8 +39,11 @@ class MainPage(tk.Frame):
         self.top_bar.pack(side="top", fill="x", padx=10, pady=(10, 5))
 
         # Build treeview for message data projection
+        # The rows live in a Python row model, the treeview only shows the visible ones
         scrollbar = tk.Scrollbar(self.main)
-        self.treeview = ttk.Treeview(self.main, height=20, yscrollcommand=scrollbar.set, style='Custom.Treeview')
+        self.treeview = ttk.Treeview(self.main, height=20, style='Custom.Treeview')
+        self.rows = RowModel(self.controller.collator)
+        self.table = VirtualTable(self.treeview, scrollbar, self.rows)
         columns = {
             'name': self.module.TITLE_NAME,
             'pep': self.module.TITLE_PARTICIPANTS,
@@ -96,6 +104,9 @@ class MainPage(tk.Frame):
         # Store whether each column is reversed (for multi-sort)
         self.columns_reversed = dict()
 
+        # Active single-column sort as (column, order, bias), None if unsorted
+        self.sort_state = None
+
         # Show frame title
         self.title = ttk.Label(
             self.top_bar, text=f'{self.module.TITLE_NUMBER_OF_MSGS} ', style="Custom.TLabel",
@@ -126,6 +137,9 @@ class MainPage(tk.Frame):
             lambda e: self.search_entry.delete(0, "end") if self.search_entry.get() ==
             self.module.TITLE_SEARCH else None
         )
+        # Search as you type, once typing pauses
+        self.search_job = None
+        self.search_entry.bind("<KeyRelease>", lambda e: self.schedule_search())
 
         # Search button with icon
         self.search_button = ttk.Button(
@@ -149,6 +163,18 @@ class MainPage(tk.Frame):
             )
         ).pack(side='top', pady=10)
 
+        # Full-text search over the message texts, see message_index
+        ttk.Button(
+            self.nav, text=self.module.TITLE_SEARCH_MESSAGES, style="TButton",
+            command=lambda: self._show_message_search_popup()
+        ).pack(side='top', pady=10)
+
+        # Regular expression scan over the message texts, see regex_scan
+        ttk.Button(
+            self.nav, text=self.module.TITLE_REGEX_SCAN, style="TButton",
+            command=lambda: self._show_regex_scan_popup()
+        ).pack(side='top', pady=10)
+
         # Show exit button
         self.exit_button = ttk.Button(
             self.nav, image=self.controller.theme_manager.get_icon("exit"), text=self.module.TITLE_EXIT, compound='left', style="TButton",
@@ -171,7 +197,7 @@ class MainPage(tk.Frame):
 
         scrollbar.pack(side='right', fill='y')
         self.treeview.pack(side='left', fill='both', expand=1)
-        scrollbar.config(command=self.treeview.yview)
+        scrollbar.config(command=self.table.yview)
         self.nav.pack(side='left', fill='y')
         self.main.pack(side='right', fill='both', expand=True)
 
@@ -185,27 +211,51 @@ class MainPage(tk.Frame):
         from popups.profile_popup import ProfilePopup
         ProfilePopup(self.controller)
 
+    def _show_message_search_popup(self):
+        """Show the message search popup"""
+        from popups.message_search_popup import MessageSearchPopup
+        MessageSearchPopup(self.controller)
+
+    def _show_regex_scan_popup(self):
+        """Show the regex scan popup"""
+        from popups.regex_scan_popup import RegexScanPopup
+        RegexScanPopup(self.controller)
+
     def deselect(self):
         """
         Remove current treeview selection
         Invoked on <Button-3> (right-click)
         """
-        self.treeview.selection_remove(self.treeview.selection())
+        self.rows.selection.clear()
+        self.table.refresh()
+
+    def schedule_search(self):
+        """
+        Run the search SEARCH_DELAY ms after the last keystroke
+        Invoked on every key release in the search entry
+        """
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DELAY, self.search)
 
     def search(self):
         """
         Search for text in the treeview and highlight matching rows
-        Highlight all messages whose values contain the query at least once
+        Highlight all conversations whose title or a participant name contains
+        the query, ignoring case and accents
         """
+        self.search_job = None
         query = self.search_entry.get()
-        selections = []
-        for child in self.treeview.get_children():
-            for value in self.treeview.item(child)['values']:
-                if query in str(value):
-                    # Selection accepted, save it and move on
-                    selections.append(child)
-                    break
-        self.treeview.selection_set(selections)
+        if query == self.module.TITLE_SEARCH:
+            # Placeholder text, nothing typed yet
+            query = ''
+        matches = self.rows.matching(query)
+        self.rows.select(matches)
+        if matches:
+            # Scroll to the first match, the others may be far out of view
+            self.table.see(matches[0])
+        else:
+            self.table.refresh()
 
     def upload_data(self):
         """
@@ -213,11 +263,16 @@ class MainPage(tk.Frame):
         Invoked by pressing the upload button
         """
         # Wipe all previous data in treeview
-        self.treeview.delete(*self.treeview.get_children())
+        self.rows.clear()
+        self.table.reset()
         try:
             directory = self.controller.get_directory()
-            conversations = len(listdir(directory))
-            LoadingPopup(self.controller, conversations, self.treeview)
+            conversations = len(list_conversations(directory))
+            # Rows stream in from the background; keep them sorted and striped as they arrive.
+            # The list stays usable meanwhile, only starting another load is not
+            self.set_loading(True)
+            LoadingPopup(self.controller, conversations, self.rows, on_rows_changed=self.refresh_row_order,
+                         on_finished=lambda: self.set_loading(False))
 
             # Bind general purpose handler to column clicks
             self.treeview.heading('msg', command=lambda col='msg': self.click_column(col, False, 'numberwise'))
@@ -229,10 +284,21 @@ class MainPage(tk.Frame):
             self.treeview.heading('videos', command=lambda col='videos': self.click_column(col, False, 'numberwise'))
             self.treeview.heading('files', command=lambda col='files': self.click_column(col, False, 'numberwise'))
 
-            self.set_treeview_theme()
-
         except FileNotFoundError:
             print('>MainPage/upload_data THROWS FileNotFoundError, NOTIFY OP IF UNEXPECTED')
+        except BadZipFile as e:
+            print(f"Error opening export archive: {e}")
+
+    def set_loading(self, loading):
+        """
+        Disables the actions that (re)load the data while an upload runs
+
+        Args:
+            loading: True when an upload starts, False once it's over
+        """
+        state = 'disabled' if loading else '!disabled'
+        self.upload_button.state([state])
+        self.settings_button.state([state])
 
     def set_icons(self):
         """
@@ -254,11 +320,22 @@ class MainPage(tk.Frame):
         we want to display the children of the treeview
         """
         theme = self.controller.get_theme()
-        for i, item in enumerate(self.treeview.get_children()):
-            tag = "even" if i % 2 == 0 else "odd"
-            self.treeview.item(item, tags=(tag,))
         self.treeview.tag_configure("even", background=theme.TREEVIEW_EVEN_ROW)
         self.treeview.tag_configure("odd", background=theme.TREEVIEW_ODD_ROW)
+        # The table tags the visible rows by their position in the model
+        self.table.refresh()
+
+    def refresh_row_order(self):
+        """
+        Re-applies the active sort (single- or multi-column) and the row
+        striping, after rows were added to or changed in the treeview
+        """
+        if self.sort_columns:
+            self.apply_multi_sort()
+        elif self.sort_state is not None:
+            self.sort_treeview(*self.sort_state)
+        else:
+            self.set_treeview_theme()
 
     def click_column(self, col, order, bias):
         """
@@ -281,25 +358,15 @@ class MainPage(tk.Frame):
         Args:
             column: Column to sort by
             order: Sort order (True for descending, False for ascending)
-            bias: Sort bias (stringwise or numberwise)
+            bias: Sort bias (stringwise or numberwise); the row model's typed
+                sort keys already compare text and numbers correctly
         """
-        # Cache the get_children call
-        children = self.treeview.get_children('')
-        # Retrieve the column's contents
-        contents = [(self.treeview.set(k, column), k) for k in children]
-        # For number-wise sorting, convert to integers once, beforehand
-        if bias == 'numberwise':
-            # Convert strings to integers and sort
-            contents = [(int(val), k) for val, k in contents]
-            contents.sort(key=lambda t: t[0], reverse=order)
-        else:
-            # For string-wise sorting, Python's default sort is string-wise
-            contents.sort(reverse=order)
-        # Reinsert the items into the treeview in sorted order
-        for index, (val, k) in enumerate(contents):
-            self.treeview.move(k, '', index)
+        # One sort of the model's display order, the table renders the visible rows
+        self.rows.sort([(column, order)])
         # Reassign alternating row-stripe tags to match the new order
         self.set_treeview_theme()
+        # Remember the sort so rows loaded later can be kept in order
+        self.sort_state = (column, order, bias)
         # Reverse the order for the next sort
         self.treeview.heading(column, command=lambda: self.sort_treeview(column, not order, bias))
 
@@ -307,60 +374,11 @@ class MainPage(tk.Frame):
         """
         Sort the treeview based on multiple columns
 
-        This function sorts the rows based on the ordering stored in `self.sort_columns`.
-        To achieve this, the `compare` function tries to break ties based
-        each successive column in the ordering, before giving up and declaring a tie.
+        This function sorts the rows based on the ordering stored in `self.sort_columns`,
+        breaking ties on each successive column (see RowModel.sort).
         """
-        def compare(a, b, ordering):
-            # a and b are *rows* of data (dictionaries)
-            if ordering == []:
-                # We have nothing left to break ties on
-                return 0
-
-            # We will try to break the tie on this column
-            column_name = ordering[0]
-            bias = self.column_biases[column_name]
-            reverse_multiplier = -1 if self.columns_reversed[column_name] else 1
-
-            # Retrieve the appropriate column from each row
-            a_value = a[column_name]
-            b_value = b[column_name]
-
-            if bias == "stringwise":
-                if a_value < b_value: return -1 * reverse_multiplier
-                elif a_value > b_value: return 1 * reverse_multiplier
-            elif bias == "numberwise":
-                a_value, b_value = int(a_value), int(b_value)
-                if a_value < b_value: return -1 * reverse_multiplier
-                elif a_value > b_value: return 1 * reverse_multiplier
-            else:
-                raise ValueError(f"Undefined bias '{bias}'")
-
-            # If we made it here, then the values are equal when compared
-            # on the current column value. Continue with the next column in the ordering.
-            return compare(a, b, ordering[1:])
-
-        def compare_wrapper(a, b):
-            (_, a) = a
-            (_, b) = b
-            return compare(a, b, self.sort_columns)
-
-        # Retrieve all of the rows of the dataset
-        children = self.treeview.get_children('')
-        rows = [
-            (k,
-                {
-                    column_name: self.treeview.set(k, column_name)
-                    for column_name in self.column_biases
-                }
-            )
-            for k in children
-        ]
-
-        rows.sort(key = cmp_to_key(compare_wrapper))
-
-        for (idx, (k, _)) in enumerate(rows):
-            self.treeview.move(k, '', idx)
+        self.rows.sort([(column, self.columns_reversed.get(column, False)) for column in self.sort_columns])
+        self.sort_state = None
         # Reassign alternating row-stripe tags to match the new order
         self.set_treeview_theme()
 
@@ -370,12 +388,12 @@ class MainPage(tk.Frame):
         Invoked on double left click on any treeview listing
         """
         try:
-            selection = self.treeview.item(self.treeview.selection()[0]).get('values', [])
-            if len(selection) == 0:
+            row = self.table.row_of(self.treeview.selection()[0])
+            if row is None:
                 return
             # Treeview automated conversion problem, read StatisticsPopup comments
             # Removing prefix safeguard
-            StatisticsPopup(self.controller, selection[10].replace(PREFIX, ''))
+            StatisticsPopup(self.controller, self.rows.value(row, 'id').replace(PREFIX, ''))
         except IndexError:
             # Miss-click / empty selection, nothing to show here
             return
@@ -0,0 +1,162 @@
+"""
+Virtualized treeview for CounterForMessenger
+
+A VirtualTable shows a RowModel (see row_model) in a ttk.Treeview holding
+only as many items as there are rows on screen. Scrolling doesn't move the
+treeview, it refills these items with the next rows of the model, so the
+number of Tk items (and Tcl calls per refresh) doesn't depend on the number
+of conversations.
+"""
+
+# Rows scrolled per mouse wheel notch
+WHEEL_ROWS = 3
+
+# Row striping tags, by display position
+STRIPES = ('even', 'odd')
+
+# Event state bits of the Shift and Control modifiers
+SHIFT_MASK = 0x0001
+CONTROL_MASK = 0x0004
+
+
+class VirtualTable:
+    """Shows the visible window of a row model in a treeview, recycling its items on scroll"""
+
+    def __init__(self, treeview, scrollbar, model):
+        """
+        Args:
+            treeview: ttk.Treeview to render into (it must not have its own yscrollcommand)
+            scrollbar: Scrollbar driving the table, its command must be set to yview
+            model: RowModel to show
+        """
+        self.treeview = treeview
+        self.scrollbar = scrollbar
+        self.model = model
+        # Display position of the first visible row
+        self.first = 0
+        # Treeview items, top to bottom, showing the rows from self.first on
+        self.items = []
+        # Number of rows that fit, until the widget was measured use its requested height
+        self.page_size = int(treeview.cget('height'))
+        self.viewport_height = None
+
+        treeview.bind('<Configure>', self._resize)
+        treeview.bind('<<TreeviewSelect>>', self._selection_changed)
+        treeview.bind('<Button-1>', self._press, add='+')
+        treeview.bind('<MouseWheel>', self._wheel)
+        treeview.bind('<Button-4>', self._wheel)
+        treeview.bind('<Button-5>', self._wheel)
+        treeview.bind('<Prior>', lambda event: self._scroll(-1, 'pages'))
+        treeview.bind('<Next>', lambda event: self._scroll(1, 'pages'))
+        treeview.bind('<Home>', lambda event: self._scroll_to(0))
+        treeview.bind('<End>', lambda event: self._scroll_to(len(self.model)))
+
+    def refresh(self):
+        """Renders the visible rows with their values, striping and selection (call after changing the model)"""
+        self._fit()
+        total = len(self.model)
+        self.first = max(0, min(self.first, total - self.page_size))
+        rows = self.model.order[self.first:self.first + self.page_size]
+
+        # Recycle the existing items, only creating or deleting the difference
+        while len(self.items) < len(rows):
+            self.items.append(self.treeview.insert('', 'end'))
+        if len(self.items) > len(rows):
+            self.treeview.delete(*self.items[len(rows):])
+            del self.items[len(rows):]
+
+        selected = []
+        for offset, (item, row) in enumerate(zip(self.items, rows)):
+            self.treeview.item(item, values=self.model.rows[row], tags=(STRIPES[(self.first + offset) % 2],))
+            if row in self.model.selection:
+                selected.append(item)
+        self.treeview.selection_set(selected)
+
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + len(rows)) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def reset(self):
+        """Scrolls back to the top and renders (call after replacing all rows)"""
+        self.first = 0
+        self.refresh()
+
+    def row_of(self, item):
+        """
+        Returns the model row shown in a treeview item
+
+        Args:
+            item: Treeview item identifier, e.g. from treeview.selection()
+
+        Returns:
+            Row identifier, None if the item isn't one of the table's
+        """
+        try:
+            return self.model.order[self.first + self.items.index(item)]
+        except (ValueError, IndexError):
+            return None
+
+    def see(self, row):
+        """Scrolls the table so a row is visible"""
+        position = self.model.position(row)
+        if not self.first <= position < self.first + self.page_size:
+            self.first = position
+        self.refresh()
+
+    def yview(self, *args):
+        """
+        Scrollbar command: ('moveto', fraction) or ('scroll', amount, 'units'|'pages')
+        """
+        if args[0] == 'moveto':
+            self._scroll_to(round(float(args[1]) * len(self.model)))
+        elif args[0] == 'scroll':
+            self._scroll(int(args[1]), args[2])
+
+    def _scroll(self, amount, what):
+        step = self.page_size if what == 'pages' else 1
+        self._scroll_to(self.first + amount * step)
+        return 'break'
+
+    def _scroll_to(self, position):
+        self.first = position
+        self.refresh()
+        return 'break'
+
+    def _wheel(self, event):
+        """Scrolls on mouse wheel (<MouseWheel> on Windows/macOS, <Button-4/5> on X11)"""
+        up = event.num == 4 or (event.num != 5 and event.delta > 0)
+        return self._scroll(-WHEEL_ROWS if up else WHEEL_ROWS, 'units')
+
+    def _press(self, event):
+        """
+        A plain click selects only the clicked row: drops the selected rows scrolled
+        out of view, the treeview itself replaces the selection of the visible ones
+        """
+        if not event.state & (SHIFT_MASK | CONTROL_MASK):
+            self.model.selection.intersection_update(self.row_of(item) for item in self.items)
+
+    def _selection_changed(self, event):
+        """Copies the selection of the visible items into the model, rows out of view keep theirs"""
+        selected = set(self.treeview.selection())
+        for item in self.items:
+            row = self.row_of(item)
+            if item in selected:
+                self.model.selection.add(row)
+            else:
+                self.model.selection.discard(row)
+
+    def _resize(self, event):
+        self.viewport_height = event.height
+        self.refresh()
+
+    def _fit(self):
+        """Sizes the page to the rows fitting in the widget, measured on the first item"""
+        if self.viewport_height is None or not self.items:
+            return
+        box = self.treeview.bbox(self.items[0])
+        if not box:
+            return
+        # The first row starts below the headings
+        _, top, _, row_height = box
+        self.page_size = max(1, (self.viewport_height - top) // max(1, row_height))
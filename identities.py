@@ -0,0 +1,165 @@
+"""
+Identity table for CounterForMessenger
+
+Every distinct person (sender or participant) seen while summarizing
+conversations is interned once into a process-wide table and referred to
+by a small integer id afterwards. A conversation's counters (see Tally)
+are arrays with a slot per person of that conversation instead of
+name-keyed dicts, and the normalized form used to match e2e contacts with
+their regular chats is computed once per name instead of on every
+comparison. Chat titles are not interned.
+
+The table only holds the people of the export being analyzed: it's cleared
+together with the column store (see ColumnStore.clear) when another data
+source is selected. Ids handed out before a clear are recognized by the
+table's generation and interned again.
+"""
+from array import array
+
+
+class IdentityTable:
+    """Maps display names to small integer ids, memoizing their normalized form"""
+
+    def __init__(self):
+        # Bumped by every clear(), so ids cached elsewhere can be checked
+        self.generation = 0
+        self.clear()
+
+    def clear(self):
+        """Forgets every name; ids handed out so far must not be used anymore"""
+        # Display name -> id
+        self.ids = {}
+        # id -> display name
+        self.names = []
+        # id -> normalized name, computed on first use
+        self.keys = []
+        self.generation += 1
+
+    def intern(self, name):
+        """
+        Returns the id of a name, assigning the next free one on first sight
+
+        Args:
+            name: Display name (mojibake already fixed)
+
+        Returns:
+            Integer id of the name
+        """
+        identity = self.ids.get(name)
+        if identity is None:
+            identity = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.keys.append(None)
+        return identity
+
+    def key(self, identity):
+        """
+        Returns the normalized form of an interned name, used to decide
+        whether two conversations belong to the same person
+
+        Args:
+            identity: Integer id returned by intern()
+
+        Returns:
+            The stripped, casefolded name
+        """
+        key = self.keys[identity]
+        if key is None:
+            key = self.keys[identity] = self.names[identity].strip().casefold()
+        return key
+
+    def to_names(self, counters):
+        """
+        Converts an id-keyed counter back to a name-keyed one
+
+        Args:
+            counters: Dict of id -> value
+
+        Returns:
+            Dict of display name -> value, in the same order
+        """
+        names = self.names
+        return {names[identity]: value for identity, value in counters.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+
+# Tally.flags bits: listed as a participant or sender, has counted characters
+_LISTED = 1
+_HAS_CHARS = 2
+
+
+class Tally:
+    """
+    Messages and characters per person of one conversation, in arrays with
+    one slot per person of the conversation (not of the whole table); the
+    order people were first seen in is kept, like in the name-keyed dicts
+    the result is converted to
+    """
+
+    def __init__(self, table):
+        """
+        Args:
+            table: IdentityTable the ids come from
+        """
+        self.table = table
+        # Identity id -> slot in the arrays below, in first-seen order
+        self.slots = {}
+        self.ids = array('q')
+        self.messages = array('q')
+        self.chars = array('q')
+        self.flags = bytearray()
+        # Slots in the order they were listed / got characters
+        self.listed = []
+        self.with_chars = []
+
+    def _slot(self, identity):
+        """Returns the slot of an id, adding one for a person seen for the first time"""
+        slot = self.slots.get(identity)
+        if slot is None:
+            slot = self.slots[identity] = len(self.ids)
+            self.ids.append(identity)
+            self.messages.append(0)
+            self.chars.append(0)
+            self.flags.append(0)
+        return slot
+
+    def add_participant(self, identity):
+        """Lists a person, without counting any message"""
+        slot = self._slot(identity)
+        if not self.flags[slot] & _LISTED:
+            self.flags[slot] |= _LISTED
+            self.listed.append(slot)
+
+    def add_messages(self, identity, count):
+        """Counts messages sent by a person"""
+        self.add_participant(identity)
+        self.messages[self.slots[identity]] += count
+
+    def add_chars(self, identity, chars):
+        """Counts characters written by a person"""
+        slot = self._slot(identity)
+        if not self.flags[slot] & _HAS_CHARS:
+            self.flags[slot] |= _HAS_CHARS
+            self.with_chars.append(slot)
+        self.chars[slot] += chars
+
+    def sent(self, identity):
+        """Returns the number of messages counted for a person"""
+        slot = self.slots.get(identity)
+        return 0 if slot is None else self.messages[slot]
+
+    def message_names(self):
+        """Returns the messages per person, as a dict of display name -> count"""
+        names, ids, messages = self.table.names, self.ids, self.messages
+        return {names[ids[slot]]: messages[slot] for slot in self.listed}
+
+    def char_names(self):
+        """Returns the characters per person, as a dict of display name -> count"""
+        names, ids, chars = self.table.names, self.ids, self.chars
+        return {names[ids[slot]]: chars[slot] for slot in self.with_chars}
+
+
+# Shared by every conversation summarized in this process
+identities = IdentityTable()
@@ -0,0 +1,173 @@
+"""
+Persistent ingestion cache for CounterForMessenger
+
+Stores the per-file message columns read while parsing an export in a small
+SQLite database, keyed by the file's absolute path, size and modification
+time. Facebook exports are immutable once downloaded, so unchanged files
+can be skipped entirely on the next upload.
+"""
+import pickle
+import sqlite3
+import threading
+from os import getpid, makedirs
+from os.path import dirname
+from time import time
+
+# Default location, next to config.txt
+CACHE_PATH = 'cache/ingest.sqlite3'
+
+# Bump whenever the layout of the cached aggregates changes, so stale
+# entries from an older version are discarded instead of misread
+CACHE_VERSION = 3
+
+# Size cap for the cached aggregates; least recently used entries are evicted beyond it
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class IngestCache:
+    """
+    SQLite-backed store of per-file aggregates with LRU eviction.
+
+    Lookups and writes are buffered and only committed by flush(), so a
+    whole conversation folder costs a single transaction.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Open (or create) the cache database
+
+        Args:
+            path: Path of the SQLite database file
+            max_bytes: Size cap enforced by evict()
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        if dirname(path):
+            makedirs(dirname(path), exist_ok=True)
+        # Several worker processes may share the database, wait for their locks
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self._pending = []
+        self._touched = []
+        self._check_version()
+
+    def _check_version(self):
+        """Creates the tables, wiping them when they were written by another cache version"""
+        with self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != str(CACHE_VERSION):
+                self.connection.execute('DROP TABLE IF EXISTS files')
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (str(CACHE_VERSION),)
+                )
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS files ('
+                'path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, variant TEXT, '
+                'data BLOB, bytes INTEGER, last_used REAL)'
+            )
+
+    def get(self, path, size, mtime, variant=''):
+        """
+        Looks up the cached aggregate of a file
+
+        Args:
+            path: Absolute path of the file
+            size: Current size of the file in bytes
+            mtime: Current modification time of the file (st_mtime_ns)
+            variant: Extra key for settings the aggregate depends on
+
+        Returns:
+            The cached aggregate, or None if missing or stale
+        """
+        row = self.connection.execute(
+            'SELECT data FROM files WHERE path = ? AND size = ? AND mtime = ? AND variant = ?',
+            (path, size, mtime, variant)
+        ).fetchone()
+        if row is None:
+            return None
+        self._touched.append(path)
+        return pickle.loads(row[0])
+
+    def put(self, path, size, mtime, value, variant=''):
+        """
+        Queues the aggregate of a file for storage (written by flush())
+
+        Args:
+            path: Absolute path of the file
+            size: Size of the file in bytes
+            mtime: Modification time of the file (st_mtime_ns)
+            value: Picklable aggregate to store
+            variant: Extra key for settings the aggregate depends on
+        """
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._pending.append((path, size, mtime, variant, data, len(data), time()))
+
+    def flush(self):
+        """Writes queued aggregates and refreshes the last use time of cache hits"""
+        if not self._pending and not self._touched:
+            return
+        now = time()
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO files (path, size, mtime, variant, data, bytes, last_used) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', self._pending
+            )
+            self.connection.executemany(
+                'UPDATE files SET last_used = ? WHERE path = ?', [(now, path) for path in self._touched]
+            )
+        self._pending.clear()
+        self._touched.clear()
+
+    def evict(self):
+        """Deletes the least recently used entries until the cache fits in max_bytes"""
+        with self.connection:
+            self.connection.execute(
+                'DELETE FROM files WHERE path IN ('
+                'SELECT path FROM (SELECT path, SUM(bytes) OVER (ORDER BY last_used DESC, path) AS running '
+                'FROM files) WHERE running > ?)', (self.max_bytes,)
+            )
+
+    def clear(self):
+        """Deletes every cached entry"""
+        self._pending.clear()
+        self._touched.clear()
+        with self.connection:
+            self.connection.execute('DELETE FROM files')
+        self.connection.execute('VACUUM')
+
+    def close(self):
+        """Flushes pending writes and closes the database"""
+        self.flush()
+        self.connection.close()
+
+
+# Connections are per thread (sqlite3 objects can't cross threads) and per process
+_local = threading.local()
+
+
+def open_cache(path):
+    """
+    Returns this thread's shared IngestCache for a path, opening it on first use
+
+    Args:
+        path: Path of the SQLite database file, or None when caching is disabled
+
+    Returns:
+        IngestCache instance, or None if path is None or the cache can't be opened
+    """
+    if path is None:
+        return None
+    caches = getattr(_local, 'caches', None)
+    if caches is None or _local.pid != getpid():
+        # Connections inherited from a forked parent must not be reused
+        caches = _local.caches = {}
+        _local.pid = getpid()
+    if path not in caches:
+        try:
+            caches[path] = IngestCache(path)
+        except sqlite3.Error as e:
+            print(f"Error opening ingest cache {path}: {e}")
+            caches[path] = None
+    return caches[path]
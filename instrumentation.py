@@ -0,0 +1,175 @@
+"""
+Ingest instrumentation for CounterForMessenger
+
+Every upload starts a new IngestReport (see begin()), which the extraction
+code feeds with per-phase timers and counters while it runs:
+
+    listdir     listing conversation folders and their files
+    read        reading the JSON files
+    parse       decoding the JSON (and, for streamed files, everything else)
+    build       the per-message loop building the message columns
+    cache       persistent ingestion cache lookups and writes
+    filter      the date filter and counting over the message columns
+    merge       merging e2e contacts with their private chats
+    insert      inserting the rows into the main list's row model
+    sort        keeping the main list sorted and rendered while rows arrive
+
+Worker processes record into their own report, which is merged into the
+upload's report when the folder comes back. Nothing is recorded before the
+first upload of the process; the rows inserted after the extraction itself
+finished still count towards the last report. Phase times of worker
+processes add up, so with several workers they can exceed the wall time.
+"""
+import json
+from contextlib import contextmanager
+from heapq import nlargest
+from time import perf_counter
+
+# Order the phases are listed in
+PHASES = ('listdir', 'read', 'parse', 'build', 'cache', 'filter', 'merge', 'insert', 'sort')
+
+
+class IngestReport:
+    """Timers and counters of one upload"""
+
+    def __init__(self):
+        self.started = perf_counter()
+        # Wall time of the extraction, set once it finished
+        self.wall = None
+        # Phase -> seconds
+        self.phases = {}
+        # Counter name -> value
+        self.counters = {}
+        # (conversation, seconds, messages) of every loaded folder
+        self.conversations = []
+        # JSON parser the files were read with (see json_backend), set by the extraction
+        self.json_backend = None
+
+    def add(self, phase, seconds):
+        """Adds time to a phase"""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def count(self, counter, amount=1):
+        """Increments a counter"""
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def add_conversation(self, conversation, seconds, messages):
+        """
+        Records how long a conversation folder took to load
+
+        Args:
+            conversation: Conversation title (or folder name)
+            seconds: Time spent loading its files
+            messages: Number of messages in its files
+        """
+        self.conversations.append((conversation, seconds, messages))
+
+    def merge(self, other):
+        """Adds the timers, counters and conversations of another report (e.g. a worker's)"""
+        for phase, seconds in other.phases.items():
+            self.add(phase, seconds)
+        for counter, amount in other.counters.items():
+            self.count(counter, amount)
+        self.conversations.extend(other.conversations)
+
+    def finish(self):
+        """Records the wall time of the extraction"""
+        self.wall = perf_counter() - self.started
+
+    def slowest(self, top=5):
+        """Returns the (conversation, seconds, messages) of the slowest conversations to load"""
+        return nlargest(top, self.conversations, key=lambda conversation: conversation[1])
+
+    def largest(self, top=5):
+        """Returns the (conversation, seconds, messages) of the conversations with the most messages"""
+        return nlargest(top, self.conversations, key=lambda conversation: conversation[2])
+
+    def to_dict(self, top=5):
+        """
+        Converts the report to a JSON-serializable dict
+
+        Args:
+            top: Number of slowest and largest conversations to list
+
+        Returns:
+            Dict with the wall time, JSON backend, phases, counters, slowest and
+            largest conversations
+        """
+        def conversations(entries):
+            return [
+                {'conversation': conversation, 'seconds': round(seconds, 6), 'messages': messages}
+                for conversation, seconds, messages in entries
+            ]
+
+        return {
+            'wall_seconds': None if self.wall is None else round(self.wall, 6),
+            'json_backend': self.json_backend,
+            'phases': {phase: round(self.phases[phase], 6) for phase in PHASES if phase in self.phases},
+            'counters': dict(sorted(self.counters.items())),
+            'slowest': conversations(self.slowest(top)),
+            'largest': conversations(self.largest(top)),
+        }
+
+    def lines(self, top=5):
+        """Returns the report as lines of text, for display"""
+        data = self.to_dict(top)
+        lines = []
+        if data['wall_seconds'] is not None:
+            lines.append(f"total: {data['wall_seconds']:.3f} s")
+        if data['json_backend'] is not None:
+            lines.append(f"JSON backend: {data['json_backend']}")
+        lines.extend(f'{phase}: {seconds:.3f} s' for phase, seconds in data['phases'].items())
+        lines.extend(f'{counter}: {value}' for counter, value in data['counters'].items())
+        lines.extend(
+            f"slowest: {entry['conversation']} ({entry['seconds']:.3f} s, {entry['messages']})"
+            for entry in data['slowest']
+        )
+        lines.extend(f"largest: {entry['conversation']} ({entry['messages']})" for entry in data['largest'])
+        return lines
+
+    def write_json(self, path, top=5):
+        """Writes the report to a JSON file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(top), f, ensure_ascii=False, indent=2)
+            f.write('\n')
+
+
+# Report of the running (or last) upload in this process, None before the first one
+_report = None
+
+
+def begin():
+    """
+    Starts a new report, which every phase and counter is recorded in from now on
+
+    Returns:
+        The new IngestReport
+    """
+    global _report
+    _report = IngestReport()
+    return _report
+
+
+def current():
+    """Returns the report of the running (or last) upload, None if there was none"""
+    return _report
+
+
+@contextmanager
+def phase(name):
+    """Times the enclosed block into a phase of the current report, if there is one"""
+    report = _report
+    if report is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        report.add(name, perf_counter() - started)
+
+
+def count(counter, amount=1):
+    """Increments a counter of the current report, if there is one"""
+    if _report is not None:
+        _report.count(counter, amount)
@@ -0,0 +1,107 @@
+"""
+JSON parser selection for CounterForMessenger
+
+Parsing the export is the largest cost of an upload, so documents are
+decoded with the fastest parser available: orjson, then ujson, then the
+standard library. The choice can be forced with the CFM_JSON_BACKEND
+environment variable (orjson, ujson, stdlib or auto), or in the app with
+the eighth line of config.txt; the environment variable wins.
+"""
+import json
+from os import environ
+
+# Environment variable forcing a backend
+BACKEND_VARIABLE = 'CFM_JSON_BACKEND'
+
+# Backends in order of preference
+BACKENDS = ('orjson', 'ujson', 'stdlib')
+
+
+def _import_backend(name):
+    """
+    Returns the loads() function of a backend
+
+    Raises:
+        ImportError: If the backend's module isn't installed
+        ValueError: If the backend name is unknown
+    """
+    if name == 'orjson':
+        import orjson
+        return orjson.loads
+    if name == 'ujson':
+        import ujson
+        return ujson.loads
+    if name == 'stdlib':
+        return json.loads
+    raise ValueError(f"Unknown JSON backend {name!r}, expected one of {', '.join(BACKENDS)} or auto")
+
+
+def available_backends():
+    """Returns the names of the installed backends, in order of preference"""
+    available = []
+    for name in BACKENDS:
+        try:
+            _import_backend(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def resolve_backend(name=None, default='auto'):
+    """
+    Picks the backend to use
+
+    Args:
+        name: Requested backend; None reads CFM_JSON_BACKEND, 'auto' (or an
+            empty value) picks the fastest installed one
+        default: Backend requested when name is None and CFM_JSON_BACKEND isn't set
+
+    Returns:
+        Name of the backend
+
+    Raises:
+        ValueError: If the requested backend is unknown
+    """
+    if name is None:
+        name = environ.get(BACKEND_VARIABLE, default)
+    name = name.strip().lower() or 'auto'
+    if name == 'auto':
+        return available_backends()[0]
+    try:
+        _import_backend(name)
+    except ImportError:
+        print(f"JSON backend {name} is not installed, falling back to the standard library")
+        return 'stdlib'
+    return name
+
+
+# Backend name -> loads(), per process
+_loaders = {}
+
+
+def loads(data, backend='stdlib'):
+    """
+    Decodes a JSON document
+
+    Documents the fast parsers refuse (e.g. a message cut off in the
+    middle of an emoji, leaving a lone surrogate escape, which the standard
+    library accepts) are retried with the standard library instead of
+    losing the whole file.
+
+    Args:
+        data: Document as bytes (UTF-8) or str
+        backend: Name returned by resolve_backend()
+
+    Returns:
+        The decoded document
+    """
+    loader = _loaders.get(backend)
+    if loader is None:
+        loader = _loaders[backend] = _import_backend(backend)
+    if loader is json.loads:
+        return loader(data)
+    try:
+        return loader(data)
+    except ValueError:
+        return json.loads(data)
@@ -0,0 +1,144 @@
+"""
+Incremental JSON reader for CounterForMessenger
+
+Facebook exports of big group chats can be hundreds of megabytes per
+message_N.json file, and json.load() materializes the whole document at
+once. This module walks the top-level object of a document from a file
+object, chunk by chunk, and hands large arrays (such as 'messages') out as
+generators, so only one element has to be held in memory at a time.
+"""
+import json
+import re
+
+# Whitespace allowed between JSON tokens
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# Characters a JSON number is made of
+_NUMBER = re.compile(r'[-+0-9.eE]*')
+
+# Characters read from the file per refill
+CHUNK_SIZE = 64 * 1024
+
+
+class _Reader:
+    """Buffered cursor over a text file object, decoding one JSON value at a time"""
+
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size=None):
+        """
+        Appends the next chunk of the file to the buffer, dropping the consumed prefix
+
+        Returns:
+            False once the end of the file has been reached
+        """
+        if self.eof:
+            return False
+        chunk = self.fp.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self):
+        """Moves past whitespace, reading more of the file as needed"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self._fill():
+                return
+
+    def peek(self):
+        """Returns the next non-whitespace character without consuming it ('' at the end)"""
+        self.skip_whitespace()
+        return self.buffer[self.pos] if self.pos < len(self.buffer) else ''
+
+    def expect(self, characters):
+        """
+        Consumes the next non-whitespace character, which must be one of `characters`
+
+        Returns:
+            The consumed character
+        """
+        character = self.peek()
+        if character == '' or character not in characters:
+            raise ValueError(f"Expected one of {characters!r} at offset {self.pos}, got {character!r}")
+        self.pos += 1
+        return character
+
+    def read_value(self):
+        """
+        Decodes the next complete JSON value, reading more of the file until it fits in the buffer
+
+        Returns:
+            The decoded value
+        """
+        self.skip_whitespace()
+        # A number running to the end of the buffer may continue in the next chunk
+        # ('1.' or '2e' would otherwise decode as a shorter number), so it's read whole first
+        while _NUMBER.match(self.buffer, self.pos).end() == len(self.buffer) and self._fill():
+            pass
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Incomplete value, grow the buffer (at least doubling it, so a single
+                # huge value isn't re-decoded once per chunk) and try again
+                if not self._fill(max(self.chunk_size, len(self.buffer))):
+                    raise
+                continue
+            self.pos = end
+            return value
+
+    def iter_array(self):
+        """Yields the elements of the JSON array starting at the cursor, one at a time"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.read_value()
+            if self.expect(',]') == ']':
+                return
+
+
+def iter_object(fp, streamed=('messages',), chunk_size=CHUNK_SIZE):
+    """
+    Iterates over the top-level object of a JSON document without loading it whole
+
+    Values of the keys listed in `streamed` that are arrays are yielded as
+    generators over their elements; they must be consumed (or abandoned)
+    before advancing to the next key. All other values are decoded eagerly.
+
+    Args:
+        fp: Text file object positioned at the start of the document
+        streamed: Top-level keys whose arrays should be streamed
+        chunk_size: Characters read from the file per refill
+
+    Yields:
+        (key, value) pairs in document order
+    """
+    reader = _Reader(fp, chunk_size)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.read_value()
+        reader.expect(':')
+        if key in streamed and reader.peek() == '[':
+            elements = reader.iter_array()
+            yield key, elements
+            # Skip whatever the caller didn't consume
+            for _ in elements:
+                pass
+        else:
+            yield key, reader.read_value()
+        if reader.expect(',}') == '}':
+            return
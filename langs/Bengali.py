@@ -58,4 +58,24 @@ TITLE_CLEAR = 'মুছুন'
 TITLE_APPLY = 'নিশ্চিত করুন'
 TITLE_CANCEL = 'বাতিল করুন'
 TITLE_THEME = 'থিম'
+TITLE_WORKERS = 'কর্মী প্রক্রিয়া'
+TITLE_CLEAR_CACHE = 'ক্যাশ মুছুন'
+TITLE_REMAINING = 'বাকি সময়'
+TITLE_OPEN_ZIP = 'ZIP আর্কাইভ খুলুন'
+TITLE_UPLOAD_REPORT = 'শেষ আপলোডের সময়'
+TITLE_STALLS = 'ইভেন্ট লুপ আটকে থাকা'
+TITLE_SEARCH_MESSAGES = 'বার্তা অনুসন্ধান'
+TITLE_SENDER = 'প্রেরক'
+TITLE_MESSAGE = 'বার্তা'
+TITLE_DATE = 'তারিখ'
+TITLE_UPDATE_INDEX = 'সূচক হালনাগাদ করুন'
+TITLE_INDEXING = 'বার্তা সূচিবদ্ধ করা হচ্ছে'
+TITLE_NO_INDEX = 'বার্তার লেখা খুঁজতে প্রথমে সূচক হালনাগাদ করুন'
+TITLE_REGEX_SCAN = 'রেগেক্স স্ক্যান'
+TITLE_PATTERN = 'রেগুলার এক্সপ্রেশন'
+TITLE_IGNORE_CASE = 'বড়-ছোট হাতের অক্ষর উপেক্ষা করুন'
+TITLE_SCAN = 'স্ক্যান'
+TITLE_HITS = 'মিল'
+TITLE_MATCH = 'মিলে যাওয়া লেখা'
+TITLE_INVALID_PATTERN = 'অবৈধ রেগুলার এক্সপ্রেশন'
 
@@ -58,3 +58,23 @@ TITLE_CLEAR = '清除'
 TITLE_APPLY = '应用'
 TITLE_CANCEL = '取消'
 TITLE_THEME = '主题'
+TITLE_WORKERS = '工作进程数'
+TITLE_CLEAR_CACHE = '清除缓存'
+TITLE_REMAINING = '剩余时间'
+TITLE_OPEN_ZIP = '打开 ZIP 压缩包'
+TITLE_UPLOAD_REPORT = '上次上传耗时'
+TITLE_STALLS = '界面卡顿'
+TITLE_SEARCH_MESSAGES = '搜索消息'
+TITLE_SENDER = '发送者'
+TITLE_MESSAGE = '消息'
+TITLE_DATE = '日期'
+TITLE_UPDATE_INDEX = '更新索引'
+TITLE_INDEXING = '正在索引消息'
+TITLE_NO_INDEX = '请先更新索引以搜索消息内容'
+TITLE_REGEX_SCAN = '正则表达式扫描'
+TITLE_PATTERN = '正则表达式'
+TITLE_IGNORE_CASE = '忽略大小写'
+TITLE_SCAN = '扫描'
+TITLE_HITS = '匹配数'
+TITLE_MATCH = '匹配文本'
+TITLE_INVALID_PATTERN = '无效的正则表达式'
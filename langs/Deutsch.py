@@ -59,3 +59,23 @@ TITLE_CLEAR = 'Zurücksetzen'
 TITLE_APPLY = 'Anwenden'
 TITLE_CANCEL = 'Abbrechen'
 TITLE_THEME = 'Thema'
+TITLE_WORKERS = 'Worker-Prozesse'
+TITLE_CLEAR_CACHE = 'Cache leeren'
+TITLE_REMAINING = 'Verbleibend'
+TITLE_OPEN_ZIP = 'ZIP-Archiv öffnen'
+TITLE_UPLOAD_REPORT = 'Zeiten des letzten Uploads'
+TITLE_STALLS = 'Hänger der Oberfläche'
+TITLE_SEARCH_MESSAGES = 'Nachrichten durchsuchen'
+TITLE_SENDER = 'Absender'
+TITLE_MESSAGE = 'Nachricht'
+TITLE_DATE = 'Datum'
+TITLE_UPDATE_INDEX = 'Index aktualisieren'
+TITLE_INDEXING = 'Nachrichten werden indiziert'
+TITLE_NO_INDEX = 'Aktualisiere zuerst den Index, um Nachrichtentexte zu durchsuchen'
+TITLE_REGEX_SCAN = 'Regex-Suche'
+TITLE_PATTERN = 'Regulärer Ausdruck'
+TITLE_IGNORE_CASE = 'Groß-/Kleinschreibung ignorieren'
+TITLE_SCAN = 'Suchen'
+TITLE_HITS = 'Treffer'
+TITLE_MATCH = 'Fundstelle'
+TITLE_INVALID_PATTERN = 'Ungültiger regulärer Ausdruck'
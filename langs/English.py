@@ -58,3 +58,23 @@ TITLE_CLEAR = 'Clear'
 TITLE_APPLY = 'Apply'
 TITLE_CANCEL = 'Cancel'
 TITLE_THEME = 'Theme'
+TITLE_WORKERS = 'Worker processes'
+TITLE_CLEAR_CACHE = 'Clear cache'
+TITLE_REMAINING = 'Remaining'
+TITLE_OPEN_ZIP = 'Open ZIP archive'
+TITLE_UPLOAD_REPORT = 'Last upload timing'
+TITLE_STALLS = 'Event loop stalls'
+TITLE_SEARCH_MESSAGES = 'Search messages'
+TITLE_SENDER = 'Sender'
+TITLE_MESSAGE = 'Message'
+TITLE_DATE = 'Date'
+TITLE_UPDATE_INDEX = 'Update index'
+TITLE_INDEXING = 'Indexing messages'
+TITLE_NO_INDEX = 'Update the index first to search message texts'
+TITLE_REGEX_SCAN = 'Regex scan'
+TITLE_PATTERN = 'Regular expression'
+TITLE_IGNORE_CASE = 'Ignore case'
+TITLE_SCAN = 'Scan'
+TITLE_HITS = 'Matches'
+TITLE_MATCH = 'Match'
+TITLE_INVALID_PATTERN = 'Invalid regular expression'
@@ -59,3 +59,23 @@ TITLE_CLEAR = 'Limpiar'
 TITLE_APPLY = 'Aplicar'
 TITLE_CANCEL = 'Cancelar'
 TITLE_THEME = 'Tema'
+TITLE_WORKERS = 'Procesos de trabajo'
+TITLE_CLEAR_CACHE = 'Borrar caché'
+TITLE_REMAINING = 'Restante'
+TITLE_OPEN_ZIP = 'Abrir archivo ZIP'
+TITLE_UPLOAD_REPORT = 'Tiempos de la última carga'
+TITLE_STALLS = 'Bloqueos de la interfaz'
+TITLE_SEARCH_MESSAGES = 'Buscar mensajes'
+TITLE_SENDER = 'Remitente'
+TITLE_MESSAGE = 'Mensaje'
+TITLE_DATE = 'Fecha'
+TITLE_UPDATE_INDEX = 'Actualizar índice'
+TITLE_INDEXING = 'Indexando mensajes'
+TITLE_NO_INDEX = 'Actualiza primero el índice para buscar en el texto de los mensajes'
+TITLE_REGEX_SCAN = 'Búsqueda regex'
+TITLE_PATTERN = 'Expresión regular'
+TITLE_IGNORE_CASE = 'Ignorar mayúsculas'
+TITLE_SCAN = 'Buscar'
+TITLE_HITS = 'Coincidencias'
+TITLE_MATCH = 'Coincidencia'
+TITLE_INVALID_PATTERN = 'Expresión regular no válida'
@@ -57,4 +57,24 @@ TITLE_MOVE_DOWN = 'انتقال به پایین'
 TITLE_CLEAR = 'پاک کردن'
 TITLE_APPLY = 'اعمال'
 TITLE_CANCEL = 'لغو'
-TITLE_THEME = 'تم'
\ No newline at end of file
+TITLE_THEME = 'تم'
+TITLE_WORKERS = 'فرآیندهای کارگر'
+TITLE_CLEAR_CACHE = 'پاک کردن حافظه پنهان'
+TITLE_REMAINING = 'زمان باقی‌مانده'
+TITLE_OPEN_ZIP = 'باز کردن آرشیو ZIP'
+TITLE_UPLOAD_REPORT = 'زمان‌بندی آخرین بارگذاری'
+TITLE_STALLS = 'توقف‌های حلقه رویداد'
+TITLE_SEARCH_MESSAGES = 'جستجوی پیام‌ها'
+TITLE_SENDER = 'فرستنده'
+TITLE_MESSAGE = 'پیام'
+TITLE_DATE = 'تاریخ'
+TITLE_UPDATE_INDEX = 'به‌روزرسانی نمایه'
+TITLE_INDEXING = 'در حال نمایه‌سازی پیام‌ها'
+TITLE_NO_INDEX = 'برای جستجوی متن پیام‌ها ابتدا نمایه را به‌روزرسانی کنید'
+TITLE_REGEX_SCAN = 'جستجوی عبارت باقاعده'
+TITLE_PATTERN = 'عبارت باقاعده'
+TITLE_IGNORE_CASE = 'نادیده گرفتن حروف بزرگ و کوچک'
+TITLE_SCAN = 'جستجو'
+TITLE_HITS = 'تطابق‌ها'
+TITLE_MATCH = 'متن منطبق'
+TITLE_INVALID_PATTERN = 'عبارت باقاعده نامعتبر'
@@ -59,3 +59,23 @@ TITLE_CLEAR = 'Effacer'
 TITLE_APPLY = 'Appliquer'
 TITLE_CANCEL = 'Annuler'
 TITLE_THEME = 'Thème'
+TITLE_WORKERS = 'Processus de travail'
+TITLE_CLEAR_CACHE = 'Vider le cache'
+TITLE_REMAINING = 'Restant'
+TITLE_OPEN_ZIP = 'Ouvrir une archive ZIP'
+TITLE_UPLOAD_REPORT = 'Durées du dernier chargement'
+TITLE_STALLS = 'Blocages de l\'interface'
+TITLE_SEARCH_MESSAGES = 'Rechercher des messages'
+TITLE_SENDER = 'Expéditeur'
+TITLE_MESSAGE = 'Message'
+TITLE_DATE = 'Date'
+TITLE_UPDATE_INDEX = 'Mettre à jour l\'index'
+TITLE_INDEXING = 'Indexation des messages'
+TITLE_NO_INDEX = 'Mettez d\'abord l\'index à jour pour rechercher dans les messages'
+TITLE_REGEX_SCAN = 'Recherche regex'
+TITLE_PATTERN = 'Expression régulière'
+TITLE_IGNORE_CASE = 'Ignorer la casse'
+TITLE_SCAN = 'Lancer'
+TITLE_HITS = 'Correspondances'
+TITLE_MATCH = 'Correspondance'
+TITLE_INVALID_PATTERN = 'Expression régulière invalide'
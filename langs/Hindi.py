@@ -58,3 +58,23 @@ TITLE_CLEAR = 'साफ़ करें'
 TITLE_APPLY = 'लागू करें'
 TITLE_CANCEL = 'रद्द करें'
 TITLE_THEME = 'थीम'
+TITLE_WORKERS = 'वर्कर प्रक्रियाएँ'
+TITLE_CLEAR_CACHE = 'कैश साफ़ करें'
+TITLE_REMAINING = 'शेष समय'
+TITLE_OPEN_ZIP = 'ZIP संग्रह खोलें'
+TITLE_UPLOAD_REPORT = 'पिछले अपलोड का समय'
+TITLE_STALLS = 'इवेंट लूप रुकावटें'
+TITLE_SEARCH_MESSAGES = 'संदेश खोजें'
+TITLE_SENDER = 'प्रेषक'
+TITLE_MESSAGE = 'संदेश'
+TITLE_DATE = 'तारीख'
+TITLE_UPDATE_INDEX = 'सूचकांक अपडेट करें'
+TITLE_INDEXING = 'संदेशों का सूचकांक बनाया जा रहा है'
+TITLE_NO_INDEX = 'संदेशों का पाठ खोजने के लिए पहले सूचकांक अपडेट करें'
+TITLE_REGEX_SCAN = 'रेगेक्स स्कैन'
+TITLE_PATTERN = 'रेगुलर एक्सप्रेशन'
+TITLE_IGNORE_CASE = 'अक्षर का आकार अनदेखा करें'
+TITLE_SCAN = 'स्कैन करें'
+TITLE_HITS = 'मिलान'
+TITLE_MATCH = 'मिलान पाठ'
+TITLE_INVALID_PATTERN = 'अमान्य रेगुलर एक्सप्रेशन'
@@ -58,3 +58,23 @@ TITLE_CLEAR = 'Pulisci'
 TITLE_APPLY = 'Applica'
 TITLE_CANCEL = 'Annulla'
 TITLE_THEME = 'Tema'
+TITLE_WORKERS = 'Processi di lavoro'
+TITLE_CLEAR_CACHE = 'Svuota cache'
+TITLE_REMAINING = 'Rimanente'
+TITLE_OPEN_ZIP = 'Apri archivio ZIP'
+TITLE_UPLOAD_REPORT = 'Tempi dell\'ultimo caricamento'
+TITLE_STALLS = 'Blocchi dell\'interfaccia'
+TITLE_SEARCH_MESSAGES = 'Cerca messaggi'
+TITLE_SENDER = 'Mittente'
+TITLE_MESSAGE = 'Messaggio'
+TITLE_DATE = 'Data'
+TITLE_UPDATE_INDEX = 'Aggiorna indice'
+TITLE_INDEXING = 'Indicizzazione dei messaggi'
+TITLE_NO_INDEX = 'Aggiorna prima l\'indice per cercare nel testo dei messaggi'
+TITLE_REGEX_SCAN = 'Scansione regex'
+TITLE_PATTERN = 'Espressione regolare'
+TITLE_IGNORE_CASE = 'Ignora maiuscole'
+TITLE_SCAN = 'Avvia'
+TITLE_HITS = 'Corrispondenze'
+TITLE_MATCH = 'Corrispondenza'
+TITLE_INVALID_PATTERN = 'Espressione regolare non valida'
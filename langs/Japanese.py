@@ -58,3 +58,23 @@ TITLE_CLEAR = 'クリア'
 TITLE_APPLY = '適用'
 TITLE_CANCEL = 'キャンセル'
 TITLE_THEME = 'テーマ'
+TITLE_WORKERS = 'ワーカープロセス数'
+TITLE_CLEAR_CACHE = 'キャッシュを消去'
+TITLE_REMAINING = '残り時間'
+TITLE_OPEN_ZIP = 'ZIP アーカイブを開く'
+TITLE_UPLOAD_REPORT = '前回の読み込み時間'
+TITLE_STALLS = 'イベントループの停止'
+TITLE_SEARCH_MESSAGES = 'メッセージを検索'
+TITLE_SENDER = '送信者'
+TITLE_MESSAGE = 'メッセージ'
+TITLE_DATE = '日付'
+TITLE_UPDATE_INDEX = 'インデックスを更新'
+TITLE_INDEXING = 'メッセージをインデックス中'
+TITLE_NO_INDEX = 'メッセージ本文を検索するには、まずインデックスを更新してください'
+TITLE_REGEX_SCAN = '正規表現スキャン'
+TITLE_PATTERN = '正規表現'
+TITLE_IGNORE_CASE = '大文字と小文字を区別しない'
+TITLE_SCAN = 'スキャン'
+TITLE_HITS = '一致数'
+TITLE_MATCH = '一致箇所'
+TITLE_INVALID_PATTERN = '無効な正規表現'
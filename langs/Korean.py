@@ -58,3 +58,23 @@ TITLE_CLEAR = '지우기'
 TITLE_APPLY = '적용'
 TITLE_CANCEL = '취소'
 TITLE_THEME = '테마'
+TITLE_WORKERS = '작업자 프로세스'
+TITLE_CLEAR_CACHE = '캐시 지우기'
+TITLE_REMAINING = '남은 시간'
+TITLE_OPEN_ZIP = 'ZIP 압축 파일 열기'
+TITLE_UPLOAD_REPORT = '마지막 업로드 시간'
+TITLE_STALLS = '이벤트 루프 멈춤'
+TITLE_SEARCH_MESSAGES = '메시지 검색'
+TITLE_SENDER = '보낸 사람'
+TITLE_MESSAGE = '메시지'
+TITLE_DATE = '날짜'
+TITLE_UPDATE_INDEX = '색인 업데이트'
+TITLE_INDEXING = '메시지 색인 중'
+TITLE_NO_INDEX = '메시지 내용을 검색하려면 먼저 색인을 업데이트하세요'
+TITLE_REGEX_SCAN = '정규식 검색'
+TITLE_PATTERN = '정규식'
+TITLE_IGNORE_CASE = '대소문자 무시'
+TITLE_SCAN = '검색'
+TITLE_HITS = '일치 항목'
+TITLE_MATCH = '일치 텍스트'
+TITLE_INVALID_PATTERN = '잘못된 정규식'
@@ -58,3 +58,23 @@ TITLE_CLEAR = 'साफ करा'
 TITLE_APPLY = 'लागू करा'
 TITLE_CANCEL = 'रद्द करा'
 TITLE_THEME = 'थीम'
+TITLE_WORKERS = 'वर्कर प्रक्रिया'
+TITLE_CLEAR_CACHE = 'कॅशे साफ करा'
+TITLE_REMAINING = 'उर्वरित वेळ'
+TITLE_OPEN_ZIP = 'ZIP संग्रह उघडा'
+TITLE_UPLOAD_REPORT = 'शेवटच्या अपलोडची वेळ'
+TITLE_STALLS = 'इव्हेंट लूप अडथळे'
+TITLE_SEARCH_MESSAGES = 'संदेश शोधा'
+TITLE_SENDER = 'प्रेषक'
+TITLE_MESSAGE = 'संदेश'
+TITLE_DATE = 'तारीख'
+TITLE_UPDATE_INDEX = 'निर्देशांक अद्यतनित करा'
+TITLE_INDEXING = 'संदेशांचे निर्देशांकन सुरू आहे'
+TITLE_NO_INDEX = 'संदेशांचा मजकूर शोधण्यासाठी आधी निर्देशांक अद्यतनित करा'
+TITLE_REGEX_SCAN = 'रेगेक्स स्कॅन'
+TITLE_PATTERN = 'रेग्युलर एक्सप्रेशन'
+TITLE_IGNORE_CASE = 'अक्षरांचा आकार दुर्लक्षित करा'
+TITLE_SCAN = 'स्कॅन करा'
+TITLE_HITS = 'जुळण्या'
+TITLE_MATCH = 'जुळलेला मजकूर'
+TITLE_INVALID_PATTERN = 'अवैध रेग्युलर एक्सप्रेशन'
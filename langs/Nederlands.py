@@ -59,3 +59,23 @@ TITLE_CLEAR = 'Wissen'
 TITLE_APPLY = 'Toepassen'
 TITLE_CANCEL = 'Annuleren'
 TITLE_THEME = 'Thema'
+TITLE_WORKERS = 'Werkprocessen'
+TITLE_CLEAR_CACHE = 'Cache wissen'
+TITLE_REMAINING = 'Resterend'
+TITLE_OPEN_ZIP = 'ZIP-archief openen'
+TITLE_UPLOAD_REPORT = 'Tijden van de laatste upload'
+TITLE_STALLS = 'Haperingen van de interface'
+TITLE_SEARCH_MESSAGES = 'Berichten zoeken'
+TITLE_SENDER = 'Afzender'
+TITLE_MESSAGE = 'Bericht'
+TITLE_DATE = 'Datum'
+TITLE_UPDATE_INDEX = 'Index bijwerken'
+TITLE_INDEXING = 'Berichten indexeren'
+TITLE_NO_INDEX = 'Werk eerst de index bij om in berichtteksten te zoeken'
+TITLE_REGEX_SCAN = 'Regex-scan'
+TITLE_PATTERN = 'Reguliere expressie'
+TITLE_IGNORE_CASE = 'Hoofdletters negeren'
+TITLE_SCAN = 'Scannen'
+TITLE_HITS = 'Treffers'
+TITLE_MATCH = 'Treffer'
+TITLE_INVALID_PATTERN = 'Ongeldige reguliere expressie'
@@ -58,3 +58,23 @@ TITLE_CLEAR = 'Wyczyść'
 TITLE_APPLY = 'Zastosuj'
 TITLE_CANCEL = 'Anuluj'
 TITLE_THEME = 'Motyw'
+TITLE_WORKERS = 'Procesy robocze'
+TITLE_CLEAR_CACHE = 'Wyczyść pamięć podręczną'
+TITLE_REMAINING = 'Pozostało'
+TITLE_OPEN_ZIP = 'Otwórz archiwum ZIP'
+TITLE_UPLOAD_REPORT = 'Czasy ostatniego wczytania'
+TITLE_STALLS = 'Przestoje interfejsu'
+TITLE_SEARCH_MESSAGES = 'Szukaj wiadomości'
+TITLE_SENDER = 'Nadawca'
+TITLE_MESSAGE = 'Wiadomość'
+TITLE_DATE = 'Data'
+TITLE_UPDATE_INDEX = 'Aktualizuj indeks'
+TITLE_INDEXING = 'Indeksowanie wiadomości'
+TITLE_NO_INDEX = 'Najpierw zaktualizuj indeks, aby przeszukiwać treść wiadomości'
+TITLE_REGEX_SCAN = 'Skanowanie regex'
+TITLE_PATTERN = 'Wyrażenie regularne'
+TITLE_IGNORE_CASE = 'Ignoruj wielkość liter'
+TITLE_SCAN = 'Skanuj'
+TITLE_HITS = 'Dopasowania'
+TITLE_MATCH = 'Dopasowanie'
+TITLE_INVALID_PATTERN = 'Nieprawidłowe wyrażenie regularne'
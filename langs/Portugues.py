@@ -59,3 +59,23 @@ TITLE_CLEAR = 'Limpar'
 TITLE_APPLY = 'Aplicar'
 TITLE_CANCEL = 'Cancelar'
 TITLE_THEME = 'Tema'
+TITLE_WORKERS = 'Processos de trabalho'
+TITLE_CLEAR_CACHE = 'Limpar cache'
+TITLE_REMAINING = 'Restante'
+TITLE_OPEN_ZIP = 'Abrir arquivo ZIP'
+TITLE_UPLOAD_REPORT = 'Tempos do último carregamento'
+TITLE_STALLS = 'Travamentos da interface'
+TITLE_SEARCH_MESSAGES = 'Pesquisar mensagens'
+TITLE_SENDER = 'Remetente'
+TITLE_MESSAGE = 'Mensagem'
+TITLE_DATE = 'Data'
+TITLE_UPDATE_INDEX = 'Atualizar índice'
+TITLE_INDEXING = 'Indexando mensagens'
+TITLE_NO_INDEX = 'Atualize primeiro o índice para pesquisar o texto das mensagens'
+TITLE_REGEX_SCAN = 'Varredura regex'
+TITLE_PATTERN = 'Expressão regular'
+TITLE_IGNORE_CASE = 'Ignorar maiúsculas'
+TITLE_SCAN = 'Varrer'
+TITLE_HITS = 'Correspondências'
+TITLE_MATCH = 'Correspondência'
+TITLE_INVALID_PATTERN = 'Expressão regular inválida'
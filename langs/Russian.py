@@ -58,3 +58,23 @@ TITLE_CLEAR = 'Очистить'
 TITLE_APPLY = 'Применить'
 TITLE_CANCEL = 'Отмена'
 TITLE_THEME = 'Тема'
+TITLE_WORKERS = 'Рабочие процессы'
+TITLE_CLEAR_CACHE = 'Очистить кэш'
+TITLE_REMAINING = 'Осталось'
+TITLE_OPEN_ZIP = 'Открыть ZIP-архив'
+TITLE_UPLOAD_REPORT = 'Время последней загрузки'
+TITLE_STALLS = 'Зависания интерфейса'
+TITLE_SEARCH_MESSAGES = 'Поиск сообщений'
+TITLE_SENDER = 'Отправитель'
+TITLE_MESSAGE = 'Сообщение'
+TITLE_DATE = 'Дата'
+TITLE_UPDATE_INDEX = 'Обновить индекс'
+TITLE_INDEXING = 'Индексация сообщений'
+TITLE_NO_INDEX = 'Сначала обновите индекс, чтобы искать по тексту сообщений'
+TITLE_REGEX_SCAN = 'Поиск по регулярному выражению'
+TITLE_PATTERN = 'Регулярное выражение'
+TITLE_IGNORE_CASE = 'Без учёта регистра'
+TITLE_SCAN = 'Искать'
+TITLE_HITS = 'Совпадения'
+TITLE_MATCH = 'Совпадение'
+TITLE_INVALID_PATTERN = 'Неверное регулярное выражение'
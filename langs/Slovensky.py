@@ -59,4 +59,24 @@ TITLE_CLEAR = 'Vymazať'
 TITLE_APPLY = 'Použiť'
 TITLE_CANCEL = 'Zrušiť'
 TITLE_THEME = 'Téma'
+TITLE_WORKERS = 'Pracovné procesy'
+TITLE_CLEAR_CACHE = 'Vymazať vyrovnávaciu pamäť'
+TITLE_REMAINING = 'Zostáva'
+TITLE_OPEN_ZIP = 'Otvoriť ZIP archív'
+TITLE_UPLOAD_REPORT = 'Časy posledného načítania'
+TITLE_STALLS = 'Zamrznutia rozhrania'
+TITLE_SEARCH_MESSAGES = 'Hľadať správy'
+TITLE_SENDER = 'Odosielateľ'
+TITLE_MESSAGE = 'Správa'
+TITLE_DATE = 'Dátum'
+TITLE_UPDATE_INDEX = 'Aktualizovať index'
+TITLE_INDEXING = 'Indexovanie správ'
+TITLE_NO_INDEX = 'Najprv aktualizujte index, aby ste mohli hľadať v texte správ'
+TITLE_REGEX_SCAN = 'Regex vyhľadávanie'
+TITLE_PATTERN = 'Regulárny výraz'
+TITLE_IGNORE_CASE = 'Ignorovať veľkosť písmen'
+TITLE_SCAN = 'Hľadať'
+TITLE_HITS = 'Zhody'
+TITLE_MATCH = 'Zhoda'
+TITLE_INVALID_PATTERN = 'Neplatný regulárny výraz'
 
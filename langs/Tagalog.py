@@ -59,4 +59,24 @@ TITLE_CLEAR = 'Linisin'
 TITLE_APPLY = 'Ilapat'
 TITLE_CANCEL = 'Kanselahin'
 TITLE_THEME = 'Tema'
+TITLE_WORKERS = 'Mga worker process'
+TITLE_CLEAR_CACHE = 'I-clear ang cache'
+TITLE_REMAINING = 'Natitira'
+TITLE_OPEN_ZIP = 'Buksan ang ZIP archive'
+TITLE_UPLOAD_REPORT = 'Oras ng huling pag-upload'
+TITLE_STALLS = 'Mga pagtigil ng event loop'
+TITLE_SEARCH_MESSAGES = 'Maghanap ng mga mensahe'
+TITLE_SENDER = 'Nagpadala'
+TITLE_MESSAGE = 'Mensahe'
+TITLE_DATE = 'Petsa'
+TITLE_UPDATE_INDEX = 'I-update ang index'
+TITLE_INDEXING = 'Ini-index ang mga mensahe'
+TITLE_NO_INDEX = 'I-update muna ang index para maghanap sa teksto ng mga mensahe'
+TITLE_REGEX_SCAN = 'Regex scan'
+TITLE_PATTERN = 'Regular expression'
+TITLE_IGNORE_CASE = 'Huwag pansinin ang laki ng titik'
+TITLE_SCAN = 'I-scan'
+TITLE_HITS = 'Mga tugma'
+TITLE_MATCH = 'Tugma'
+TITLE_INVALID_PATTERN = 'Di-wastong regular expression'
 
@@ -58,3 +58,23 @@ TITLE_CLEAR = 'Temizle'
 TITLE_APPLY = 'Uygula'
 TITLE_CANCEL = 'İptal'
 TITLE_THEME = 'Tema'
+TITLE_WORKERS = 'İşçi süreçleri'
+TITLE_CLEAR_CACHE = 'Önbelleği temizle'
+TITLE_REMAINING = 'Kalan'
+TITLE_OPEN_ZIP = 'ZIP arşivi aç'
+TITLE_UPLOAD_REPORT = 'Son yüklemenin süreleri'
+TITLE_STALLS = 'Arayüz donmaları'
+TITLE_SEARCH_MESSAGES = 'Mesajlarda ara'
+TITLE_SENDER = 'Gönderen'
+TITLE_MESSAGE = 'Mesaj'
+TITLE_DATE = 'Tarih'
+TITLE_UPDATE_INDEX = 'Dizini güncelle'
+TITLE_INDEXING = 'Mesajlar dizinleniyor'
+TITLE_NO_INDEX = 'Mesaj metinlerinde aramak için önce dizini güncelleyin'
+TITLE_REGEX_SCAN = 'Regex taraması'
+TITLE_PATTERN = 'Düzenli ifade'
+TITLE_IGNORE_CASE = 'Büyük/küçük harf yok say'
+TITLE_SCAN = 'Tara'
+TITLE_HITS = 'Eşleşmeler'
+TITLE_MATCH = 'Eşleşme'
+TITLE_INVALID_PATTERN = 'Geçersiz düzenli ifade'
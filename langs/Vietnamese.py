@@ -58,3 +58,23 @@ TITLE_CLEAR = 'Xóa hết'
 TITLE_APPLY = 'Áp dụng'
 TITLE_CANCEL = 'Hủy'
 TITLE_THEME = 'Giao diện'
+TITLE_WORKERS = 'Số tiến trình xử lý'
+TITLE_CLEAR_CACHE = 'Xóa bộ nhớ đệm'
+TITLE_REMAINING = 'Còn lại'
+TITLE_OPEN_ZIP = 'Mở tệp ZIP'
+TITLE_UPLOAD_REPORT = 'Thời gian tải lên gần nhất'
+TITLE_STALLS = 'Giao diện bị treo'
+TITLE_SEARCH_MESSAGES = 'Tìm kiếm tin nhắn'
+TITLE_SENDER = 'Người gửi'
+TITLE_MESSAGE = 'Tin nhắn'
+TITLE_DATE = 'Ngày'
+TITLE_UPDATE_INDEX = 'Cập nhật chỉ mục'
+TITLE_INDEXING = 'Đang lập chỉ mục tin nhắn'
+TITLE_NO_INDEX = 'Hãy cập nhật chỉ mục trước để tìm trong nội dung tin nhắn'
+TITLE_REGEX_SCAN = 'Quét regex'
+TITLE_PATTERN = 'Biểu thức chính quy'
+TITLE_IGNORE_CASE = 'Không phân biệt hoa thường'
+TITLE_SCAN = 'Quét'
+TITLE_HITS = 'Kết quả khớp'
+TITLE_MATCH = 'Đoạn khớp'
+TITLE_INVALID_PATTERN = 'Biểu thức chính quy không hợp lệ'
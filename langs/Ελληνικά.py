@@ -57,4 +57,24 @@ TITLE_MOVE_DOWN = 'Μετακίνηση κάτω'
 TITLE_CLEAR = 'Καθαρισμός'
 TITLE_APPLY = 'Εφαρμογή'
 TITLE_CANCEL = 'Ακύρωση'
-TITLE_THEME = 'Θέμα'
\ No newline at end of file
+TITLE_THEME = 'Θέμα'
+TITLE_WORKERS = 'Διεργασίες εργασίας'
+TITLE_CLEAR_CACHE = 'Εκκαθάριση προσωρινής μνήμης'
+TITLE_REMAINING = 'Απομένει'
+TITLE_OPEN_ZIP = 'Άνοιγμα αρχείου ZIP'
+TITLE_UPLOAD_REPORT = 'Χρόνοι τελευταίας φόρτωσης'
+TITLE_STALLS = 'Παγώματα διεπαφής'
+TITLE_SEARCH_MESSAGES = 'Αναζήτηση μηνυμάτων'
+TITLE_SENDER = 'Αποστολέας'
+TITLE_MESSAGE = 'Μήνυμα'
+TITLE_DATE = 'Ημερομηνία'
+TITLE_UPDATE_INDEX = 'Ενημέρωση ευρετηρίου'
+TITLE_INDEXING = 'Ευρετηρίαση μηνυμάτων'
+TITLE_NO_INDEX = 'Ενημερώστε πρώτα το ευρετήριο για αναζήτηση στο κείμενο των μηνυμάτων'
+TITLE_REGEX_SCAN = 'Σάρωση regex'
+TITLE_PATTERN = 'Κανονική έκφραση'
+TITLE_IGNORE_CASE = 'Χωρίς διάκριση πεζών-κεφαλαίων'
+TITLE_SCAN = 'Σάρωση'
+TITLE_HITS = 'Αντιστοιχίες'
+TITLE_MATCH = 'Αντιστοιχία'
+TITLE_INVALID_PATTERN = 'Μη έγκυρη κανονική έκφραση'
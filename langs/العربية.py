@@ -58,4 +58,24 @@ TITLE_CLEAR = 'امسح'
 TITLE_APPLY = 'تطبيق'
 TITLE_CANCEL = 'الغاء'
 TITLE_THEME = 'المظهر'
+TITLE_WORKERS = 'عمليات المعالجة'
+TITLE_CLEAR_CACHE = 'مسح ذاكرة التخزين المؤقت'
+TITLE_REMAINING = 'المتبقي'
+TITLE_OPEN_ZIP = 'فتح أرشيف ZIP'
+TITLE_UPLOAD_REPORT = 'توقيت آخر تحميل'
+TITLE_STALLS = 'توقفات حلقة الأحداث'
+TITLE_SEARCH_MESSAGES = 'البحث في الرسائل'
+TITLE_SENDER = 'المرسل'
+TITLE_MESSAGE = 'الرسالة'
+TITLE_DATE = 'التاريخ'
+TITLE_UPDATE_INDEX = 'تحديث الفهرس'
+TITLE_INDEXING = 'جارٍ فهرسة الرسائل'
+TITLE_NO_INDEX = 'حدّث الفهرس أولاً للبحث في نصوص الرسائل'
+TITLE_REGEX_SCAN = 'فحص التعبير النمطي'
+TITLE_PATTERN = 'التعبير النمطي'
+TITLE_IGNORE_CASE = 'تجاهل حالة الأحرف'
+TITLE_SCAN = 'فحص'
+TITLE_HITS = 'التطابقات'
+TITLE_MATCH = 'النص المطابق'
+TITLE_INVALID_PATTERN = 'تعبير نمطي غير صالح'
 
@@ -0,0 +1,450 @@
+"""
+Full-text index of message bodies for CounterForMessenger
+
+The statistics only keep the length of each message, so finding which
+conversation mentioned a word would mean re-reading the whole export. The
+optional message index stores every message text once in an SQLite FTS5
+table (whose postings lists are delta-encoded varints), next to the
+ingestion cache. Rows are keyed by the file they come from and their
+position in it, and carry the sender and timestamp, so a search can be
+ranked (bm25), filtered by sender and date, and shown with its conversation.
+
+Dates are indexed as coarse year and month tokens too, so the sender and
+date filters are part of the MATCH query and narrow the matches inside the
+index, instead of checking the sender and timestamp of each one.
+
+Files are identified like in the ingestion cache (path, size and
+modification time): updating the index only reads files that are new or
+changed since the last update, and drops the ones that disappeared.
+"""
+import re
+import sqlite3
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import repeat
+from os import makedirs
+from os.path import dirname
+from time import perf_counter
+
+from collation import fold
+from extraction import ExtractionCancelled, iter_message_bodies
+from sources import file_identity, list_conversations, list_files
+
+# Default location, next to the ingestion cache
+INDEX_PATH = 'cache/messages.sqlite3'
+
+# Bump whenever the layout of the tables changes, so an older index is rebuilt instead of misread
+INDEX_VERSION = 1
+
+# Row ids are (file id << POSITION_BITS) | position of the message in the file
+POSITION_BITS = 32
+
+# Results returned by a search, best ranked first
+DEFAULT_LIMIT = 200
+
+# Words shown around the first matched word of a result
+SNIPPET_WORDS = 16
+
+# A search result; conversation is the folder, title the chat title of its file
+MessageHit = namedtuple('MessageHit', ['conversation', 'title', 'position', 'timestamp', 'sender', 'snippet'])
+
+# A double-quoted phrase or a single word of a query
+_QUERY_TERM = re.compile(r'"([^"]*)"?|(\S+)')
+
+# A word of a message, for the snippets
+_WORD = re.compile(r'\w+')
+
+
+def _phrase(text):
+    """Quotes text as an FTS5 phrase, so its punctuation is never read as query syntax"""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def match_expression(query):
+    """
+    Translates a search query into an FTS5 MATCH expression
+
+    Words must all appear (in any order), "quoted words" must appear as a
+    phrase and a trailing * matches any word starting with the prefix.
+    Case and accents are ignored by the index's tokenizer.
+
+    Args:
+        query: Query as typed by the user
+
+    Returns:
+        MATCH expression, or None for an empty query
+    """
+    terms = []
+    for phrase, word in _QUERY_TERM.findall(query):
+        if phrase.strip():
+            terms.append(_phrase(phrase))
+        elif word.endswith('*') and word.strip('*'):
+            terms.append(f'{_phrase(word.rstrip("*"))} *')
+        elif word.strip('*'):
+            terms.append(_phrase(word))
+    return ' AND '.join(terms) or None
+
+
+def query_words(query):
+    """
+    Returns the folded words of a query, for highlighting
+
+    Returns:
+        (words, prefixes): set of the whole words and tuple of the prefixes (word*)
+    """
+    words = set()
+    prefixes = []
+    for phrase, word in _QUERY_TERM.findall(query):
+        if word.endswith('*') and word.strip('*'):
+            prefixes.extend(fold(found) for found in _WORD.findall(word))
+        else:
+            words.update(fold(found) for found in _WORD.findall(phrase or word))
+    return words, tuple(prefixes)
+
+
+def make_snippet(body, words, prefixes, size=SNIPPET_WORDS):
+    """
+    Cuts the part of a message around its first matched word, [marking] the matched words
+
+    Args:
+        body: Message text
+        words: Folded words to mark, see query_words()
+        prefixes: Folded prefixes to mark
+        size: Number of words in the snippet
+
+    Returns:
+        The snippet, with '…' where the text was cut
+    """
+    spans = list(_WORD.finditer(body))
+    matched = [
+        index for index, span in enumerate(spans)
+        if fold(span.group()) in words or (prefixes and fold(span.group()).startswith(prefixes))
+    ]
+    first = max(0, min(matched[0] - size // 4, len(spans) - size)) if matched else 0
+    window = spans[first:first + size]
+    if not window:
+        return body
+    parts = ['…' if first > 0 else body[:window[0].start()]]
+    position = window[0].start()
+    for index, span in enumerate(window, first):
+        parts.append(body[position:span.start()])
+        parts.append(f'[{span.group()}]' if index in matched else span.group())
+        position = span.end()
+    parts.append(body[position:] if first + size >= len(spans) else '…')
+    return ''.join(parts)
+
+
+def period_tokens(timestamp):
+    """
+    Returns the year and month tokens indexed for a message timestamp
+    ('y2023 m202305', in UTC), empty for timestamps out of range
+    """
+    try:
+        moment = datetime.fromtimestamp(timestamp / 1000, timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        return ''
+    return f'y{moment.year} m{moment.year}{moment.month:02}'
+
+
+def period_expression(start_ts, end_ts):
+    """
+    Builds the FTS5 expression of the period tokens covering a date range:
+    a year token for every whole year, month tokens for the months around them
+
+    Args:
+        start_ts: First timestamp (ms) of the range
+        end_ts: Timestamp (ms) the range ends before
+
+    Returns:
+        OR-ed tokens, or None if the range can't be expressed in tokens
+    """
+    try:
+        first = datetime.fromtimestamp(start_ts / 1000, timezone.utc)
+        last = datetime.fromtimestamp((end_ts - 1) / 1000, timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        return None
+    if last < first:
+        return None
+    tokens = []
+    for year in range(first.year, last.year + 1):
+        first_month = first.month if year == first.year else 1
+        last_month = last.month if year == last.year else 12
+        if first_month == 1 and last_month == 12:
+            tokens.append(f'y{year}')
+        else:
+            tokens.extend(f'm{year}{month:02}' for month in range(first_month, last_month + 1))
+    return ' OR '.join(tokens)
+
+
+def _read_file(file, options):
+    """
+    Worker entry point: reads the message texts of a file
+
+    Args:
+        file: Path of the JSON file, or ZipMember inside an export archive
+        options: ExtractOptions with the streaming threshold and JSON backend
+
+    Returns:
+        (title, messages), messages being the (position, timestamp, sender,
+        text) tuples of the file; None if it couldn't be read
+    """
+    info = {}
+    try:
+        messages = list(iter_message_bodies(file, options, info))
+    except Exception as e:
+        print(f"Error indexing file {file}: {e}")
+        return None
+    return info.get('title'), messages
+
+
+class MessageIndex:
+    """SQLite FTS5 index of the message texts of an export"""
+
+    def __init__(self, path=INDEX_PATH):
+        """
+        Open (or create) the index database
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        if dirname(path):
+            makedirs(dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self._check_version()
+
+    def _check_version(self):
+        """Creates the tables, wiping them when they were written by another index version"""
+        with self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != str(INDEX_VERSION):
+                self.connection.execute('DROP TABLE IF EXISTS files')
+                self.connection.execute('DROP TABLE IF EXISTS messages')
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (str(INDEX_VERSION),)
+                )
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS files ('
+                'id INTEGER PRIMARY KEY, path TEXT UNIQUE, size INTEGER, mtime INTEGER, '
+                'conversation TEXT, title TEXT)'
+            )
+            # Case and accents are folded like in the main list's search (see collation.fold)
+            self.connection.execute(
+                'CREATE VIRTUAL TABLE IF NOT EXISTS messages USING fts5('
+                "body, sender, period, timestamp UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+
+    def close(self):
+        """Closes the database"""
+        self.connection.close()
+
+    def indexed_files(self):
+        """
+        Returns:
+            Dict of path -> (id, size, mtime) of every indexed file
+        """
+        return {
+            path: (file_id, size, mtime)
+            for file_id, path, size, mtime in self.connection.execute('SELECT id, path, size, mtime FROM files')
+        }
+
+    def _remove_file(self, file_id):
+        """Removes a file and its messages (within the caller's transaction)"""
+        self.connection.execute(
+            'DELETE FROM messages WHERE rowid BETWEEN ? AND ?',
+            (file_id << POSITION_BITS, ((file_id + 1) << POSITION_BITS) - 1)
+        )
+        self.connection.execute('DELETE FROM files WHERE id = ?', (file_id,))
+
+    def _add_file(self, conversation, path, size, mtime, messages, info):
+        """
+        Indexes the messages of a file, replacing its previous version (within the caller's transaction)
+
+        Args:
+            conversation: Conversation folder of the file
+            path: Path of the file, see sources.file_identity
+            size: Size of the file in bytes
+            mtime: Modification time of the file
+            messages: Iterable of (position, timestamp, sender, text), streamed into the table
+            info: Dict holding the chat title under 'title' once messages is exhausted,
+                see extraction.iter_message_bodies
+
+        Returns:
+            True if the file was indexed, False if its messages couldn't be read
+        """
+        row = self.connection.execute('SELECT id FROM files WHERE path = ?', (path,)).fetchone()
+        if row is not None:
+            self._remove_file(row[0])
+        file_id = self.connection.execute(
+            'INSERT INTO files (path, size, mtime, conversation, title) VALUES (?, ?, ?, ?, ?)',
+            (path, size, mtime, conversation, conversation)
+        ).lastrowid
+        base = file_id << POSITION_BITS
+        try:
+            self.connection.executemany(
+                'INSERT INTO messages (rowid, body, sender, period, timestamp) VALUES (?, ?, ?, ?, ?)',
+                (
+                    (base | position, text, sender, period_tokens(timestamp), timestamp)
+                    for position, timestamp, sender, text in messages
+                )
+            )
+        except Exception as e:
+            print(f"Error indexing file {path}: {e}")
+            self._remove_file(file_id)
+            return False
+        if info.get('title'):
+            self.connection.execute('UPDATE files SET title = ? WHERE id = ?', (info['title'], file_id))
+        return True
+
+    def update(self, directory, options, workers=1, cancel=None):
+        """
+        Brings the index up to date with a data source: reads the files
+        that are new or changed since the last update, and removes the
+        files that are no longer part of it
+
+        In this process, the messages of each file are streamed from the
+        reader into the table. With more than one worker, files are read in
+        parallel worker processes and only this process writes to the
+        database. Each folder is committed on its own, so a cancelled update
+        resumes where it stopped.
+
+        Args:
+            directory: Inbox directory (with a trailing slash) or export archive(s), see sources
+            options: ExtractOptions with the streaming threshold and JSON backend
+            workers: Number of worker processes, 1 (or less) to read in this process
+            cancel: Optional threading.Event; once set, the update stops between folders
+
+        Returns:
+            Number of files (re)indexed
+
+        Raises:
+            ExtractionCancelled: If the cancel event was set before the update finished
+        """
+        started = perf_counter()
+        indexed = self.indexed_files()
+        present = set()
+        stale = []
+        for conversation in list_conversations(directory):
+            files = []
+            for file in list_files(directory, conversation):
+                try:
+                    path, size, mtime = file_identity(file)
+                except OSError:
+                    continue
+                present.add(path)
+                known = indexed.get(path)
+                if known is None or known[1:] != (size, mtime):
+                    files.append((file, path, size, mtime))
+            if files:
+                stale.append((conversation, files))
+
+        with self.connection:
+            for path, (file_id, _, _) in indexed.items():
+                if path not in present:
+                    self._remove_file(file_id)
+
+        count = 0
+        if workers <= 1 or len(stale) <= 1:
+            for conversation, files in stale:
+                if cancel is not None and cancel.is_set():
+                    raise ExtractionCancelled()
+                with self.connection:
+                    for file, path, size, mtime in files:
+                        info = {}
+                        messages = iter_message_bodies(file, options, info)
+                        count += self._add_file(conversation, path, size, mtime, messages, info)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Files are read one by one, so a worker never holds more than one file's messages
+                loaded = executor.map(
+                    _read_file, [file for _, files in stale for file, _, _, _ in files],
+                    repeat(options)
+                )
+                for conversation, files in stale:
+                    if cancel is not None and cancel.is_set():
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        raise ExtractionCancelled()
+                    with self.connection:
+                        for (_, path, size, mtime), read in zip(files, loaded):
+                            if read is None:
+                                continue
+                            title, messages = read
+                            count += self._add_file(conversation, path, size, mtime, messages, {'title': title})
+
+        if count:
+            # Merge the segments written by the update, searches read fewer b-trees
+            with self.connection:
+                self.connection.execute("INSERT INTO messages (messages) VALUES ('optimize')")
+        print(f"Indexed {count} files in {perf_counter() - started:.2f}s")
+        return count
+
+    def search(self, query, sender=None, start_ts=None, end_ts=None, limit=DEFAULT_LIMIT):
+        """
+        Finds the messages matching a query, best ranked first
+
+        Args:
+            query: Words and "phrases" to look for, see match_expression()
+            sender: Optional sender name (or part of it) the messages must be from
+            start_ts: Optional first timestamp (ms) of the searched period
+            end_ts: Optional timestamp (ms) the searched period ends before
+            limit: Maximum number of results
+
+        Returns:
+            List of MessageHit, empty when neither a query nor a sender is given
+        """
+        terms = []
+        expression = match_expression(query)
+        if expression is not None:
+            terms.append(f'body : ({expression})')
+        sender_expression = match_expression(sender or '')
+        if sender_expression is not None:
+            terms.append(f'sender : ({sender_expression})')
+        if not terms:
+            return []
+
+        # The period tokens only filter, they don't weigh in the ranking
+        conditions = ['messages MATCH ?', "rank MATCH 'bm25(1.0, 1.0, 0.0)'"]
+        parameters = []
+        if start_ts is not None and end_ts is not None:
+            period = period_expression(start_ts, end_ts)
+            if period is None:
+                return []
+            terms.append(f'period : ({period})')
+        # The tokens are whole months, the exact bounds are checked on the matches
+        if start_ts is not None:
+            conditions.append('timestamp >= ?')
+            parameters.append(start_ts)
+        if end_ts is not None:
+            conditions.append('timestamp < ?')
+            parameters.append(end_ts)
+        rows = self.connection.execute(
+            f'SELECT rowid, timestamp, sender FROM messages WHERE {" AND ".join(conditions)} ORDER BY rank LIMIT ?',
+            [' AND '.join(terms), *parameters, limit]
+        ).fetchall()
+        if not rows:
+            return []
+
+        # Snippets are only made for the results, not for every ranked match
+        rowids = [rowid for rowid, _, _ in rows]
+        bodies = dict(self.connection.execute(
+            f'SELECT rowid, body FROM messages WHERE rowid IN ({",".join("?" * len(rowids))})', rowids
+        ))
+        words, prefixes = query_words(query)
+        file_ids = list({rowid >> POSITION_BITS for rowid in rowids})
+        files = {
+            file_id: (conversation, title) for file_id, conversation, title in self.connection.execute(
+                f'SELECT id, conversation, title FROM files WHERE id IN ({",".join("?" * len(file_ids))})', file_ids
+            )
+        }
+        mask = (1 << POSITION_BITS) - 1
+        return [
+            MessageHit(
+                *files.get(rowid >> POSITION_BITS, ('', '')), rowid & mask, timestamp, sender,
+                make_snippet(bodies.get(rowid, ''), words, prefixes)
+            )
+            for rowid, timestamp, sender in rows
+        ]
@@ -1,33 +1,59 @@
 """
 Loading popup dialog for CounterForMessenger
 """
+import queue
+import threading
 import tkinter as tk
+from collections import deque
 from tkinter import ttk
+from datetime import timedelta
+from time import perf_counter
+import instrumentation
+import profiling
+from extraction import ExtractionCancelled
 from utils import set_icon, set_resolution, PREFIX, apply_theme
 
+# Milliseconds between two drains of the result queue
+POLL_INTERVAL = 100
+
+# Rows inserted/updated per UI tick, so inserting stays responsive too
+INSERT_BATCH = 500
+
+
 class LoadingPopup(tk.Toplevel):
     """Loading popup window showing progress of loading conversations"""
 
-    def __init__(self, controller, chat_total, treeview):
+    def __init__(self, controller, chat_total, rows, on_rows_changed=None, on_finished=None):
         """
         Initialize loading popup
 
+        The popup isn't modal: the main list can be scrolled, sorted and
+        searched while the rows stream in.
+
         Args:
             controller: Controller object for managing application state
             chat_total: Total number of conversations to load
-            treeview: Treeview widget to populate with conversation data
+            rows: Row model (see row_model) of the main list, to populate with conversation data
+            on_rows_changed: Optional callback invoked after each batch of
+                inserted/updated rows, e.g. to sort and render them
+            on_finished: Optional callback invoked once the popup closes
+                (loading done, failed or cancelled)
         """
         tk.Toplevel.__init__(self)
         self.controller = controller
         self.module = self.controller.lang_mdl
-        set_resolution(self, 300, 100)
+        self.rows = rows
+        self.on_rows_changed = on_rows_changed
+        self.on_finished = on_finished
+        set_resolution(self, 300, 150)
 
         # Loading window customization
         self.title(f'{self.module.TITLE_LOADING}...')
         set_icon(self)
         self.resizable(False, False)
+        # Stays above the main window while the list is used
+        self.transient(self.controller)
         self.focus_set()
-        self.grab_set()
 
         # Load progress bar
         self.progress_bar = ttk.Progressbar(
@@ -41,70 +67,199 @@ class LoadingPopup(tk.Toplevel):
         )
         self.progress_label.pack(side='top')
 
+        # Throughput and estimated remaining time
+        self.rate_label = ttk.Label(self, text='')
+        self.rate_label.pack(side='top')
+
+        # Cancel button, stops the extraction between two conversations
+        ttk.Button(
+            self, text=self.module.TITLE_CANCEL, command=self.cancel
+        ).pack(side='top', pady=5)
+        self.protocol('WM_DELETE_WINDOW', self.cancel)
+
         # Apply the active theme's colors to this window's plain tk widgets
         apply_theme(self, self.controller.get_theme())
 
-        # Load all conversations to treeview for display
-        self.load_conversations(treeview, chat_total)
+        # Extraction runs in a background thread and reports through this queue;
+        # the Tk main thread only drains it on a timer
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.pending_changes = deque()
+        self.finished = False
+        # Row index in the result store -> conversation shown in its row
+        self.items = {}
+        self.started = perf_counter()
+        # Opt-in profiling of the treeview population, see profiling
+        self.profile_session = None
+
+        # Load all conversations to the row model for display
+        self.load_conversations(rows, chat_total)
 
-    def load_conversations(self, treeview, chat_total):
+    def load_conversations(self, rows, chat_total):
         """
-        Load conversations from the directory into the treeview
+        Start loading conversations from the directory into the row model
+
+        Extraction happens in a background thread; each conversation is shown
+        as soon as its folder is done, by _poll() draining the queue.
 
         Args:
-            treeview: Treeview widget to populate with conversation data
+            rows: Row model to populate with conversation data
             chat_total: Total number of conversations to load
         """
+        self.rows = rows
         self.directory = self.controller.get_directory()
-        if (self.directory != '' and not self.directory.isspace() and
-                self.directory != self.module.TITLE_NO_SELECTION):
-
-            # Reset message counters
-            self.controller.sent_messages = 0
-            self.controller.total_messages = 0
-            self.controller.total_chars = 0
-            self.controller.total_conversations = 0
-
-            # Extract all conversations up front (e2e contacts already merged with
-            # their matching regular-folder conversation where applicable), so the
-            # progress bar total can reflect the real number of rows to insert
-            all_conversations = self.controller.extract_all_conversations()
-            chat_total = len(all_conversations)
-            self.progress_bar['maximum'] = chat_total
-            self.progress_label['text'] = f'{self.module.TITLE_LOADING_CHAT} 0/{chat_total}'
-
-            for row_index, (title, people, room, all_msgs, all_chars, calltime, sent_msgs, _, total_photos, total_gifs, total_videos, total_files, _) in enumerate(all_conversations):
-                try:
-                    # TREEVIEW AUTOMATED CONVERSION PROBLEM:
-                    # The ttk treeview will convert able strings to integers.
-                    # E.g. chats named '1337' will be attached to a folder named '1337_17623521673' yet be saved
-                    # internally as '133717623521673'. This is not explicitly preventable.
-                    # Easiest solution is to force the name to be a string by temporarily adding some garbage to it.
-                    treeview.insert(
-                        parent='', index='end', values=(
-                            title, set(people.keys()), room, all_msgs, calltime, total_photos, total_gifs, total_videos,
-                            total_files, all_chars,
-                            f'{PREFIX}all#{row_index}'
-                        ))
-
-                    # Update global message counters
-                    self.controller.sent_messages += sent_msgs
-                    self.controller.total_messages += all_msgs
-                    self.controller.total_chars += all_chars
-                    self.controller.total_conversations += 1
-
-                    # Update progress bar
-                    self.progress_bar['value'] += 1
-                    self.progress_bar.update()
-
-                    # Update progress label
-                    progress_value = self.progress_bar['value']
-                    self.progress_label['text'] = f'{self.module.TITLE_LOADING_CHAT} {int(progress_value)}/{chat_total}'
-                    self.progress_label.update()
-
-                except Exception as e:
-                    print(f"Error loading conversation: {str(e)}")
-                    continue
-
-        # Close popup when done
+        if (self.directory == '' or self.directory.isspace() or
+                self.directory == self.module.TITLE_NO_SELECTION):
+            self.close()
+            return
+
+        # Reset message counters
+        self.controller.sent_messages = 0
+        self.controller.total_messages = 0
+        self.controller.total_chars = 0
+        self.controller.total_conversations = 0
+
+        self.profile_session = profiling.start('populate')
+        threading.Thread(target=self._extract, daemon=True).start()
+        self.after(POLL_INTERVAL, self._poll)
+
+    def _extract(self):
+        """
+        Background thread: extracts all conversations and reports each row
+        change (e2e contacts are merged into their matching private chat row
+        whichever arrives first) through the queue, then brings the message
+        index up to date (if there is one) while the popup closes
+        """
+        try:
+            for changes, done, total in self.controller.stream_conversations(cancel=self.cancel_event):
+                self.queue.put(('rows', changes, done, total))
+            self.queue.put(('done',))
+        except ExtractionCancelled:
+            return
+        except Exception as e:
+            self.queue.put(('error', e))
+            return
+
+        if self.controller.index_path is None:
+            return
+        try:
+            self.controller.update_message_index()
+        except Exception as e:
+            print(f"Error updating message index: {str(e)}")
+
+    def _poll(self):
+        """Drains the result queue on the Tk main thread, applies a batch of rows, then reschedules itself"""
+        if self.cancel_event.is_set():
+            return
+        try:
+            while True:
+                event = self.queue.get_nowait()
+                if event[0] == 'rows':
+                    self.pending_changes.extend(event[1])
+                    self._show_progress(event[2], event[3])
+                elif event[0] == 'done':
+                    self.finished = True
+                else:
+                    print(f"Error loading conversations: {str(event[1])}")
+                    self.finished = True
+        except queue.Empty:
+            pass
+
+        if self.pending_changes:
+            self._apply_changes()
+        if self.finished and not self.pending_changes:
+            # Close popup when done
+            profiling.finish(self.profile_session)
+            self.close()
+            return
+        # Come back right away while a backlog of rows is waiting
+        self.after(1 if self.pending_changes else POLL_INTERVAL, self._poll)
+
+    def _show_progress(self, done, total):
+        """
+        Updates the progress bar, counter and throughput/ETA readout
+
+        Args:
+            done: Number of processed folders
+            total: Total number of folders
+        """
+        self.progress_bar['maximum'] = total
+        self.progress_bar['value'] = done
+        self.progress_label['text'] = f'{self.module.TITLE_LOADING_CHAT} {done}/{total}'
+
+        elapsed = perf_counter() - self.started
+        if done and elapsed > 0:
+            rate = done / elapsed
+            remaining = timedelta(seconds=round((total - done) / rate))
+            self.rate_label['text'] = f'{rate:.1f}/s, {self.module.TITLE_REMAINING}: {remaining}'
+
+    def _count(self, conversation, sign):
+        """
+        Adds (sign=1) or removes (sign=-1) a conversation from the global message counters
+
+        Args:
+            conversation: Conversation tuple
+            sign: 1 or -1
+        """
+        all_msgs, all_chars, sent_msgs = conversation[3], conversation[4], conversation[6]
+        self.controller.sent_messages += sign * sent_msgs
+        self.controller.total_messages += sign * all_msgs
+        self.controller.total_chars += sign * all_chars
+        self.controller.total_conversations += sign
+
+    def _apply_changes(self):
+        """Inserts new rows and updates merged ones, at most INSERT_BATCH per UI tick"""
+        with profiling.recording(self.profile_session):
+            with instrumentation.phase('insert'):
+                self._insert_batch()
+
+            # Keep the active sort order and the row striping correct
+            if self.on_rows_changed is not None:
+                with instrumentation.phase('sort'):
+                    self.on_rows_changed()
+
+    def _insert_batch(self):
+        """Inserts or updates the next INSERT_BATCH rows of the pending changes"""
+        for _ in range(min(INSERT_BATCH, len(self.pending_changes))):
+            row_index, conversation, is_new = self.pending_changes.popleft()
+            (title, people, room, all_msgs, all_chars, calltime, _, _, total_photos, total_gifs,
+             total_videos, total_files, _) = conversation
+            try:
+                # TREEVIEW AUTOMATED CONVERSION PROBLEM:
+                # The ttk treeview will convert able strings to integers.
+                # E.g. chats named '1337' will be attached to a folder named '1337_17623521673' yet be saved
+                # internally as '133717623521673'. This is not explicitly preventable.
+                # Easiest solution is to force the name to be a string by temporarily adding some garbage to it.
+                values = (
+                    title, set(people.keys()), room, all_msgs, calltime, total_photos, total_gifs, total_videos,
+                    total_files, all_chars,
+                    f'{PREFIX}all#{row_index}'
+                )
+                if not is_new:
+                    # An e2e contact and its private chat were merged, the row's values are replaced
+                    self._count(self.items[row_index], -1)
+                self.rows.set_row(row_index, values)
+
+                # Update global message counters
+                self._count(conversation, 1)
+                self.items[row_index] = conversation
+
+            except Exception as e:
+                print(f"Error loading conversation: {str(e)}")
+                continue
+
+    def cancel(self):
+        """
+        Stops loading: the extraction thread stops between two conversations
+        and rows that haven't been shown yet are dropped
+        Invoked by pressing the cancel button or closing the window
+        """
+        self.cancel_event.set()
+        profiling.finish(self.profile_session)
+        self.close()
+
+    def close(self):
+        """Closes the popup and reports it through on_finished"""
         self.destroy()
+        if self.on_finished is not None:
+            self.on_finished()
@@ -0,0 +1,168 @@
+"""
+Message search popup dialog for CounterForMessenger
+"""
+import queue
+import threading
+import tkinter as tk
+from datetime import datetime
+from os.path import exists
+from time import perf_counter
+from tkinter import ttk
+from engine import date_range_ms, parse_date
+from extraction import ExtractionCancelled
+from message_index import MessageIndex
+from utils import set_icon, set_resolution, apply_theme
+
+# Milliseconds between two checks of the index update thread
+POLL_INTERVAL = 100
+
+
+class MessageSearchPopup(tk.Toplevel):
+    """Popup window searching the text of every message through the message index"""
+
+    def __init__(self, controller):
+        """
+        Initialize message search popup
+
+        Args:
+            controller: Controller object holding the data source and the message index path
+        """
+        tk.Toplevel.__init__(self)
+        self.controller = controller
+        self.module = self.controller.lang_mdl
+        set_resolution(self, 900, 600)
+
+        # Search window customization
+        self.title(self.module.TITLE_SEARCH_MESSAGES)
+        set_icon(self)
+        self.focus_set()
+
+        # Query, sender and optional date range (YYYY-MM-DD)
+        filters = tk.Frame(self)
+        filters.pack(side='top', pady=10)
+        self.query_entry = self._add_entry(filters, self.module.TITLE_SEARCH, 30)
+        self.sender_entry = self._add_entry(filters, self.module.TITLE_SENDER, 18)
+        self.from_entry = self._add_entry(filters, self.module.TITLE_FROM, 11)
+        self.to_entry = self._add_entry(filters, self.module.TITLE_TO, 11)
+        ttk.Button(filters, text=self.module.TITLE_SEARCH, command=self.search).pack(side='left', padx=5)
+        self.bind('<Return>', lambda event: self.search())
+
+        # Number of results and search time, or the index update progress
+        self.status_label = ttk.Label(self, text='')
+        self.status_label.pack(side='top')
+
+        # Results, best ranked first
+        results = tk.Frame(self)
+        results.pack(side='top', fill='both', expand=True, padx=10, pady=5)
+        self.results = ttk.Treeview(results, columns=('date', 'name', 'sender', 'text'), show='headings')
+        for column, title, width in (
+                ('date', self.module.TITLE_DATE, 90), ('name', self.module.TITLE_NAME, 160),
+                ('sender', self.module.TITLE_SENDER, 130), ('text', self.module.TITLE_MESSAGE, 480)):
+            self.results.heading(column, text=title)
+            self.results.column(column, width=width, stretch=column == 'text')
+        scrollbar = ttk.Scrollbar(results, orient='vertical', command=self.results.yview)
+        self.results.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        self.results.pack(side='left', fill='both', expand=True)
+
+        # Build or update the index, and exit
+        buttons = tk.Frame(self)
+        buttons.pack(side='top', pady=10)
+        self.update_button = ttk.Button(buttons, text=self.module.TITLE_UPDATE_INDEX, command=self.update_index)
+        self.update_button.pack(side='left', padx=5)
+        ttk.Button(buttons, text=self.module.TITLE_CLOSE_POPUP, command=self.close).pack(side='left', padx=5)
+        self.protocol('WM_DELETE_WINDOW', self.close)
+
+        # Apply the active theme's colors to this window's plain tk widgets
+        apply_theme(self, self.controller.get_theme())
+
+        # The index is opened on the first search, updates run in a background thread
+        self.index = None
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        if self.controller.index_path is None or not exists(self.controller.index_path):
+            self.status_label.configure(text=self.module.TITLE_NO_INDEX)
+        self.query_entry.focus_set()
+
+    @staticmethod
+    def _add_entry(parent, title, width):
+        """Adds a labelled entry to a row of filters and returns the entry"""
+        ttk.Label(parent, text=f'{title}:').pack(side='left', padx=(10, 2))
+        entry = ttk.Entry(parent, width=width)
+        entry.pack(side='left')
+        return entry
+
+    def _date_range(self):
+        """
+        Converts the date entries to timestamps, leaving out the empty ones
+
+        Returns:
+            (start_ts, end_ts) in milliseconds, None for a missing bound
+        """
+        from_date = parse_date(self.from_entry.get().strip(), None)
+        to_date = parse_date(self.to_entry.get().strip(), None)
+        start_ts = date_range_ms(from_date, from_date)[0] if from_date is not None else None
+        end_ts = date_range_ms(to_date, to_date)[1] if to_date is not None else None
+        return start_ts, end_ts
+
+    def search(self):
+        """
+        Search the message index and list the matching messages
+        Invoked by the search button and the Return key
+        """
+        if self.controller.index_path is None or not exists(self.controller.index_path):
+            self.status_label.configure(text=self.module.TITLE_NO_INDEX)
+            return
+        if self.index is None:
+            self.index = MessageIndex(self.controller.index_path)
+
+        started = perf_counter()
+        start_ts, end_ts = self._date_range()
+        hits = self.index.search(self.query_entry.get(), self.sender_entry.get(), start_ts, end_ts)
+        elapsed = perf_counter() - started
+
+        self.results.delete(*self.results.get_children())
+        for hit in hits:
+            day = datetime.fromtimestamp(hit.timestamp / 1000).date().isoformat() if hit.timestamp else ''
+            self.results.insert('', 'end', values=(day, hit.title, hit.sender, hit.snippet.replace('\n', ' ')))
+        self.status_label.configure(text=f'{len(hits)} ({elapsed * 1000:.0f} ms)')
+
+    def update_index(self):
+        """
+        Build or update the message index in a background thread
+        Invoked by the update index button
+        """
+        self.update_button.state(['disabled'])
+        self.status_label.configure(text=f'{self.module.TITLE_INDEXING}...')
+        threading.Thread(target=self._update, daemon=True).start()
+        self.after(POLL_INTERVAL, self._poll)
+
+    def _update(self):
+        """Background thread: updates the index and reports the result through the queue"""
+        try:
+            self.queue.put(('done', self.controller.update_message_index(self.cancel_event)))
+        except ExtractionCancelled:
+            pass
+        except Exception as e:
+            self.queue.put(('error', e))
+
+    def _poll(self):
+        """Waits on the Tk main thread for the index update to finish"""
+        if self.cancel_event.is_set():
+            return
+        try:
+            event = self.queue.get_nowait()
+        except queue.Empty:
+            self.after(POLL_INTERVAL, self._poll)
+            return
+        if event[0] == 'error':
+            print(f"Error updating message index: {str(event[1])}")
+        self.status_label.configure(text='')
+        self.update_button.state(['!disabled'])
+
+    def close(self):
+        """Stop a running index update between two folders and close the popup"""
+        self.cancel_event.set()
+        if self.index is not None:
+            self.index.close()
+        self.destroy()
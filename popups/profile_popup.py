@@ -4,6 +4,7 @@ Popup dialogs for the CounterForMessenger application.
 
 import tkinter as tk
 from tkinter import ttk
+import instrumentation
 from utils import set_icon, set_resolution, apply_theme
 
 class ProfilePopup(tk.Toplevel):
@@ -19,7 +20,7 @@ class ProfilePopup(tk.Toplevel):
         tk.Toplevel.__init__(self)
         self.controller = controller
         self.module = self.controller.lang_mdl
-        set_resolution(self, 600, 400)
+        set_resolution(self, 600, 450)
 
         # Profile window customization
         self.title(self.module.TITLE_PROFILE)
@@ -61,10 +62,38 @@ class ProfilePopup(tk.Toplevel):
             self, text=f'{self.module.TITLE_TOTAL_CHARS}: {self.controller.total_chars}'
         ).pack(side='top', pady=10)
 
+        # Expandable per-phase timing report of the last upload
+        self.report_button = ttk.Button(
+            self, text=f'▸ {self.module.TITLE_UPLOAD_REPORT}', command=self.toggle_report
+        )
+        self.report_button.pack(side='top', pady=10)
+        report = instrumentation.current()
+        lines = report.lines() if report is not None else [self.module.TITLE_NOT_APPLICABLE]
+        self.report_listbox = tk.Listbox(self, width=60, height=min(len(lines), 12))
+        for line in lines:
+            self.report_listbox.insert('end', line)
+        self.report_shown = False
+
         # Load exit button
-        ttk.Button(
+        self.close_button = ttk.Button(
             self, text=self.module.TITLE_CLOSE_POPUP, padding=7, command=self.destroy
-        ).pack(side='top', pady=40)
+        )
+        self.close_button.pack(side='top', pady=30)
 
         # Apply the active theme's colors to this window's plain tk widgets
         apply_theme(self, self.controller.get_theme())
+
+    def toggle_report(self):
+        """
+        Shows or hides the timing report of the last upload
+        Invoked by pressing the report button
+        """
+        self.report_shown = not self.report_shown
+        if self.report_shown:
+            self.report_listbox.pack(side='top', pady=5, before=self.close_button)
+            self.report_button.configure(text=f'▾ {self.module.TITLE_UPLOAD_REPORT}')
+            set_resolution(self, 600, 680)
+        else:
+            self.report_listbox.pack_forget()
+            self.report_button.configure(text=f'▸ {self.module.TITLE_UPLOAD_REPORT}')
+            set_resolution(self, 600, 450)
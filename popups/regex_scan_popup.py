@@ -0,0 +1,211 @@
+"""
+Regex scan popup dialog for CounterForMessenger
+"""
+import queue
+import re
+import threading
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk
+from extraction import ExtractionCancelled
+from regex_scan import chat_key
+from utils import set_icon, set_resolution, apply_theme
+
+# Milliseconds between two drains of the result queue
+POLL_INTERVAL = 100
+
+# Matches listed in the window; the per-conversation counts include every match
+MAX_SHOWN_HITS = 5000
+
+
+class RegexScanPopup(tk.Toplevel):
+    """Popup window running a regular expression over every message text, with matches streaming in"""
+
+    def __init__(self, controller):
+        """
+        Initialize regex scan popup
+
+        Args:
+            controller: Controller object running the scan (see MasterWindow.scan_messages)
+        """
+        tk.Toplevel.__init__(self)
+        self.controller = controller
+        self.module = self.controller.lang_mdl
+        set_resolution(self, 1000, 600)
+
+        # Scan window customization
+        self.title(self.module.TITLE_REGEX_SCAN)
+        set_icon(self)
+        self.focus_set()
+
+        # Pattern, case sensitivity, start and cancel buttons
+        controls = tk.Frame(self)
+        controls.pack(side='top', pady=10)
+        ttk.Label(controls, text=f'{self.module.TITLE_PATTERN}:').pack(side='left', padx=(0, 2))
+        self.pattern_entry = ttk.Entry(controls, width=40)
+        self.pattern_entry.pack(side='left')
+        self.ignore_case = tk.BooleanVar(self, value=True)
+        ttk.Checkbutton(controls, text=self.module.TITLE_IGNORE_CASE, variable=self.ignore_case).pack(side='left', padx=5)
+        self.scan_button = ttk.Button(controls, text=self.module.TITLE_SCAN, command=self.start)
+        self.scan_button.pack(side='left', padx=5)
+        self.cancel_button = ttk.Button(controls, text=self.module.TITLE_CANCEL, command=self.cancel)
+        self.cancel_button.pack(side='left', padx=5)
+        self.cancel_button.state(['disabled'])
+        self.bind('<Return>', lambda event: self.start())
+
+        # Scanned conversations, matches and throughput
+        self.progress_bar = ttk.Progressbar(self, orient='horizontal', length=400, mode='determinate')
+        self.progress_bar.pack(side='top')
+        self.status_label = ttk.Label(self, text='')
+        self.status_label.pack(side='top', pady=5)
+
+        # Matches per conversation on the left, the matches themselves on the right
+        panes = tk.Frame(self)
+        panes.pack(side='top', fill='both', expand=True, padx=10, pady=5)
+        self.counts = ttk.Treeview(panes, columns=('name', 'hits'), show='headings')
+        self.counts.heading('name', text=self.module.TITLE_NAME)
+        self.counts.heading('hits', text=self.module.TITLE_HITS)
+        self.counts.column('name', width=180)
+        self.counts.column('hits', width=70, stretch=False)
+        self.counts.pack(side='left', fill='y')
+        self.hits = ttk.Treeview(panes, columns=('date', 'name', 'sender', 'match', 'text'), show='headings')
+        for column, title, width in (
+                ('date', self.module.TITLE_DATE, 90), ('name', self.module.TITLE_NAME, 140),
+                ('sender', self.module.TITLE_SENDER, 120), ('match', self.module.TITLE_MATCH, 120),
+                ('text', self.module.TITLE_MESSAGE, 320)):
+            self.hits.heading(column, text=title)
+            self.hits.column(column, width=width, stretch=column == 'text')
+        scrollbar = ttk.Scrollbar(panes, orient='vertical', command=self.hits.yview)
+        self.hits.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        self.hits.pack(side='left', fill='both', expand=True, padx=(10, 0))
+
+        ttk.Button(self, text=self.module.TITLE_CLOSE_POPUP, command=self.close).pack(side='top', pady=10)
+        self.protocol('WM_DELETE_WINDOW', self.close)
+
+        # Apply the active theme's colors to this window's plain tk widgets
+        apply_theme(self, self.controller.get_theme())
+
+        # The scan runs in a background thread and reports through this queue;
+        # the Tk main thread only drains it on a timer
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        # Conversation (see regex_scan.chat_key) -> (counts item, number of matches)
+        self.chat_counts = {}
+        self.total_hits = 0
+        self.shown_hits = 0
+        self.scanned_bytes = 0
+        self.running = False
+        self.closed = False
+        self.pattern_entry.focus_set()
+
+    def start(self):
+        """
+        Start scanning the messages for the pattern
+        Invoked by the scan button and the Return key
+        """
+        if self.running:
+            return
+        pattern = self.pattern_entry.get()
+        flags = re.IGNORECASE if self.ignore_case.get() else 0
+        try:
+            # Checked here, so a typo is reported before any worker starts
+            re.compile(pattern, flags)
+        except re.error as e:
+            self.status_label.configure(text=f'{self.module.TITLE_INVALID_PATTERN}: {e}')
+            return
+
+        self.counts.delete(*self.counts.get_children())
+        self.hits.delete(*self.hits.get_children())
+        self.chat_counts = {}
+        self.total_hits = self.shown_hits = self.scanned_bytes = 0
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.running = True
+        self.scan_button.state(['disabled'])
+        self.cancel_button.state(['!disabled'])
+        self.status_label.configure(text='')
+        threading.Thread(target=self._scan, args=(pattern, flags, self.queue, self.cancel_event), daemon=True).start()
+        self.after(POLL_INTERVAL, self._poll)
+
+    def _scan(self, pattern, flags, results, cancel):
+        """Background thread: scans the messages and reports each shard's results through the queue"""
+        try:
+            for scans, done, total, elapsed in self.controller.scan_messages(pattern, flags, cancel):
+                results.put(('scans', scans, done, total, elapsed))
+            results.put(('done',))
+        except ExtractionCancelled:
+            results.put(('done',))
+        except Exception as e:
+            results.put(('error', e))
+
+    def _poll(self):
+        """Drains the result queue on the Tk main thread, shows the new matches, then reschedules itself"""
+        if self.closed:
+            return
+        finished = False
+        try:
+            while True:
+                event = self.queue.get_nowait()
+                if event[0] == 'scans':
+                    self._show_scans(event[1])
+                    self._show_progress(*event[2:])
+                elif event[0] == 'done':
+                    finished = True
+                else:
+                    print(f"Error scanning messages: {str(event[1])}")
+                    finished = True
+        except queue.Empty:
+            pass
+
+        if not finished:
+            self.after(POLL_INTERVAL, self._poll)
+            return
+        # Most matched conversations first
+        for index, (item, _) in enumerate(sorted(self.chat_counts.values(), key=lambda entry: -entry[1])):
+            self.counts.move(item, '', index)
+        self.running = False
+        self.scan_button.state(['!disabled'])
+        self.cancel_button.state(['disabled'])
+
+    def _show_scans(self, scans):
+        """Adds the results of scanned files to the counts and the list of matches"""
+        for scan in scans:
+            self.scanned_bytes += scan.bytes
+            if not scan.count:
+                continue
+            self.total_hits += scan.count
+            # Chats can share a title, the title is only their label
+            key = chat_key(scan)
+            item, count = self.chat_counts.get(key, (None, 0))
+            if item is None:
+                item = self.counts.insert('', 'end', values=(scan.title, scan.count))
+            else:
+                self.counts.item(item, values=(scan.title, count + scan.count))
+            self.chat_counts[key] = (item, count + scan.count)
+
+            for hit in scan.hits[:MAX_SHOWN_HITS - self.shown_hits]:
+                day = datetime.fromtimestamp(hit.timestamp / 1000).date().isoformat() if hit.timestamp else ''
+                self.hits.insert('', 'end', values=(day, scan.title, hit.sender, hit.match, hit.text))
+                self.shown_hits += 1
+
+    def _show_progress(self, done, total, elapsed):
+        """Updates the progress bar and the matches and throughput label"""
+        self.progress_bar.configure(maximum=max(total, 1), value=done)
+        rate = self.scanned_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0
+        self.status_label.configure(
+            text=f'{self.module.TITLE_HITS}: {self.total_hits} · {done}/{total} · {rate:.1f} MB/s'
+        )
+
+    def cancel(self):
+        """
+        Stop the scan between two shards of conversations
+        Invoked by the cancel button
+        """
+        self.cancel_event.set()
+
+    def close(self):
+        """Stop a running scan and close the popup"""
+        self.closed = True
+        self.cancel_event.set()
+        self.destroy()
@@ -5,7 +5,10 @@ import tkinter as tk
 from tkinter import ttk, filedialog
 from tkcalendar import DateEntry
 from datetime import date, datetime
+from os import cpu_count
 from utils import set_icon, set_resolution, existing_languages, apply_theme
+from sources import ZIP_SEPARATOR
+from popups.stalls_popup import StallsPopup
 
 class SettingsPopup(tk.Toplevel):
     """Settings popup window for adjusting application configuration"""
@@ -36,10 +39,15 @@ class SettingsPopup(tk.Toplevel):
         self.directory_label = tk.Label(self, text=self.controller.get_directory())
         self.directory_label.pack(side='top', pady=15)
 
-        # Show 'Open File Explorer' button
+        # Show 'Open File Explorer' and 'Open ZIP archive' buttons side by side
+        source_buttons = tk.Frame(self)
+        source_buttons.pack(side='top', pady=5)
         ttk.Button(
-            self, text=f'{self.module.TITLE_OPEN_FE}...', padding=5, command=self.open_file_explorer
-        ).pack(side='top', pady=5)
+            source_buttons, text=f'{self.module.TITLE_OPEN_FE}...', padding=5, command=self.open_file_explorer
+        ).pack(side='left', padx=5)
+        ttk.Button(
+            source_buttons, text=f'{self.module.TITLE_OPEN_ZIP}...', padding=5, command=self.open_zip_explorer
+        ).pack(side='left', padx=5)
 
         # Ask for Facebook name
         tk.Label(
@@ -76,10 +84,29 @@ class SettingsPopup(tk.Toplevel):
             state="readonly"
         ).pack(side='top', pady=10)
 
+        # Number of worker processes used to parse conversations in parallel
+        tk.Label(self, text=f'{self.module.TITLE_WORKERS}:').pack(side='top', pady=1)
+        self.workers_var = tk.IntVar(self, value=self.controller.get_workers())
+        ttk.Spinbox(
+            self, from_=1, to=cpu_count() or 1, textvariable=self.workers_var, width=5, state='readonly'
+        ).pack(side='top', pady=5)
+
+        # Clear the persistent ingestion cache (forces a full re-read on the next upload),
+        # and show the event loop stalls recorded by the watchdog
+        maintenance_buttons = tk.Frame(self)
+        maintenance_buttons.pack(side='top', pady=5)
+        ttk.Button(
+            maintenance_buttons, text=self.module.TITLE_CLEAR_CACHE, padding=5, command=self.controller.clear_cache
+        ).pack(side='left', padx=5)
+        ttk.Button(
+            maintenance_buttons, text=f'{self.module.TITLE_STALLS}...', padding=5,
+            command=lambda: StallsPopup(self.controller)
+        ).pack(side='left', padx=5)
+
         # Load save button
         ttk.Button(
             self, text=self.module.TITLE_SAVE, padding=7, command=self.setup
-        ).pack(side='top', pady=40)
+        ).pack(side='top', pady=20)
 
         # Apply the active theme's colors to this window's plain tk widgets
         apply_theme(self, self.controller.get_theme())
@@ -159,6 +186,7 @@ class SettingsPopup(tk.Toplevel):
             self.from_date_entry.get_date(),
             self.to_date_entry.get_date(),
             self.theme_var.get(),
+            self.workers_var.get(),
         )
         self.controller.change_theme(self.theme_var.get())
         self.parent.set_treeview_theme()
@@ -176,3 +204,14 @@ class SettingsPopup(tk.Toplevel):
         self.directory_label.config(
             text=(self.module.TITLE_NO_SELECTION if path == '' or path.isspace() or path == '/' else path)
         )
+
+    def open_zip_explorer(self):
+        """
+        Open file explorer to select the export's ZIP archive(s); all parts of
+        a split export can be selected at once
+        Invoked by pressing the 'Open ZIP archive...' button
+        """
+        paths = tk.filedialog.askopenfilenames(filetypes=[('ZIP', '*.zip')])
+        self.directory_label.config(
+            text=(ZIP_SEPARATOR.join(paths) if paths else self.module.TITLE_NO_SELECTION)
+        )
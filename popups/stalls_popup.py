@@ -0,0 +1,54 @@
+"""
+Event-loop stalls popup dialog for CounterForMessenger
+"""
+import tkinter as tk
+from tkinter import ttk
+from utils import set_icon, set_resolution, apply_theme
+
+
+class StallsPopup(tk.Toplevel):
+    """Popup window showing the stall watchdog's histogram and the last stalls"""
+
+    def __init__(self, controller):
+        """
+        Initialize stalls popup
+
+        Args:
+            controller: Controller object holding the stall watchdog
+        """
+        tk.Toplevel.__init__(self)
+        self.controller = controller
+        self.module = self.controller.lang_mdl
+        set_resolution(self, 700, 550)
+
+        # Stalls window customization
+        self.title(self.module.TITLE_STALLS)
+        set_icon(self)
+        self.focus_set()
+        self.grab_set()
+
+        watchdog = self.controller.watchdog
+        ttk.Label(
+            self, text=f'{self.module.TITLE_STALLS} (> {watchdog.threshold * 1000:.0f} ms): {len(watchdog.stalls)}'
+        ).pack(side='top', pady=10)
+
+        # Histogram of every heartbeat delay
+        histogram = tk.Listbox(self, width=30, height=len(watchdog.histogram))
+        for line in watchdog.histogram_lines():
+            histogram.insert('end', line)
+        histogram.pack(side='top', pady=5)
+
+        # Last stalls, newest first, with the stack the event loop was stuck in
+        stacks = tk.Text(self, width=90, height=14, wrap='none')
+        for duration, stack in reversed(watchdog.stalls):
+            stacks.insert('end', f'{duration:.3f} s\n{stack or ""}\n')
+        stacks.configure(state='disabled')
+        stacks.pack(side='top', pady=5, fill='both', expand=True)
+
+        # Load exit button
+        ttk.Button(
+            self, text=self.module.TITLE_CLOSE_POPUP, padding=7, command=self.destroy
+        ).pack(side='top', pady=10)
+
+        # Apply the active theme's colors to this window's plain tk widgets
+        apply_theme(self, self.controller.get_theme())
@@ -0,0 +1,236 @@
+"""
+Opt-in profiling of ingestion for CounterForMessenger
+
+Set the CFM_PROFILE environment variable to a folder (or to 1 for
+./diagnostics), or pass --profile to the command-line tool, and every
+upload writes into that folder, per phase:
+
+    <time>-<phase>.pstats              cProfile statistics (python -m pstats FILE)
+    <time>-<phase>-allocations.txt     the top allocations made during the phase (tracemalloc)
+
+The phases are 'extract' (reading and summarizing the export, see
+extraction.iter_extracted), 'populate' (filling the main list, see
+LoadingPopup) and 'worker-<pid>' for every extraction worker process.
+The files can be attached to bug reports as they are.
+
+When profiling is disabled, no profiler or tracer is ever started: the
+hooks only check a module-level flag once per upload or treeview batch.
+"""
+import cProfile
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from os import environ, getpid, makedirs
+from os.path import join
+from threading import Lock
+from time import strftime
+
+# Environment variable enabling profiling: a folder, or 1 for DEFAULT_DIRECTORY
+PROFILE_VARIABLE = 'CFM_PROFILE'
+DEFAULT_DIRECTORY = 'diagnostics'
+
+# Allocation sites listed per phase, and stack frames recorded per allocation
+TOP_ALLOCATIONS = 25
+TRACE_FRAMES = 5
+
+
+def _directory_from_environment():
+    """Returns the diagnostics folder configured in CFM_PROFILE, None if profiling is off"""
+    value = environ.get(PROFILE_VARIABLE, '').strip()
+    if value.lower() in ('', '0', 'false', 'no', 'off'):
+        return None
+    return DEFAULT_DIRECTORY if value.lower() in ('1', 'true', 'yes', 'on') else value
+
+
+# Diagnostics folder, None while profiling is disabled
+_directory = _directory_from_environment()
+
+# Sessions relying on tracemalloc, which is process-wide; it's stopped with the last one
+_lock = Lock()
+_tracers = 0
+_owns_tracing = False
+
+
+def enable(directory=DEFAULT_DIRECTORY):
+    """
+    Turns profiling on for this process and the worker processes it starts
+
+    Args:
+        directory: Folder the diagnostics files are written to
+    """
+    global _directory
+    _directory = directory
+    # Spawned worker processes read it again on import
+    environ[PROFILE_VARIABLE] = directory
+
+
+def disable():
+    """Turns profiling off"""
+    global _directory
+    _directory = None
+    environ.pop(PROFILE_VARIABLE, None)
+
+
+def enabled():
+    """Returns True if profiling is on"""
+    return _directory is not None
+
+
+def _start_tracing():
+    global _tracers, _owns_tracing
+    with _lock:
+        if _tracers == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            _owns_tracing = True
+        _tracers += 1
+    return tracemalloc.take_snapshot()
+
+
+def _stop_tracing():
+    global _tracers, _owns_tracing
+    with _lock:
+        _tracers -= 1
+        if _tracers == 0 and _owns_tracing:
+            tracemalloc.stop()
+            _owns_tracing = False
+
+
+class Session:
+    """cProfile and tracemalloc recording of one phase, possibly made of several separate stretches"""
+
+    def __init__(self, name, directory):
+        """
+        Args:
+            name: Phase name, part of the file names
+            directory: Folder the files are written to
+        """
+        self.profile = cProfile.Profile()
+        self.directory = directory
+        self.prefix = join(directory, f'{strftime("%Y%m%d-%H%M%S")}-{name}')
+        self.baseline = _start_tracing()
+        self.closed = False
+
+    def write(self):
+        """Writes the statistics recorded so far (overwriting earlier ones of this session)"""
+        makedirs(self.directory, exist_ok=True)
+        # Snapshot first, so writing the statistics doesn't show up in them
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        self.profile.dump_stats(f'{self.prefix}.pstats')
+        if snapshot is not None:
+            own_frames = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            statistics = snapshot.filter_traces(own_frames).compare_to(
+                self.baseline.filter_traces(own_frames), 'lineno'
+            )
+            current, peak = tracemalloc.get_traced_memory()
+            with open(f'{self.prefix}-allocations.txt', 'w', encoding='utf-8') as f:
+                f.write(f'Traced memory: {current / 1024:.0f} KiB, peak {peak / 1024:.0f} KiB\n')
+                f.write(f'Top {TOP_ALLOCATIONS} allocation sites (growth since the phase started):\n')
+                for statistic in statistics[:TOP_ALLOCATIONS]:
+                    f.write(f'{statistic}\n')
+
+    def close(self):
+        """Writes the statistics and releases the tracer"""
+        if self.closed:
+            return
+        self.closed = True
+        self.write()
+        _stop_tracing()
+        print(f'Profile written to {self.prefix}.pstats')
+
+
+def start(name):
+    """
+    Starts profiling a phase
+
+    Args:
+        name: Phase name
+
+    Returns:
+        Session to record into (see recording()) and close(), None when profiling is disabled
+    """
+    if _directory is None:
+        return None
+    return Session(name, _directory)
+
+
+def recording(session):
+    """Context manager running the enclosed block under a session's profiler (a no-op for None)"""
+    return nullcontext() if session is None else _Recording(session.profile)
+
+
+class _Recording:
+    """
+    Runs the enclosed block under a profiler; since Python 3.12 only one
+    profiler can be active in the process at a time, so the block runs
+    unprofiled while another one is (e.g. the 'extract' session of an upload
+    running in the loading thread)
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.active = False
+
+    def __enter__(self):
+        try:
+            self.profile.enable()
+            self.active = True
+        except ValueError:
+            # Another profiler is running
+            pass
+
+    def __exit__(self, *exc_info):
+        if self.active:
+            self.profile.disable()
+            self.active = False
+
+
+def finish(session):
+    """Closes a session returned by start(), None is ignored"""
+    if session is not None:
+        session.close()
+
+
+@contextmanager
+def profiled(name):
+    """Profiles the enclosed block as one phase, if profiling is enabled"""
+    session = start(name)
+    if session is None:
+        yield
+        return
+    try:
+        with _Recording(session.profile):
+            yield
+    finally:
+        session.close()
+
+
+# Session of this worker process, accumulating every folder it loads
+_worker_session = None
+
+
+def worker_recording():
+    """
+    Context manager profiling one task of an extraction worker process; the
+    statistics of all its tasks are written to the same worker-<pid> files
+    """
+    global _worker_session
+    if _directory is None:
+        return nullcontext()
+    if _worker_session is None:
+        _worker_session = Session(f'worker-{getpid()}', _directory)
+    return _WorkerTask(_worker_session)
+
+
+class _WorkerTask(_Recording):
+    """
+    Profiles one worker task, then rewrites the worker's files; skipped while
+    another profiler runs in the thread (e.g. inherited from a forked parent)
+    """
+
+    def __init__(self, session):
+        _Recording.__init__(self, session.profile)
+        self.session = session
+
+    def __exit__(self, *exc_info):
+        if self.active:
+            _Recording.__exit__(self, *exc_info)
+            self.session.write()
@@ -0,0 +1,179 @@
+"""
+Regular expression scan over message texts for CounterForMessenger
+
+Runs a pattern over the text of every message of an export (e.g. to find
+every phone number or URL) and counts the matches per conversation. The
+conversation folders are split into shards scanned by a process pool;
+each worker compiles the pattern once, reads the message texts with the
+same schema and mojibake handling as the statistics (see
+extraction.iter_message_bodies), and sends back the matches of each
+shard as soon as it's done.
+"""
+import re
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from time import perf_counter
+
+from extraction import ExtractionCancelled, iter_message_bodies
+from sources import file_size, list_conversations, list_files
+
+# Matches kept per conversation (see chat_key), over all of its files; the count still includes every match
+MAX_HITS = 200
+
+# Characters of the message shown on each side of a match
+CONTEXT_CHARS = 40
+
+# A match; text is the part of the message around it
+ScanHit = namedtuple('ScanHit', ['position', 'timestamp', 'sender', 'match', 'text'])
+
+# Result of one conversation file: its folder, chat title, number of matches,
+# the first MAX_HITS of them (ScanHit) and the size of the file in bytes
+FileScan = namedtuple('FileScan', ['conversation', 'title', 'count', 'hits', 'bytes'])
+
+# Pattern compiled by _init_worker(), once per worker process
+_pattern = None
+
+
+def chat_key(scan):
+    """
+    Returns the conversation a FileScan counts towards: its folder, or for
+    the e2e folder (one file per chat) the folder and the chat title
+    """
+    return (scan.conversation, scan.title) if scan.conversation == 'e2e' else scan.conversation
+
+
+def _init_worker(pattern, flags):
+    """Worker process initializer: compiles the pattern for every shard the worker scans"""
+    global _pattern
+    _pattern = re.compile(pattern, flags)
+
+
+def _context(text, start, end):
+    """Returns the part of a message around a match, on a single line"""
+    before = max(0, start - CONTEXT_CHARS)
+    after = min(len(text), end + CONTEXT_CHARS)
+    context = text[before:after].replace('\n', ' ')
+    return ('…' if before > 0 else '') + context + ('…' if after < len(text) else '')
+
+
+def scan_file(file, conversation, pattern, options):
+    """
+    Runs a compiled pattern over the messages of a file
+
+    Args:
+        file: Path of the JSON file, or ZipMember inside an export archive
+        conversation: Conversation folder of the file
+        pattern: Compiled regular expression
+        options: ExtractOptions with the date range, streaming threshold and JSON backend
+
+    Returns:
+        FileScan, None if the file couldn't be read
+    """
+    count = 0
+    hits = []
+    info = {}
+    try:
+        for position, timestamp, sender, text in iter_message_bodies(file, options, info):
+            if not options.start_ts <= timestamp < options.end_ts:
+                continue
+            for match in pattern.finditer(text):
+                count += 1
+                if len(hits) < MAX_HITS:
+                    hits.append(ScanHit(
+                        position, timestamp, sender, match.group(), _context(text, match.start(), match.end())
+                    ))
+        return FileScan(conversation, info.get('title') or conversation, count, hits, file_size(file))
+    except Exception as e:
+        print(f"Error scanning file {file}: {e}")
+        return None
+
+
+def _scan_shard(directory, conversations, options, pattern=None):
+    """
+    Worker entry point: scans every file of a shard of conversation folders
+
+    Args:
+        directory: Inbox directory (with a trailing slash) or export archive(s), see sources
+        conversations: Conversation folders of the shard
+        options: ExtractOptions with the date range, streaming threshold and JSON backend
+        pattern: Compiled pattern, None to use the one compiled by _init_worker()
+
+    Returns:
+        List of FileScan, files that couldn't be read are left out
+    """
+    pattern = pattern if pattern is not None else _pattern
+    scans = []
+    # Conversation (see chat_key) -> matches kept so far; shards hold whole folders
+    kept = {}
+    for conversation in conversations:
+        for file in list_files(directory, conversation):
+            scan = scan_file(file, conversation, pattern, options)
+            if scan is None:
+                continue
+            key = chat_key(scan)
+            remaining = MAX_HITS - kept.get(key, 0)
+            if len(scan.hits) > remaining:
+                scan = scan._replace(hits=scan.hits[:remaining])
+            kept[key] = kept.get(key, 0) + len(scan.hits)
+            scans.append(scan)
+    return scans
+
+
+def iter_scan(directory, pattern, options, workers=1, cancel=None, flags=0):
+    """
+    Scans the message texts of every conversation for a regular expression,
+    yielding the results of each file as soon as they're available
+
+    With more than one worker, the conversation folders are split into
+    shards scanned by worker processes, and results arrive in the order
+    the shards finish.
+
+    Args:
+        directory: Inbox directory (with a trailing slash) or export archive(s), see sources
+        pattern: Regular expression
+        options: ExtractOptions with the date range, streaming threshold and JSON backend
+        workers: Number of worker processes, 1 (or less) to scan in this process
+        cancel: Optional threading.Event; once set, the scan stops between shards
+        flags: re flags of the pattern
+
+    Yields:
+        (scans, done, total, elapsed): list of FileScan of a shard, the
+        number of scanned/total folders and the seconds since the start
+
+    Raises:
+        re.error: If the pattern is invalid (before anything is scanned)
+        ExtractionCancelled: If the cancel event was set before the scan finished
+    """
+    compiled = re.compile(pattern, flags)
+    started = perf_counter()
+    conversations = list_conversations(directory)
+    total = len(conversations)
+    done = 0
+
+    if workers <= 1 or total <= 1:
+        for conversation in conversations:
+            if cancel is not None and cancel.is_set():
+                raise ExtractionCancelled()
+            scans = _scan_shard(directory, [conversation], options, compiled)
+            done += 1
+            yield scans, done, total, perf_counter() - started
+        return
+
+    # Small shards keep the results flowing and the workers busy until the end
+    size = max(1, total // (workers * 8))
+    shards = [conversations[start:start + size] for start in range(0, total, size)]
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(pattern, flags))
+    try:
+        pending = {executor.submit(_scan_shard, directory, shard, options): len(shard) for shard in shards}
+        while pending:
+            finished, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            if cancel is not None and cancel.is_set():
+                raise ExtractionCancelled()
+            for future in finished:
+                done += pending.pop(future)
+                yield future.result(), done, total, perf_counter() - started
+    except (ExtractionCancelled, GeneratorExit):
+        # Drop queued shards, workers finish their current one on their own
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
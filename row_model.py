@@ -0,0 +1,160 @@
+"""
+Row model of the conversation list for CounterForMessenger
+
+The main list keeps every conversation row here, in Python, instead of in
+the Tk treeview: sorting, searching, striping and the selection all work on
+this model, and the treeview only shows the window of rows currently
+scrolled into view (see gui.virtual_table). That keeps the list responsive
+with tens of thousands of conversations, where one Tk item per row made
+inserting, sorting and retagging take seconds.
+
+Every row also keeps a typed sort key (real ints, and collation keys for
+the text, see collation), built once when the row is set, so a sort is a
+single list.sort over the display order and only its visible window is
+pushed to Tk. Titles and participant names are indexed for searching as
+the rows are set (see search_index).
+"""
+from operator import itemgetter
+from collation import Collator
+from search_index import SearchIndex
+
+# Row values, in the order LoadingPopup builds them; the treeview displays
+# the first nine, 'chars' and 'id' are kept for the statistics popup
+COLUMNS = ('name', 'pep', 'type', 'msg', 'call', 'photos', 'gifs', 'videos', 'files', 'chars', 'id')
+
+# Columns sorted as text, the others are counts
+TEXT_COLUMNS = frozenset(('name', 'type', 'id'))
+
+# Text columns sorted in the collation of the selected language, the id is compared as is
+COLLATED_COLUMNS = frozenset(('name', 'type'))
+
+
+def key_types(collator):
+    """
+    Returns the conversion of each column's value to its sort key
+
+    Args:
+        collator: Collator of the name and type columns
+
+    Returns:
+        Tuple with one callable per column: collation keys for the names and
+        chat types, str for the id, the number of participants, and int for the counts
+    """
+    return tuple(
+        collator.key if column in COLLATED_COLUMNS else str if column in TEXT_COLUMNS
+        else len if column == 'pep' else int
+        for column in COLUMNS
+    )
+
+
+class RowModel:
+    """Conversation rows, their display order and the selected rows"""
+
+    def __init__(self, collator=None):
+        """
+        Args:
+            collator: Collator of the text columns, None for the language-neutral one
+        """
+        self.collator = collator if collator is not None else Collator()
+        self.key_types = key_types(self.collator)
+        # Row identifier -> values tuple (see COLUMNS)
+        self.rows = {}
+        # Row identifier -> typed sort key (see key_types)
+        self.keys = {}
+        # Row identifiers, in display order
+        self.order = []
+        # Selected row identifiers
+        self.selection = set()
+        # Titles and participant names, for matching()
+        self.index = SearchIndex()
+
+    def __len__(self):
+        return len(self.order)
+
+    def clear(self):
+        """Removes all rows"""
+        self.rows.clear()
+        self.keys.clear()
+        self.order.clear()
+        self.selection.clear()
+        self.index.clear()
+
+    def set_row(self, row, values):
+        """
+        Adds a row at the end of the display order, or replaces the values of an existing one
+
+        Args:
+            row: Row identifier
+            values: Tuple of values, see COLUMNS
+
+        Returns:
+            True if the row is new
+        """
+        is_new = row not in self.rows
+        self.rows[row] = values
+        self.keys[row] = self._sort_key(values)
+        self.index.set_row(row, values[0], values[1])
+        if is_new:
+            self.order.append(row)
+        return is_new
+
+    def _sort_key(self, values):
+        return tuple([key_type(value) for key_type, value in zip(self.key_types, values)])
+
+    def value(self, row, column):
+        """Returns the value of one column of a row"""
+        return self.rows[row][COLUMNS.index(column)]
+
+    def reorder(self, order):
+        """
+        Replaces the display order
+
+        Args:
+            order: All row identifiers, in their new order
+        """
+        self.order[:] = order
+
+    def sort(self, columns):
+        """
+        Sorts the display order, stably
+
+        Args:
+            columns: (column, descending) pairs, the most significant first
+        """
+        if not columns:
+            return
+        keys = self.keys
+        directions = {descending for _, descending in columns}
+        if len(directions) == 1:
+            # One direction: a single sort on the composite key
+            get = itemgetter(*(COLUMNS.index(column) for column, _ in columns))
+            self.order.sort(key=lambda row: get(keys[row]), reverse=directions.pop())
+        else:
+            # Mixed directions: stable sorts chained from the least significant column
+            for column, descending in reversed(columns):
+                index = COLUMNS.index(column)
+                self.order.sort(key=lambda row: keys[row][index], reverse=descending)
+
+    def position(self, row):
+        """Returns the position of a row in the display order"""
+        return self.order.index(row)
+
+    def select(self, rows):
+        """Replaces the selection"""
+        self.selection = set(rows)
+
+    def matching(self, query):
+        """
+        Finds the rows whose title or a participant name contains a query,
+        ignoring case and accents (see SearchIndex.search)
+
+        Args:
+            query: Searched text
+
+        Returns:
+            List of the matching row identifiers, in display order
+        """
+        found = self.index.search(query)
+        if not found:
+            return []
+        return [row for row in self.order if row in found]
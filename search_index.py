@@ -0,0 +1,138 @@
+"""
+Search index of the conversation list for CounterForMessenger
+
+Conversation titles and participant names are folded (lowercase, without
+accents, see collation.fold) and indexed by their trigrams as the rows are
+set, batch by batch while an upload streams them in, so the first search
+is as fast as the next ones. A search only checks the texts listed under
+the query's rarest trigram, instead of stringifying and scanning every
+value of every row.
+Only titles and names are searched: counts and the hidden row identifiers
+never match.
+
+Names repeat across conversations (yours is in every one), so the index
+holds each distinct text once, under a number, with the rows it appears in;
+the trigram postings are compact arrays of these numbers. As the query
+grows while typing, the next search only re-checks the texts the previous
+one matched.
+"""
+from array import array
+from collections import defaultdict
+
+from collation import fold
+
+# Length of the indexed n-grams; shorter queries scan the distinct texts
+GRAM = 3
+
+
+def grams(text):
+    """Returns the set of trigrams of a text"""
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class SearchIndex:
+    """Trigram index of the titles and participant names of the rows"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Removes all rows"""
+        # Folded text -> text number, and the reverse
+        self.ids = {}
+        self.texts = []
+        # Raw (unfolded) text -> text number, so repeated names are folded once
+        self.raw_ids = {}
+        # Trigram -> numbers of the texts containing it
+        self.postings = defaultdict(lambda: array('I'))
+        # Text number -> rows it appears in (texts no row uses anymore are left out)
+        self.rows = {}
+        # Row -> numbers of its texts
+        self.row_texts = {}
+        # (folded query, numbers of the texts it matched) of the last search, to refine while typing
+        self.last = None
+
+    def _add_text(self, raw):
+        """Returns the number of a raw text seen for the first time, indexing its folded form if it's new too"""
+        text = fold(str(raw))
+        text_id = self.ids.get(text)
+        if text_id is None:
+            text_id = self.ids[text] = len(self.texts)
+            self.texts.append(text)
+            postings = self.postings
+            for gram in grams(text):
+                postings[gram].append(text_id)
+        self.raw_ids[raw] = text_id
+        return text_id
+
+    def set_row(self, row, title, people):
+        """
+        Indexes (or re-indexes) a row
+
+        Args:
+            row: Row identifier
+            title: Conversation title
+            people: Participant names
+        """
+        if row in self.row_texts:
+            self._unindex_row(row)
+        raw_ids, rows = self.raw_ids, self.rows
+        text_ids = set()
+        for raw in (title, *people):
+            text_id = raw_ids.get(raw)
+            text_ids.add(self._add_text(raw) if text_id is None else text_id)
+        self.row_texts[row] = tuple(text_ids)
+        for text_id in text_ids:
+            text_rows = rows.get(text_id)
+            if text_rows is None:
+                rows[text_id] = {row}
+            else:
+                text_rows.add(row)
+        # New texts may match the last query
+        self.last = None
+
+    def remove_row(self, row):
+        """Removes a row from the index, if it's indexed"""
+        self._unindex_row(row)
+        self.last = None
+
+    def _unindex_row(self, row):
+        """Removes the texts of an indexed row"""
+        for text_id in self.row_texts.pop(row, ()):
+            rows = self.rows[text_id]
+            rows.discard(row)
+            if not rows:
+                # Its trigram postings stay, the text is skipped by searches
+                del self.rows[text_id]
+
+    def search(self, query):
+        """
+        Finds the rows whose title or a participant name contains a query,
+        ignoring case and accents
+
+        Args:
+            query: Searched text
+
+        Returns:
+            Set of the matching row identifiers (empty for an empty query)
+        """
+        query = fold(query.strip())
+        if not query:
+            return set()
+
+        if self.last is not None and self.last[0] in query:
+            # The query grew: only what the shorter one matched can still match
+            candidates = self.last[1]
+        elif len(query) < GRAM:
+            candidates = self.rows.keys()
+        else:
+            # Every match contains all of the query's trigrams, the rarest one has the fewest candidates
+            candidates = min((self.postings.get(gram, ()) for gram in grams(query)), key=len)
+
+        texts, rows = self.texts, self.rows
+        matched = [text_id for text_id in candidates if text_id in rows and query in texts[text_id]]
+        self.last = (query, matched)
+        found = set()
+        for text_id in matched:
+            found |= rows[text_id]
+        return found
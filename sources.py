@@ -0,0 +1,168 @@
+"""
+Data sources for CounterForMessenger
+
+An export can be read either from an unpacked inbox directory or straight
+from the ZIP archive(s) Facebook hands out, without unpacking them to disk.
+Both are addressed by the same 'directory' string stored in config.txt:
+a directory path ending in a slash, or one or more .zip paths joined with
+ZIP_SEPARATOR (big exports are split into several independent parts).
+
+Conversations are the folders of the inbox (including 'e2e'); inside an
+archive, every messages/inbox/<conversation>/ folder counts as one, and
+parts of the same conversation spread over several archives are combined.
+Like with an unpacked export, the other thread folders (archived_threads,
+message_requests, ...) are only read once moved into the inbox.
+"""
+import glob
+import re
+import threading
+import zipfile
+from collections import namedtuple
+from os import getpid, listdir, stat
+from os.path import abspath
+
+# Joins the paths of the parts of a split export
+ZIP_SEPARATOR = '|'
+
+# A JSON file of an inbox conversation folder, e2e included
+_CONVERSATION_MEMBER = re.compile(r'(?:^|/)messages/inbox/([^/]+)/([^/]+\.json)$')
+
+# A JSON file inside an archive
+ZipMember = namedtuple('ZipMember', ['archive', 'name', 'size', 'crc'])
+
+
+def is_archive(directory):
+    """
+    Checks whether a data source points to ZIP archives instead of a directory
+
+    Args:
+        directory: Data source string, as stored in config.txt
+
+    Returns:
+        True if every part of the source is a .zip file
+    """
+    return all(part.lower().endswith('.zip') for part in directory.split(ZIP_SEPARATOR))
+
+
+def archive_parts(directory):
+    """Returns the absolute paths of the archives of a data source"""
+    return [abspath(part) for part in directory.split(ZIP_SEPARATOR)]
+
+
+# ZipFile objects are per thread (their file position is shared state) and per
+# process (a forked worker must not share its parent's file offset)
+_local = threading.local()
+
+# (archive path, size, mtime) -> {conversation: [ZipMember, ...]}, per process
+_indexes = {}
+
+
+def _open_archive(path):
+    """Returns this thread's open ZipFile for an archive"""
+    archives = getattr(_local, 'archives', None)
+    if archives is None or _local.pid != getpid():
+        archives = _local.archives = {}
+        _local.pid = getpid()
+    archive = archives.get(path)
+    if archive is None:
+        archive = archives[path] = zipfile.ZipFile(path)
+    return archive
+
+
+def _archive_index(path):
+    """
+    Groups the JSON members of an archive by conversation, reading only its central directory
+
+    Returns:
+        Dict of conversation name -> list of ZipMember, in archive order
+    """
+    file_stat = stat(path)
+    key = (path, file_stat.st_size, file_stat.st_mtime_ns)
+    index = _indexes.get(key)
+    if index is None:
+        index = {}
+        for info in _open_archive(path).infolist():
+            match = _CONVERSATION_MEMBER.search(info.filename)
+            if match is not None:
+                index.setdefault(match.group(1), []).append(
+                    ZipMember(path, info.filename, info.file_size, info.CRC)
+                )
+        _indexes[key] = index
+    return index
+
+
+def list_conversations(directory):
+    """
+    Lists the conversation folders of a data source
+
+    Args:
+        directory: Data source string, as stored in config.txt
+
+    Returns:
+        List of conversation names (including 'e2e' if present)
+    """
+    if not is_archive(directory):
+        return listdir(directory)
+    conversations = {}
+    for path in archive_parts(directory):
+        conversations.update(dict.fromkeys(_archive_index(path)))
+    return list(conversations)
+
+
+def list_files(directory, conversation):
+    """
+    Lists the JSON files of a conversation
+
+    Args:
+        directory: Data source string, as stored in config.txt
+        conversation: Conversation folder name
+
+    Returns:
+        List of file paths (directories) or ZipMember (archives)
+    """
+    if not is_archive(directory):
+        return glob.glob(f'{directory}{conversation}/*.json')
+    return [
+        member for path in archive_parts(directory) for member in _archive_index(path).get(conversation, ())
+    ]
+
+
+def file_identity(file):
+    """
+    Identifies a file for the column store and the ingestion cache
+
+    Archive members are identified by their CRC-32 instead of a
+    modification time, so re-downloading an unchanged export still hits
+    the cache.
+
+    Args:
+        file: File path or ZipMember
+
+    Returns:
+        (key, size, mtime) tuple
+    """
+    if isinstance(file, ZipMember):
+        return f'{file.archive}!/{file.name}', file.size, file.crc
+    path = abspath(file)
+    file_stat = stat(path)
+    return path, file_stat.st_size, file_stat.st_mtime_ns
+
+
+def file_size(file):
+    """Returns the (uncompressed) size of a file in bytes"""
+    return file.size if isinstance(file, ZipMember) else stat(file).st_size
+
+
+def open_binary(file):
+    """
+    Opens a file for reading, decompressing archive members on the fly
+
+    Args:
+        file: File path or ZipMember
+
+    Returns:
+        Binary file object
+    """
+    if isinstance(file, ZipMember):
+        return _open_archive(file.archive).open(file.name)
+    return open(file, 'rb')
@@ -0,0 +1,131 @@
+"""
+Event-loop stall watchdog for CounterForMessenger
+
+Anything slow running on the Tk thread (sorting or re-striping a large
+treeview, theming, inserting rows) freezes the whole window. The watchdog
+measures how long: a heartbeat scheduled with after() notes when it runs,
+and a monitor thread notices when the heartbeat is late. Once it is later
+than the threshold, the monitor captures the main thread's stack, showing
+what the event loop is stuck in; when the heartbeat finally runs, the stall
+is logged with its duration and that stack.
+
+Every heartbeat delay is counted in a histogram, shown (with the last
+stalls) by the stalls popup of the settings. The threshold defaults to
+200 ms and can be changed with the CFM_STALL_THRESHOLD_MS environment
+variable.
+"""
+import sys
+import threading
+import traceback
+from bisect import bisect_left
+from collections import deque
+from os import environ
+from time import perf_counter
+
+# Environment variable overriding the stall threshold, in milliseconds
+THRESHOLD_VARIABLE = 'CFM_STALL_THRESHOLD_MS'
+DEFAULT_THRESHOLD_MS = 200
+
+# Milliseconds between two heartbeats
+HEARTBEAT_MS = 50
+
+# Upper bounds of the histogram buckets in seconds, the last bucket is open-ended
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5)
+
+# Number of stalls (with their stacks) kept for display
+KEPT_STALLS = 20
+
+
+def threshold_from_environment():
+    """Returns the stall threshold in seconds, from CFM_STALL_THRESHOLD_MS or the default"""
+    try:
+        milliseconds = int(environ.get(THRESHOLD_VARIABLE, DEFAULT_THRESHOLD_MS))
+    except ValueError:
+        print(f"Invalid {THRESHOLD_VARIABLE}, using {DEFAULT_THRESHOLD_MS} ms")
+        milliseconds = DEFAULT_THRESHOLD_MS
+    return max(1, milliseconds) / 1000
+
+
+class StallWatchdog:
+    """Measures the latency of a Tk event loop and records its stalls"""
+
+    def __init__(self, window, threshold=None, interval_ms=HEARTBEAT_MS):
+        """
+        Must be created on the thread running the event loop.
+
+        Args:
+            window: Tk widget whose after() schedules the heartbeat
+            threshold: Heartbeat delay in seconds that counts as a stall, None
+                for CFM_STALL_THRESHOLD_MS or the default
+            interval_ms: Milliseconds between two heartbeats
+        """
+        self.window = window
+        self.threshold = threshold if threshold is not None else threshold_from_environment()
+        self.interval_ms = interval_ms
+        self.interval = interval_ms / 1000
+        # Heartbeat delays per bucket of BUCKETS
+        self.histogram = [0] * (len(BUCKETS) + 1)
+        # (duration, stack or None) of the last stalls
+        self.stalls = deque(maxlen=KEPT_STALLS)
+        self._main_thread_id = threading.get_ident()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._last_beat = perf_counter()
+        # Main thread stack captured during the ongoing stall
+        self._stack = None
+
+    def start(self):
+        """Schedules the first heartbeat and starts the monitor thread"""
+        self._last_beat = perf_counter()
+        self.window.after(self.interval_ms, self._beat)
+        threading.Thread(target=self._monitor, name='stall-watchdog', daemon=True).start()
+
+    def stop(self):
+        """Stops the heartbeat and the monitor thread"""
+        self._stopped.set()
+
+    def _beat(self):
+        """Heartbeat, runs on the event loop: records how late it ran and schedules the next one"""
+        now = perf_counter()
+        with self._lock:
+            delay = max(0.0, now - self._last_beat - self.interval)
+            self._last_beat = now
+            stack, self._stack = self._stack, None
+        self.record(delay, stack)
+        if not self._stopped.is_set():
+            self.window.after(self.interval_ms, self._beat)
+
+    def record(self, delay, stack=None):
+        """
+        Counts a heartbeat delay, logging it if it's a stall
+
+        Args:
+            delay: Seconds the heartbeat ran late
+            stack: Main thread stack captured during the stall, if any
+        """
+        self.histogram[bisect_left(BUCKETS, delay)] += 1
+        if delay >= self.threshold:
+            self.stalls.append((delay, stack))
+            print(f"Event loop stalled for {delay:.3f}s" + (f" in:\n{stack}" if stack else ""))
+
+    def _monitor(self):
+        """Monitor thread: captures the main thread's stack once the heartbeat is late"""
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                if self._stack is None and perf_counter() - self._last_beat - self.interval >= self.threshold:
+                    self._stack = self._capture_stack()
+
+    def _capture_stack(self):
+        """Returns the formatted stack of the event loop thread, None if it's gone"""
+        frame = sys._current_frames().get(self._main_thread_id)
+        return ''.join(traceback.format_stack(frame)) if frame is not None else None
+
+    def histogram_lines(self):
+        """Returns one line of text per histogram bucket, for display"""
+        lines = []
+        lower = 0
+        for upper, count in zip(BUCKETS + (None,), self.histogram):
+            label = f'{lower * 1000:.0f}-{upper * 1000:.0f} ms' if upper is not None else f'> {lower * 1000:.0f} ms'
+            lines.append(f'{label}: {count}')
+            lower = upper
+        return lines
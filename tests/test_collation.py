@@ -0,0 +1,57 @@
+import locale
+import unittest
+from unittest.mock import patch
+
+import collation
+from collation import Collator, fold, set_collation_locale
+from row_model import RowModel
+
+
+class TestCollation(unittest.TestCase):
+    def test_fold(self):
+        self.assertEqual(fold('Émile'), 'emile')
+        self.assertEqual(fold('ZAŻÓŁĆ'), 'zazołc')
+        self.assertEqual(fold('Straße'), 'strasse')
+        # Compatibility forms are decomposed too
+        self.assertEqual(fold('ﬁle'), 'file')
+
+    def test_fold_order_ignores_case_and_accents(self):
+        names = ['Zoe', 'émile', 'Adam', 'Émile', 'bob']
+        self.assertEqual(sorted(names, key=Collator().key), ['Adam', 'bob', 'émile', 'Émile', 'Zoe'])
+
+    def test_unknown_language_or_locale_falls_back_to_fold(self):
+        with patch.object(locale, 'setlocale') as setlocale:
+            self.assertIsNone(set_collation_locale('Klingon'))
+        setlocale.assert_not_called()
+        with patch.object(locale, 'setlocale', side_effect=locale.Error):
+            self.assertIsNone(set_collation_locale('Polski'))
+        collator = Collator(None)
+        self.assertEqual(collator.key('Łukasz'), 'łukasz')
+
+    def test_collator_leaves_the_locale_alone(self):
+        with patch.object(locale, 'setlocale') as setlocale:
+            Collator('pl_PL.UTF-8').key('Ą')
+        setlocale.assert_not_called()
+
+    def test_locale_keys_use_strxfrm(self):
+        with patch.object(locale, 'setlocale', return_value='pl_PL.UTF-8'):
+            self.assertEqual(set_collation_locale('Polski'), 'pl_PL.UTF-8')
+        with patch.object(collation.locale, 'strxfrm', side_effect=lambda text: f'<{text}>') as strxfrm:
+            collator = Collator('pl_PL.UTF-8')
+            # Casefolded and normalized like fold(), with the accents kept for the locale
+            self.assertEqual(collator.key('ĄﬁSS'), '<ąfiss>')
+            self.assertEqual(collator.key('A\u0328'), '<ą>')
+            # Cached per text
+            collator.key('ĄﬁSS')
+            self.assertEqual(strxfrm.call_count, 2)
+
+    def test_row_model_sorts_collated(self):
+        model = RowModel(Collator())
+        for row, title in enumerate(['Zoe', 'Émile', 'adam']):
+            model.set_row(row, (title, set(), 'Private chat', 1))
+        model.sort([('name', False)])
+        self.assertEqual(model.order, [2, 1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
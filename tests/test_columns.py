@@ -0,0 +1,84 @@
+import random
+import shutil
+import unittest
+
+import extraction
+from columns import ASCENDING, DESCENDING, UNSORTED, ColumnStore, FileColumns
+from tests.test_extraction import OPTIONS, make_inbox
+
+# Date ranges cutting through the sample conversations
+RANGES = [(0, 10 ** 13), (1627996429313, 1628000000000), (1649500490000, 1649500512000), (0, 1)]
+
+
+class TestColumnStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir, self.inbox = make_inbox()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_new_date_range_is_answered_from_memory(self):
+        store = ColumnStore()
+        extraction.extract_all_conversations(self.inbox, OPTIONS, store=store)
+
+        original_read = extraction.read_columns
+        extraction.read_columns = lambda *args: self.fail('stored file was re-read')
+        try:
+            stored = [
+                extraction.extract_all_conversations(self.inbox, OPTIONS._replace(start_ts=start, end_ts=end), store=store)
+                for start, end in RANGES
+            ]
+        finally:
+            extraction.read_columns = original_read
+
+        for (start, end), results in zip(RANGES, stored):
+            fresh = extraction.extract_all_conversations(self.inbox, OPTIONS._replace(start_ts=start, end_ts=end))
+            self.assertEqual(results, fresh)
+
+    def test_parallel_fills_store(self):
+        store = ColumnStore()
+        serial = extraction.extract_all_conversations(self.inbox, OPTIONS)
+        self.assertEqual(extraction.extract_all_conversations(self.inbox, OPTIONS, workers=2, store=store), serial)
+        self.assertEqual(len(store.files), 6)
+        self.assertEqual(extraction.extract_all_conversations(self.inbox, OPTIONS, workers=2, store=store), serial)
+
+
+def make_columns(timestamps):
+    """Builds columns with one message per timestamp, alternating between two senders"""
+    columns = FileColumns('title', ['A', 'B'], False)
+    columns.senders = ['A', 'B']
+    for index, timestamp in enumerate(timestamps):
+        columns.timestamps.append(timestamp)
+        columns.sender_ids.append(index % 2)
+        columns.chars.append(index % 7 - 1)
+        columns.call_durations.append(index % 3)
+        columns.photos.append(index % 2)
+        columns.gifs.append(0)
+        columns.videos.append(index % 5 == 0)
+        columns.files.append(0)
+    columns.detect_order()
+    return columns
+
+
+class TestSortedWindow(unittest.TestCase):
+    def test_order_detection(self):
+        self.assertEqual(make_columns([5, 3, 3, 1]).order, DESCENDING)
+        self.assertEqual(make_columns([1, 3, 3, 5]).order, ASCENDING)
+        self.assertEqual(make_columns([3, 1, 5]).order, UNSORTED)
+
+    def test_binary_search_matches_full_scan(self):
+        rng = random.Random(1)
+        timestamps = sorted(rng.randrange(1000) for _ in range(300))
+        for ordered in (timestamps, timestamps[::-1]):
+            columns = make_columns(ordered)
+            self.assertNotEqual(columns.order, UNSORTED)
+            for start, end in [(0, 1000), (-5, 0), (1000, 2000), (250, 250), (300, 200)] + [
+                    sorted((rng.randrange(-10, 1010), rng.randrange(-10, 1010))) for _ in range(50)]:
+                sorted_stats = columns.summarize(start, end)
+                columns.order = UNSORTED
+                self.assertEqual(sorted_stats, columns.summarize(start, end))
+                columns.detect_order()
+
+
+if __name__ == '__main__':
+    unittest.main()
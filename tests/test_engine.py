@@ -0,0 +1,79 @@
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+from contextlib import redirect_stderr
+from datetime import date
+from unittest.mock import patch
+
+import engine
+import extraction
+from tests.test_extraction import OPTIONS, make_inbox
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestEngine(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir, self.inbox = make_inbox()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_does_not_import_gui(self):
+        code = 'import sys, engine; print(any(name in sys.modules for name in ("tkinter", "PIL")))'
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+    def test_engine_matches_extraction(self):
+        analysis = engine.AnalysisEngine(self.inbox, 'John Doe', engine.DEFAULT_FROM_DATE, date.today(),
+                                         'Group chat', 'Private chat', cache_path=None, json_backend='stdlib')
+        options = analysis.options()
+        self.assertEqual(analysis.extract_all_conversations(),
+                         extraction.extract_all_conversations(self.inbox, options))
+        self.assertEqual(analysis.extract_e2e_data(), extraction.extract_e2e_data(self.inbox, options))
+
+    def test_streaming_leaves_the_message_index_to_the_caller(self):
+        index_path = os.path.join(self.temp_dir, 'messages.sqlite3')
+        analysis = engine.AnalysisEngine(self.inbox, 'John Doe', engine.DEFAULT_FROM_DATE, date.today(),
+                                         'Group chat', 'Private chat', cache_path=None, json_backend='stdlib',
+                                         index_path=index_path)
+        changes = [change for batch, _, _ in analysis.stream_conversations() for change in batch]
+        self.assertEqual(len({change[0] for change in changes}), 5)
+        self.assertFalse(os.path.exists(index_path))
+        self.assertEqual(analysis.update_message_index(), 6)
+
+    def test_command_line_writes_json(self):
+        output = os.path.join(self.temp_dir, 'results.json')
+        with redirect_stderr(io.StringIO()) as stderr:
+            exit_code = engine.main([self.inbox, '--username', 'John Doe', '--no-cache', '-o', output])
+        self.assertEqual(exit_code, 0)
+        self.assertIn('5 conversations', stderr.getvalue())
+        with open(output, encoding='utf-8') as f:
+            records = json.load(f)
+        expected = extraction.extract_all_conversations(self.inbox, OPTIONS)
+        self.assertEqual([record['title'] for record in records], [conversation[0] for conversation in expected])
+        self.assertEqual([record['messages'] for record in records], [conversation[3] for conversation in expected])
+        self.assertEqual(records[0]['participants'], dict(expected[0][1]))
+
+    def test_command_line_reports_the_json_backend(self):
+        report = os.path.join(self.temp_dir, 'report.json')
+        with redirect_stderr(io.StringIO()):
+            engine.main([self.inbox, '--no-cache', '--json-backend', 'stdlib', '--report', report,
+                         '-o', os.path.join(self.temp_dir, 'results.json')])
+        with open(report, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['json_backend'], 'stdlib')
+
+        # An unknown backend in the environment is a usage error, not a traceback
+        with patch.dict(os.environ, {'CFM_JSON_BACKEND': 'nope'}), redirect_stderr(io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit) as raised:
+                engine.main([self.inbox, '--no-cache'])
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn("Unknown JSON backend 'nope'", stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import extraction
+from extraction import ExtractOptions
+
+SAMPLE_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'SampleData')
+
+OPTIONS = ExtractOptions(0, 10 ** 13, 'John Doe', 'Group chat', 'Private chat')
+
+
+def make_inbox():
+    """Copies SampleData into a temporary inbox and adds an e2e folder to it"""
+    directory = tempfile.mkdtemp()
+    inbox = os.path.join(directory, 'inbox')
+    shutil.copytree(SAMPLE_DATA, inbox)
+    os.mkdir(os.path.join(inbox, 'e2e'))
+    e2e_threads = {
+        # Matches the regular 'Emily Smith' private chat folder
+        'Emily Smith_1.json': 'Emily Smith_1',
+        'Someone Else_2.json': 'Someone Else_2',
+    }
+    for file_name, thread_name in e2e_threads.items():
+        with open(os.path.join(inbox, 'e2e', file_name), 'w', encoding='utf-8') as f:
+            json.dump({
+                'participants': ['John Doe', thread_name.split('_')[0]],
+                'threadName': thread_name,
+                'messages': [
+                    {'senderName': 'John Doe', 'timestamp': 1700000000000, 'text': 'Zażółć', 'media': [{}]},
+                    {'senderName': thread_name.split('_')[0], 'timestamp': 1700000001000, 'text': 'gęślą jaźń'},
+                ],
+            }, f, ensure_ascii=False)
+    return directory, f'{inbox}/'
+
+
+class TestExtractAllConversations(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir, self.inbox = make_inbox()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_serial_merges_e2e(self):
+        results = extraction.extract_all_conversations(self.inbox, OPTIONS)
+        titles = [conversation[0] for conversation in results]
+        self.assertEqual(len(results), 5)
+        self.assertEqual(titles.count('Someone Else'), 1)
+
+        # The e2e contact was merged into the existing private chat folder
+        emily = [conversation for conversation in results if conversation[0] == 'Emily Smith']
+        self.assertEqual(len(emily), 1)
+        regular = extraction.extract_data(self.inbox, 'emilyjohn_123456789', OPTIONS)
+        self.assertEqual(emily[0][3], regular[3] + 2)
+
+    def test_parallel_matches_serial(self):
+        serial = extraction.extract_all_conversations(self.inbox, OPTIONS, workers=1)
+        parallel = extraction.extract_all_conversations(self.inbox, OPTIONS, workers=2)
+        self.assertEqual(serial, parallel)
+
+    def test_progress_is_reported_per_folder(self):
+        calls = []
+        extraction.extract_all_conversations(self.inbox, OPTIONS, progress=lambda done, total: calls.append((done, total)))
+        self.assertEqual(calls, [(done, 5) for done in range(1, 6)])
+
+    def test_cancel_stops_extraction(self):
+        cancel = threading.Event()
+        cancel.set()
+        for workers in (1, 2):
+            with self.assertRaises(extraction.ExtractionCancelled):
+                extraction.extract_all_conversations(self.inbox, OPTIONS, workers, cancel=cancel)
+
+
+class TestSchemaKernels(unittest.TestCase):
+    def test_specialized_rows_match_generic(self):
+        legacy = [
+            {'sender_name': 'Ja\u00c5\u009b', 'timestamp_ms': 3, 'content': 'Za\u00c5\u00bc\u00c3\u00b3\u00c5\u0082\u00c4\u0087',
+             'photos': [{}, {}], 'call_duration': 12},
+            {'sender_name': 'John Doe', 'timestamp_ms': 2, 'content': 'plain', 'gifs': [{}], 'videos': [{}], 'files': [{}]},
+            {'sender_name': 'John Doe', 'timestamp_ms': 1},
+            {'sender_name': 'John Doe', 'timestamp_ms': 1, 'content': 5},
+            # Keys of the other schema are still read
+            {'sender_name': None, 'senderName': 'Ja\u00c5\u009b', 'timestamp_ms': 1, 'content': None, 'text': 'hi'},
+            {'senderName': 'John Doe', 'timestamp_ms': 1, 'text': 'Za\u00c5\u00bc'},
+            {'sender_name': 'John Doe', 'timestamp_ms': 1, 'text': None},
+            # A message of the other schema still goes through the generic path
+            {'senderName': 'Other', 'timestamp': 0, 'text': 'x'},
+        ]
+        camel_case = [
+            {'senderName': 'Jaś', 'timestamp': 3, 'text': 'Zażółć', 'media': [{}, {}]},
+            {'senderName': 'John Doe', 'timestamp': 2, 'text': None},
+            {'senderName': 'John Doe', 'timestamp': 1},
+            {'sender_name': 'Other', 'timestamp_ms': 0, 'content': 'x', 'photos': [{}]},
+        ]
+        for messages in (legacy, camel_case):
+            self.assertEqual(list(extraction._message_rows(messages)), list(extraction._generic_rows(messages)))
+        self.assertEqual(next(extraction._message_rows(legacy))[1:3], ('Jaś', 6))
+        self.assertEqual([row[1:3] for row in extraction._message_rows(legacy)][4:7],
+                         [('Jaś', 2), ('John Doe', 3), ('John Doe', -1)])
+        self.assertEqual(list(extraction._message_rows([])), [])
+
+
+def mojibake(text):
+    """Encodes text the way legacy exports do"""
+    return text.encode('utf-8').decode('latin1')
+
+
+class TestMojibakeRepair(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir, self.inbox = make_inbox()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def legacy_file(self, name, texts):
+        """Writes a legacy export whose messages have the given contents"""
+        file = os.path.join(self.temp_dir, name)
+        with open(file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'participants': [{'name': mojibake('Jaś Wiśniewski')}, {'name': 'John Doe'}],
+                'messages': [
+                    {'sender_name': mojibake('Jaś Wiśniewski') if index % 2 else 'John Doe',
+                     'timestamp_ms': 1700000000000 - index, 'content': text}
+                    for index, text in enumerate(texts)
+                ],
+                'title': mojibake('Jaś Wiśniewski 😂'),
+            }, f)
+        return file
+
+    def test_columns_are_repaired(self):
+        file = self.legacy_file('columns.json', [mojibake('Zażółć gęślą jaźń'), 'plain', '\\u00c5\\u009b literally', 'ą'])
+        for options in (OPTIONS, OPTIONS._replace(stream_min_bytes=0)):
+            columns = extraction.read_columns(file, options)
+            self.assertEqual(columns.title, 'Jaś Wiśniewski 😂')
+            self.assertEqual(columns.participants, ['Jaś Wiśniewski', 'John Doe'])
+            self.assertEqual(sorted(columns.senders), ['Jaś Wiśniewski', 'John Doe'])
+            # Repaired, escape sequences written out literally, text beyond Latin-1 kept as is
+            self.assertEqual(list(columns.chars), [17, 5, 22, 1])
+
+    def test_message_bodies_are_repaired(self):
+        file = self.legacy_file('bodies.json', [mojibake('Zażółć gęślą jaźń'), 'plain', '', None])
+        expected = [
+            (0, 1700000000000, 'John Doe', 'Zażółć gęślą jaźń'),
+            (1, 1699999999999, 'Jaś Wiśniewski', 'plain'),
+        ]
+        for options in (OPTIONS, OPTIONS._replace(stream_min_bytes=0)):
+            info = {}
+            self.assertEqual(list(extraction.iter_message_bodies(file, options, info)), expected)
+            self.assertEqual(info['title'], 'Jaś Wiśniewski 😂')
+
+
+class TestConversationMerger(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir, self.inbox = make_inbox()
+        self.folders = [
+            extraction.extract_data(self.inbox, folder, OPTIONS)
+            for folder in sorted(os.listdir(self.inbox)) if folder != 'e2e'
+        ]
+        self.e2e = extraction.extract_e2e_data(self.inbox, OPTIONS)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_arrival_order_does_not_change_rows(self):
+        folders_first = extraction.ConversationMerger(OPTIONS.private_label)
+        for data in self.folders:
+            folders_first.add_folder(data)
+        folders_first.add_e2e(self.e2e)
+
+        e2e_first = extraction.ConversationMerger(OPTIONS.private_label)
+        e2e_first.add_e2e(self.e2e)
+        changes = [change for data in self.folders for change in e2e_first.add_folder(data)]
+
+        key = lambda conversation: conversation[0]
+        self.assertEqual(sorted(folders_first.rows, key=key), sorted(e2e_first.rows, key=key))
+        # The late private chat updated the existing e2e row instead of adding one
+        updates = [change for change in changes if not change[2]]
+        self.assertEqual([change[1][0] for change in updates], ['Emily Smith'])
+
+    def test_group_chat_drops_e2e_contact(self):
+        group = ('Someone Else', {'A': 1, 'B': 1, 'C': 1}, OPTIONS.group_label) + (0,) * 9 + ({},)
+        rows = extraction.merge_all_conversations([group], self.e2e, OPTIONS.private_label)
+        self.assertEqual([row for row in rows if row[0] == 'Someone Else'], [group])
+
+        # Arriving after the contact, the group chat takes over its row
+        merger = extraction.ConversationMerger(OPTIONS.private_label)
+        merger.add_e2e(self.e2e)
+        changes = merger.add_folder(group)
+        self.assertEqual([change[1:] for change in changes], [(group, False)])
+        self.assertEqual(sorted(merger.rows, key=str), sorted(rows, key=str))
+
+    def test_only_the_first_folder_and_last_contact_of_a_name_merge(self):
+        contact = self.e2e[0]
+        other_case = (contact[0].upper(),) + contact[1:3] + (100,) + contact[4:]
+        first, second = (
+            (contact[0], {contact[0]: 1}, OPTIONS.private_label, messages) + (0,) * 8 + ({},)
+            for messages in (1, 2)
+        )
+        for e2e_first in (False, True):
+            merger = extraction.ConversationMerger(OPTIONS.private_label)
+            if e2e_first:
+                merger.add_e2e([contact, other_case])
+            merger.add_folder(first)
+            merger.add_folder(second)
+            if not e2e_first:
+                merger.add_e2e([contact, other_case])
+            self.assertEqual(sorted(row[3] for row in merger.rows), [2, 101])
+
+
+if __name__ == '__main__':
+    unittest.main()
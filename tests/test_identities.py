@@ -0,0 +1,65 @@
+import unittest
+
+import extraction
+from columns import ColumnStore, FileColumns
+from identities import IdentityTable, Tally, identities
+
+
+class TestIdentityTable(unittest.TestCase):
+    def test_intern_assigns_stable_ids(self):
+        table = IdentityTable()
+        first = table.intern('Jaś Wiśniewski')
+        self.assertEqual(table.intern('John Doe'), first + 1)
+        self.assertEqual(table.intern('Jaś Wiśniewski'), first)
+        self.assertEqual(table.key(first), 'jaś wiśniewski')
+        self.assertEqual(table.to_names({first + 1: 3, first: 1}), {'John Doe': 3, 'Jaś Wiśniewski': 1})
+
+    def test_normalize_name_is_memoized(self):
+        identity = identities.intern('  Emily SMITH ')
+        self.assertEqual(extraction.normalize_name('  Emily SMITH '), 'emily smith')
+        self.assertEqual(identities.keys[identity], 'emily smith')
+        # Chat titles aren't interned
+        self.assertEqual(extraction.normalize_name(' Weekend TRIP'), 'weekend trip')
+        self.assertNotIn(' Weekend TRIP', identities.ids)
+        self.assertIsNone(extraction.normalize_name(None))
+
+    def test_tally_keeps_first_seen_order(self):
+        table = IdentityTable()
+        alice, bob = table.intern('Alice'), table.intern('Bob')
+        tally = Tally(table)
+        tally.add_participant(bob)
+        tally.add_messages(alice, 2)
+        tally.add_chars(alice, 10)
+        # Interned after the tally was created
+        carol = table.intern('Carol')
+        tally.add_messages(carol, 1)
+        tally.add_messages(alice, 1)
+        self.assertEqual(tally.message_names(), {'Bob': 0, 'Alice': 3, 'Carol': 1})
+        self.assertEqual(tally.char_names(), {'Alice': 10})
+        self.assertEqual(tally.sent(alice), 3)
+        self.assertEqual(tally.sent(table.intern('Dave')), 0)
+
+    def test_tally_only_holds_its_own_people(self):
+        table = IdentityTable()
+        for number in range(1000):
+            table.intern(f'Person {number}')
+        tally = Tally(table)
+        tally.add_messages(table.intern('Person 999'), 2)
+        tally.add_chars(table.intern('Person 5'), 7)
+        self.assertEqual((len(tally.messages), len(tally.chars), len(tally.flags)), (2, 2, 2))
+        self.assertEqual(tally.message_names(), {'Person 999': 2})
+        self.assertEqual(tally.char_names(), {'Person 5': 7})
+
+    def test_cleared_with_the_column_store(self):
+        columns = FileColumns('Chat', ['Alice', 'Bob'], False)
+        columns._identity_ids()
+        store = ColumnStore()
+        store.clear()
+        self.assertEqual(len(identities), 0)
+        # Ids cached before the clear are interned again
+        self.assertEqual(columns._identity_ids()[0], [0, 1])
+        self.assertEqual(identities.names, ['Alice', 'Bob'])
+
+
+if __name__ == '__main__':
+    unittest.main()
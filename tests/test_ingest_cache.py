@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import extraction
+import ingest_cache
+from ingest_cache import IngestCache
+from tests.test_extraction import OPTIONS, make_inbox
+
+
+class TestIngestCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir, self.inbox = make_inbox()
+        self.cache_path = os.path.join(self.temp_dir, 'cache', 'ingest.sqlite3')
+        self.options = OPTIONS._replace(cache_path=self.cache_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_cached_results_match_uncached(self):
+        uncached = extraction.extract_all_conversations(self.inbox, OPTIONS)
+        first = extraction.extract_all_conversations(self.inbox, self.options)
+        second = extraction.extract_all_conversations(self.inbox, self.options)
+        self.assertEqual(uncached, first)
+        self.assertEqual(uncached, second)
+
+    def test_unchanged_file_is_not_rescanned(self):
+        file = os.path.join(self.inbox, 'group1_4437375262993687', 'messages.json')
+        extraction.load_columns(file, self.options)
+        extraction._flush_cache(self.options)
+
+        original_read = extraction.read_columns
+        extraction.read_columns = lambda *args: self.fail('unchanged file was re-read')
+        try:
+            extraction.load_columns(file, self.options)
+        finally:
+            extraction.read_columns = original_read
+
+    def test_modified_file_is_rescanned(self):
+        file = os.path.join(self.inbox, 'group1_4437375262993687', 'messages.json')
+        before = extraction.load_columns(file, self.options)
+        extraction._flush_cache(self.options)
+
+        with open(file, 'w', encoding='utf-8') as f:
+            f.write('{"participants": [{"name": "A"}], "messages": [], "title": "renamed"}')
+        after = extraction.load_columns(file, self.options)
+        self.assertNotEqual(before.title, after.title)
+        self.assertEqual(after.title, 'renamed')
+
+    def test_version_change_discards_entries(self):
+        cache = IngestCache(self.cache_path)
+        cache.put('/some/file.json', 1, 1, 'value')
+        cache.flush()
+        self.assertEqual(cache.get('/some/file.json', 1, 1), 'value')
+        cache.close()
+
+        original_version = ingest_cache.CACHE_VERSION
+        ingest_cache.CACHE_VERSION = original_version + 1
+        try:
+            cache = IngestCache(self.cache_path)
+            self.assertIsNone(cache.get('/some/file.json', 1, 1))
+            cache.close()
+        finally:
+            ingest_cache.CACHE_VERSION = original_version
+
+    def test_evict_keeps_most_recently_used(self):
+        cache = IngestCache(self.cache_path, max_bytes=0)
+        cache.put('/old.json', 1, 1, 'x' * 100)
+        cache.flush()
+        cache.put('/new.json', 1, 1, 'y' * 100)
+        cache.flush()
+        cache.max_bytes = 150
+        cache.evict()
+        self.assertIsNone(cache.get('/old.json', 1, 1))
+        self.assertEqual(cache.get('/new.json', 1, 1), 'y' * 100)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
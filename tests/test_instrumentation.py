@@ -0,0 +1,51 @@
+import json
+import os
+import shutil
+import unittest
+
+import extraction
+import instrumentation
+from tests.test_extraction import OPTIONS, make_inbox
+
+
+class TestIngestReport(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir, self.inbox = make_inbox()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_records_phases_and_counters(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                conversations = extraction.extract_all_conversations(self.inbox, OPTIONS, workers)
+                report = instrumentation.current().to_dict()
+
+                self.assertIsNotNone(report['wall_seconds'])
+                for phase in ('listdir', 'read', 'parse', 'build', 'filter', 'merge'):
+                    self.assertIn(phase, report['phases'])
+                counters = report['counters']
+                # Four sample folders with one file each, plus the two e2e files
+                self.assertEqual(counters['files_read'], 6)
+                self.assertGreater(counters['bytes_read'], 0)
+                self.assertEqual(counters['messages_matched'], sum(conversation[3] for conversation in conversations))
+                self.assertGreaterEqual(counters['messages_scanned'], counters['messages_matched'])
+                self.assertEqual(report['largest'][0]['messages'], 10)
+                self.assertEqual(len(report['slowest']), 5)
+
+    def test_date_filter_counts(self):
+        extraction.extract_all_conversations(self.inbox, OPTIONS._replace(start_ts=1700000000500))
+        counters = instrumentation.current().to_dict()['counters']
+        self.assertEqual(counters['messages_matched'], 2)
+        self.assertGreater(counters['messages_scanned'], 2)
+
+    def test_write_json(self):
+        extraction.extract_all_conversations(self.inbox, OPTIONS)
+        path = os.path.join(self.temp_dir, 'report.json')
+        instrumentation.current().write_json(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), instrumentation.current().to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import shutil
+import unittest
+from unittest import mock
+
+import extraction
+import json_backend
+from tests.test_extraction import OPTIONS, make_inbox
+
+
+class TestJsonBackend(unittest.TestCase):
+    def test_backends_give_identical_results(self):
+        temp_dir, inbox = make_inbox()
+        try:
+            expected = extraction.extract_all_conversations(inbox, OPTIONS)
+            for backend in json_backend.available_backends():
+                results = extraction.extract_all_conversations(inbox, OPTIONS._replace(json_backend=backend))
+                self.assertEqual(results, expected, backend)
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_refused_documents_fall_back_to_stdlib(self):
+        for backend in json_backend.available_backends():
+            self.assertEqual(json_backend.loads(b'{"text": "cut \\ud83d"}', backend), {'text': 'cut \ud83d'})
+
+    def test_resolve_backend(self):
+        self.assertEqual(json_backend.resolve_backend('stdlib'), 'stdlib')
+        self.assertEqual(json_backend.resolve_backend('auto'), json_backend.available_backends()[0])
+        with mock.patch.dict(os.environ, {json_backend.BACKEND_VARIABLE: 'STDLIB'}):
+            self.assertEqual(json_backend.resolve_backend(), 'stdlib')
+            # The environment variable wins over the configured backend
+            self.assertEqual(json_backend.resolve_backend(default='orjson'), 'stdlib')
+        with mock.patch.dict(os.environ):
+            os.environ.pop(json_backend.BACKEND_VARIABLE, None)
+            self.assertEqual(json_backend.resolve_backend(default='stdlib'), 'stdlib')
+        with self.assertRaises(ValueError):
+            json_backend.resolve_backend('simdjson')
+
+
+if __name__ == '__main__':
+    unittest.main()
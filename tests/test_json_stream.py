@@ -0,0 +1,77 @@
+import glob
+import io
+import json
+import os
+import shutil
+import unittest
+
+import extraction
+from json_stream import iter_object
+from tests.test_extraction import OPTIONS, SAMPLE_DATA, make_inbox
+
+
+def materialize(items):
+    """Turns the (key, value) pairs of iter_object() into a plain dict"""
+    return {key: list(value) if key == 'messages' else value for key, value in items}
+
+
+class TestIterObject(unittest.TestCase):
+    def test_matches_json_load_on_sample_data(self):
+        for file in glob.glob(os.path.join(SAMPLE_DATA, '*', '*.json')):
+            with open(file, 'r', encoding='utf-8') as f:
+                expected = json.load(f)
+            # Tiny chunks force every token to straddle a buffer boundary
+            for chunk_size in (1, 7, 4096):
+                with open(file, 'r', encoding='utf-8') as f:
+                    self.assertEqual(materialize(iter_object(f, chunk_size=chunk_size)), expected)
+
+    def test_numbers_split_across_chunks(self):
+        document = '{"messages": [{"timestamp_ms": 1628073565366}, 12345678901234, 1.5e3, -2.25, 7E-2], "n": -0.5}'
+        for chunk_size in range(1, len(document) + 1):
+            result = materialize(iter_object(io.StringIO(document), chunk_size=chunk_size))
+            self.assertEqual(result, json.loads(document))
+
+    def test_empty_containers(self):
+        self.assertEqual(materialize(iter_object(io.StringIO(' { } '))), {})
+        self.assertEqual(materialize(iter_object(io.StringIO('{"messages": [ ]}'))), {'messages': []})
+
+    def test_unconsumed_array_is_skipped(self):
+        document = '{"messages": [1, [2, 3], {"a": "]"}], "title": "t"}'
+        keys = [key for key, _ in iter_object(io.StringIO(document), chunk_size=3)]
+        self.assertEqual(keys, ['messages', 'title'])
+
+    def test_messages_are_streamed(self):
+        document = '{"messages": [' + ', '.join(['{"content": "%s"}' % ('x' * 100)] * 1000) + ']}'
+        stream = io.StringIO(document)
+        _, messages = next(iter_object(stream, chunk_size=256))
+        next(messages)
+        # Only a small part of the document has been read to produce the first message
+        self.assertLess(stream.tell(), 1024)
+
+    def test_malformed_document_raises(self):
+        with self.assertRaises(ValueError):
+            materialize(iter_object(io.StringIO('{"messages": [1, 2'), chunk_size=4))
+
+
+class TestStreamingScan(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir, self.inbox = make_inbox()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_streaming_matches_eager(self):
+        streaming = OPTIONS._replace(stream_min_bytes=0)
+        for file in glob.glob(os.path.join(self.inbox, '*', '*.json')):
+            self.assertEqual(
+                extraction.read_columns(file, OPTIONS).summarize(OPTIONS.start_ts, OPTIONS.end_ts),
+                extraction.read_columns(file, streaming).summarize(OPTIONS.start_ts, OPTIONS.end_ts)
+            )
+        self.assertEqual(
+            extraction.extract_all_conversations(self.inbox, OPTIONS),
+            extraction.extract_all_conversations(self.inbox, streaming)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
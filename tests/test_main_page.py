@@ -30,6 +30,8 @@ class DummyScrollbar:
 class DummyTreeview:
     def __init__(self, *args, **kwargs):
         pass
+    def cget(self, option):
+        return 20
     def column(self, *args, **kwargs):
         pass
     def heading(self, *args, **kwargs):
@@ -141,76 +143,76 @@ class TestMainPageSearch(unittest.TestCase):
         # Instantiate MainPage
         self.page = self.main_page_module.MainPage(MagicMock(), self.controller)
 
-        # Mock the treeview attribute on the instance
-        self.page.treeview = MagicMock()
+        # Mock the table rendering the row model, and the search entry
+        self.page.table = MagicMock()
         self.page.search_entry = MagicMock()
 
+    def add_rows(self, *rows):
+        for index, (title, people, room, messages) in enumerate(rows):
+            self.page.rows.set_row(index, (title, people, room, messages, 0, 0, 0, 0, 0, 0, f'<@!PREFIX>all#{index}'))
+
     def tearDown(self):
         self.modules_patcher.stop()
 
     def test_search_found(self):
         print("Running test_search_found")
-        self.page.treeview.get_children.return_value = ['item1', 'item2', 'item3']
-
-        def get_item(item_id):
-            if item_id == 'item1':
-                return {'values': ['Alice', 'Group', 10]}
-            elif item_id == 'item2':
-                return {'values': ['Bob', 'Private', 5]}
-            elif item_id == 'item3':
-                return {'values': ['Charlie', 'Group', 20]}
-            return {}
-
-        self.page.treeview.item.side_effect = get_item
+        self.add_rows(
+            ('Alice', {'Alice', 'Me'}, 'Private', 10),
+            ('Bob', {'Bob', 'Me'}, 'Private', 5),
+            ('Charlie', {'Charlie', 'Me'}, 'Group', 20),
+        )
         self.page.search_entry.get.return_value = 'Alice'
 
         self.page.search()
 
-        self.page.treeview.selection_set.assert_called_with(['item1'])
+        self.assertEqual(self.page.rows.selection, {0})
+        self.page.table.see.assert_called_with(0)
 
     def test_search_partial(self):
         print("Running test_search_partial")
-        self.page.treeview.get_children.return_value = ['item1', 'item2']
-
-        def get_item(item_id):
-            if item_id == 'item1':
-                return {'values': ['Superman', 'Group', 10]}
-            elif item_id == 'item2':
-                return {'values': ['Batman', 'Private', 5]}
-            return {}
-        self.page.treeview.item.side_effect = get_item
+        self.add_rows(('Superman', {'Clark'}, 'Group', 10), ('Batman', {'Bruce'}, 'Private', 5))
         self.page.search_entry.get.return_value = 'man'
 
         self.page.search()
 
-        self.page.treeview.selection_set.assert_called_with(['item1', 'item2'])
-
-    def test_search_numeric(self):
-        print("Running test_search_numeric")
-        self.page.treeview.get_children.return_value = ['item1', 'item2']
+        self.assertEqual(self.page.rows.selection, {0, 1})
 
-        def get_item(item_id):
-            if item_id == 'item1':
-                return {'values': ['Alice', 'Group', 12345]}
-            elif item_id == 'item2':
-                return {'values': ['Bob', 'Private', 67890]}
-            return {}
-        self.page.treeview.item.side_effect = get_item
-        self.page.search_entry.get.return_value = '123'
+    def test_search_participants_case_and_accents(self):
+        print("Running test_search_participants_case_and_accents")
+        self.add_rows(('Team', {'Émile Zola', 'Me'}, 'Group', 10), ('Bob', {'Bob', 'Me'}, 'Private', 5))
+        self.page.search_entry.get.return_value = 'EMILE'
 
         self.page.search()
 
-        self.page.treeview.selection_set.assert_called_with(['item1'])
+        self.assertEqual(self.page.rows.selection, {0})
+
+    def test_search_ignores_counts_and_ids(self):
+        print("Running test_search_ignores_counts_and_ids")
+        self.add_rows(('Alice', {'Alice'}, 'Group', 12345), ('Bob', {'Bob'}, 'Private', 67890))
+
+        for query in ('123', 'PREFIX', 'all#1'):
+            self.page.search_entry.get.return_value = query
+            self.page.search()
+            self.assertEqual(self.page.rows.selection, set())
 
     def test_search_not_found(self):
         print("Running test_search_not_found")
-        self.page.treeview.get_children.return_value = ['item1']
-        self.page.treeview.item.return_value = {'values': ['Alice', 'Group', 10]}
+        self.add_rows(('Alice', {'Alice'}, 'Group', 10))
         self.page.search_entry.get.return_value = 'Bob'
 
         self.page.search()
 
-        self.page.treeview.selection_set.assert_called_with([])
+        self.assertEqual(self.page.rows.selection, set())
+        self.page.table.refresh.assert_called()
+
+    def test_search_placeholder(self):
+        print("Running test_search_placeholder")
+        self.add_rows(('Search party', {'Alice'}, 'Group', 10))
+        self.page.search_entry.get.return_value = 'Search'
+
+        self.page.search()
+
+        self.assertEqual(self.page.rows.selection, set())
 
 if __name__ == '__main__':
     unittest.main()
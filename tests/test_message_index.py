@@ -0,0 +1,97 @@
+import os
+import shutil
+import threading
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from io import StringIO
+
+import extraction
+from message_index import MessageIndex, make_snippet, match_expression, period_expression, query_words
+from tests.test_extraction import OPTIONS, make_inbox
+
+
+def ms(year, month, day):
+    """Returns the UTC timestamp of a day in milliseconds"""
+    return datetime(year, month, day, tzinfo=timezone.utc).timestamp() * 1000
+
+
+class TestQueries(unittest.TestCase):
+    def test_match_expression(self):
+        self.assertEqual(match_expression('hello "big world" pre*'), '"hello" AND "big world" AND "pre" *')
+        # Punctuation and quotes never reach FTS5 as syntax
+        self.assertEqual(match_expression('a:b "unterminated'), '"a:b" AND "unterminated"')
+        self.assertEqual(match_expression('say "hi""'), '"say" AND "hi"')
+        self.assertIsNone(match_expression(' * "" '))
+
+    def test_period_expression(self):
+        self.assertEqual(period_expression(ms(2022, 11, 5), ms(2024, 2, 1)), 'm202211 OR m202212 OR y2023 OR m202401')
+        self.assertEqual(period_expression(ms(2023, 3, 1), ms(2023, 3, 2)), 'm202303')
+        self.assertIsNone(period_expression(ms(2023, 3, 2), ms(2023, 3, 1)))
+
+    def test_snippet(self):
+        words, prefixes = query_words('JAZN "Zoë" pre*')
+        self.assertEqual(words, {'jazn', 'zoe'})
+        self.assertEqual(prefixes, ('pre',))
+        self.assertEqual(make_snippet('Zoë: gęślą jaźń, prefix!', words, prefixes), '[Zoë]: gęślą [jaźń], [prefix]!')
+        text = ' '.join(str(number) for number in range(40))
+        self.assertEqual(make_snippet(f'{text} jazn', words, prefixes, size=4), '…37 38 39 [jazn]')
+        self.assertEqual(make_snippet(f'jazn {text}', words, prefixes, size=3), '[jazn] 0 1…')
+
+
+class TestMessageIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir, self.inbox = make_inbox()
+        self.index = MessageIndex(os.path.join(self.temp_dir, 'cache', 'messages.sqlite3'))
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.temp_dir)
+
+    def update(self, workers=1, cancel=None):
+        with redirect_stdout(StringIO()):
+            return self.index.update(self.inbox, OPTIONS, workers, cancel)
+
+    def test_search(self):
+        self.assertEqual(self.update(), 6)
+        hits = self.index.search('jazn')
+        self.assertEqual({hit.title for hit in hits}, {'Emily Smith_1', 'Someone Else_2'})
+        self.assertEqual({(hit.conversation, hit.position, hit.timestamp) for hit in hits},
+                         {('e2e', 1, 1700000001000)})
+        self.assertEqual(hits[0].snippet, 'gęślą [jaźń]')
+        self.assertEqual(len(self.index.search('"gesla jazn"')), 2)
+        self.assertEqual(self.index.search('"jazn gesla"'), [])
+
+    def test_filters(self):
+        self.update()
+        self.assertEqual([hit.sender for hit in self.index.search('jazn', sender='someone')], ['Someone Else'])
+        self.assertEqual(self.index.search('jazn', sender='nobody'), [])
+        self.assertEqual(len(self.index.search('', sender='someone')), 1)
+        self.assertEqual(len(self.index.search('jazn', start_ts=1700000001000, end_ts=1700000001001)), 2)
+        self.assertEqual(self.index.search('jazn', start_ts=1700000000000, end_ts=1700000001000), [])
+        self.assertEqual(len(self.index.search('jazn', start_ts=1700000001000)), 2)
+        self.assertEqual(self.index.search(''), [])
+
+    def test_update_is_incremental(self):
+        self.assertEqual(self.update(workers=2), 6)
+        self.assertEqual(self.update(), 0)
+
+        os.remove(os.path.join(self.inbox, 'e2e', 'Someone Else_2.json'))
+        changed = os.path.join(self.inbox, 'e2e', 'Emily Smith_1.json')
+        with open(changed, 'w', encoding='utf-8') as f:
+            f.write('{"threadName": "Emily Smith_1", "messages": '
+                    '[{"senderName": "Emily Smith", "timestamp": 1700000002000, "text": "nowy tekst"}]}')
+        self.assertEqual(self.update(), 1)
+        self.assertEqual(self.index.search('jazn'), [])
+        self.assertEqual([hit.position for hit in self.index.search('nowy')], [0])
+
+    def test_cancel_stops_update(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(extraction.ExtractionCancelled):
+            self.update(cancel=cancel)
+        self.assertEqual(self.index.indexed_files(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import glob
+import os
+import pstats
+import shutil
+import tracemalloc
+import unittest
+from unittest import mock
+
+import extraction
+import profiling
+from tests.test_extraction import OPTIONS, make_inbox
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir, self.inbox = make_inbox()
+        self.diagnostics = os.path.join(self.temp_dir, 'diagnostics')
+
+    def tearDown(self):
+        profiling.disable()
+        shutil.rmtree(self.temp_dir)
+
+    def test_disabled_records_nothing(self):
+        profiling.disable()
+        self.assertIsNone(profiling.start('extract'))
+        with profiling.profiled('extract'):
+            self.assertFalse(tracemalloc.is_tracing())
+        extraction.extract_all_conversations(self.inbox, OPTIONS)
+        self.assertFalse(os.path.exists(self.diagnostics))
+
+    def test_writes_stats_and_allocations(self):
+        profiling.enable(self.diagnostics)
+        extraction.extract_all_conversations(self.inbox, OPTIONS)
+        self.assertFalse(tracemalloc.is_tracing())
+
+        [stats_file] = glob.glob(os.path.join(self.diagnostics, '*-extract.pstats'))
+        functions = {function for _, _, function in pstats.Stats(stats_file).stats}
+        self.assertIn('read_columns', functions)
+        [allocations] = glob.glob(os.path.join(self.diagnostics, '*-extract-allocations.txt'))
+        with open(allocations, 'r', encoding='utf-8') as f:
+            self.assertTrue(f.readline().startswith('Traced memory'))
+
+    def test_session_spans_several_stretches(self):
+        profiling.enable(self.diagnostics)
+        session = profiling.start('populate')
+        for _ in range(2):
+            with profiling.recording(session):
+                sorted(range(1000), reverse=True)
+        profiling.finish(session)
+        [stats_file] = glob.glob(os.path.join(self.diagnostics, '*-populate.pstats'))
+        calls = {function: stat[1] for (_, _, function), stat in pstats.Stats(stats_file).stats.items()}
+        self.assertEqual(calls["<built-in method builtins.sorted>"], 2)
+
+    def test_recording_skips_when_another_profiler_runs(self):
+        profiling.enable(self.diagnostics)
+        session = profiling.start('populate')
+        # What cProfile does on Python 3.12+ while another profiler is active
+        session.profile.enable = mock.Mock(side_effect=ValueError('Another profiling tool is already active'))
+        session.profile.disable = mock.Mock()
+        with profiling.recording(session):
+            sorted(range(10))
+        session.profile.disable.assert_not_called()
+        profiling.finish(session)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import re
+import shutil
+import threading
+import unittest
+from unittest.mock import patch
+
+import extraction
+import regex_scan
+from tests.test_extraction import OPTIONS, make_inbox
+
+
+def collect(inbox, pattern, workers=1, options=OPTIONS, flags=0):
+    """Runs a scan to the end, returns its FileScan results and the final (done, total)"""
+    scans = []
+    progress = None
+    for shard, done, total, elapsed in regex_scan.iter_scan(inbox, pattern, options, workers, flags=flags):
+        scans.extend(shard)
+        progress = (done, total)
+    return scans, progress
+
+
+class TestRegexScan(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir, self.inbox = make_inbox()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_hits_and_counts(self):
+        scans, progress = collect(self.inbox, r'ja\w+ń', flags=re.IGNORECASE)
+        self.assertEqual(progress, (5, 5))
+        matched = {scan.title: scan for scan in scans if scan.count}
+        self.assertEqual(set(matched), {'Emily Smith_1', 'Someone Else_2'})
+        hit = matched['Someone Else_2'].hits[0]
+        self.assertEqual((hit.position, hit.sender, hit.match, hit.text), (1, 'Someone Else', 'jaźń', 'gęślą jaźń'))
+        # Every file was read, with or without matches
+        self.assertTrue(all(scan.bytes > 0 for scan in scans))
+
+    def test_parallel_matches_serial(self):
+        serial, _ = collect(self.inbox, r'\w+um\b')
+        parallel, progress = collect(self.inbox, r'\w+um\b', workers=2)
+        self.assertEqual(progress, (5, 5))
+        self.assertEqual(sorted(parallel), sorted(serial))
+        self.assertGreater(sum(scan.count for scan in serial), 0)
+
+    def test_date_range_and_hit_cap(self):
+        options = OPTIONS._replace(start_ts=1700000001000)
+        scans, _ = collect(self.inbox, r'\w', options=options)
+        self.assertEqual({scan.title for scan in scans if scan.count}, {'Emily Smith_1', 'Someone Else_2'})
+        self.assertEqual([scan.count for scan in scans if scan.count], [9, 9])
+
+        with patch.object(regex_scan, 'MAX_HITS', 3):
+            scans, _ = collect(self.inbox, r'\w', options=options)
+        self.assertEqual([(scan.count, len(scan.hits)) for scan in scans if scan.count], [(9, 3), (9, 3)])
+
+    def test_hit_cap_covers_every_file_of_a_conversation(self):
+        folder = os.path.join(self.inbox, 'emilyjohn_123456789')
+        shutil.copy(os.path.join(folder, 'messages.json'), os.path.join(folder, 'message_2.json'))
+        scans, _ = collect(self.inbox, r'\w')
+        counts = [scan.count for scan in scans if scan.conversation == 'emilyjohn_123456789']
+        self.assertEqual(len(counts), 2)
+        with patch.object(regex_scan, 'MAX_HITS', 3):
+            scans, _ = collect(self.inbox, r'\w')
+        files = [scan for scan in scans if scan.conversation == 'emilyjohn_123456789']
+        self.assertEqual([scan.count for scan in files], counts)
+        self.assertEqual(sum(len(scan.hits) for scan in files), 3)
+        # e2e files are separate chats, each keeps its own matches
+        self.assertEqual(regex_scan.chat_key(regex_scan.FileScan('e2e', 'Emily Smith_1', 1, [], 1)),
+                         ('e2e', 'Emily Smith_1'))
+
+    def test_context(self):
+        text = 'a' * 60 + 'MATCH' + 'b' * 60
+        self.assertEqual(regex_scan._context(text, 60, 65), '…' + 'a' * 40 + 'MATCH' + 'b' * 40 + '…')
+        self.assertEqual(regex_scan._context('one\ntwo', 0, 3), 'one two')
+
+    def test_invalid_pattern_and_cancel(self):
+        with self.assertRaises(re.error):
+            collect(self.inbox, '(')
+        cancel = threading.Event()
+        cancel.set()
+        for workers in (1, 2):
+            with self.assertRaises(extraction.ExtractionCancelled):
+                list(regex_scan.iter_scan(self.inbox, 'a', OPTIONS, workers, cancel))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+from types import SimpleNamespace
+
+from gui.virtual_table import VirtualTable
+from row_model import RowModel
+
+
+class FakeTreeview:
+    """Records the items a VirtualTable creates and what it renders in them"""
+
+    def __init__(self, height):
+        self.height = height
+        self.items = {}
+        self.created = 0
+        self.selected = ()
+
+    def cget(self, option):
+        return self.height
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def insert(self, parent, index):
+        self.created += 1
+        item = f'I{self.created}'
+        self.items[item] = {}
+        return item
+
+    def delete(self, *items):
+        for item in items:
+            del self.items[item]
+
+    def item(self, item, **options):
+        self.items[item].update(options)
+
+    def selection_set(self, items):
+        self.selected = tuple(items)
+
+    def selection(self):
+        return self.selected
+
+    def bbox(self, item):
+        return ''
+
+
+def make_model(count):
+    model = RowModel()
+    for row in range(count):
+        model.set_row(row, (f'Chat {row}', set(), 'Private chat', row))
+    return model
+
+
+class TestRowModel(unittest.TestCase):
+    def test_set_row_keeps_position(self):
+        model = make_model(3)
+        self.assertFalse(model.set_row(1, ('Renamed', set(), 'Group chat', 7)))
+        self.assertEqual(model.order, [0, 1, 2])
+        self.assertEqual(model.value(1, 'msg'), 7)
+
+    def test_sort_is_typed(self):
+        model = RowModel()
+        model.set_row('a', ('Zoe', {'Zoe', 'Me'}, 'Private chat', 9))
+        model.set_row('b', ('Adam', {'Adam', 'Eve', 'Me'}, 'Group chat', 10))
+        model.set_row('c', ('Bob', {'Bob', 'Me'}, 'Private chat', 100))
+        model.sort([('msg', False)])
+        # Numbers, not their text
+        self.assertEqual(model.order, ['a', 'b', 'c'])
+        model.sort([('name', True)])
+        self.assertEqual(model.order, ['a', 'c', 'b'])
+        model.sort([('pep', True)])
+        self.assertEqual(model.order, ['b', 'a', 'c'])
+
+    def test_multi_column_sort(self):
+        model = RowModel()
+        for row, (room, messages) in enumerate([('Private', 5), ('Group', 5), ('Private', 7), ('Group', 1)]):
+            model.set_row(row, (f'Chat {row}', set(), room, messages))
+        model.sort([('type', False), ('msg', False)])
+        self.assertEqual(model.order, [3, 1, 0, 2])
+        # Mixed directions
+        model.sort([('type', False), ('msg', True)])
+        self.assertEqual(model.order, [1, 3, 2, 0])
+        model.sort([('msg', True), ('type', True)])
+        self.assertEqual(model.order, [2, 0, 1, 3])
+
+    def test_matching_in_display_order(self):
+        model = make_model(12)
+        model.reorder(reversed(range(12)))
+        self.assertEqual(model.matching('Chat 1'), [11, 10, 1])
+
+
+class TestVirtualTable(unittest.TestCase):
+    def setUp(self):
+        self.model = make_model(1000)
+        self.treeview = FakeTreeview(height=10)
+        self.positions = []
+        self.table = VirtualTable(self.treeview, SimpleNamespace(set=lambda *span: self.positions.append(span)),
+                                  self.model)
+
+    def shown(self):
+        return [values['values'][0] for values in self.treeview.items.values()]
+
+    def test_renders_only_the_visible_window(self):
+        self.table.refresh()
+        self.assertEqual(len(self.treeview.items), 10)
+        self.assertEqual(self.shown()[0], 'Chat 0')
+        self.assertEqual(self.positions[-1], (0.0, 0.01))
+
+    def test_scrolling_recycles_items(self):
+        self.table.refresh()
+        self.table.yview('moveto', '0.5')
+        self.table.yview('scroll', '1', 'pages')
+        self.assertEqual(self.treeview.created, 10)
+        self.assertEqual(self.shown(), [f'Chat {row}' for row in range(510, 520)])
+        # Stripes follow the position in the model, not the item
+        self.assertEqual(self.treeview.items['I2']['tags'], ('odd',))
+
+    def test_scrolling_is_clamped(self):
+        self.table.yview('scroll', '-5', 'units')
+        self.assertEqual(self.table.first, 0)
+        self.table.yview('moveto', '1.0')
+        self.assertEqual(self.table.first, 990)
+
+    def test_selection_follows_rows(self):
+        self.model.select([3, 500])
+        self.table.see(500)
+        self.assertEqual(self.treeview.selected, ('I1',))
+        self.assertEqual(self.table.row_of('I1'), 500)
+
+        # Deselecting the visible row in the treeview keeps the one scrolled out of view
+        self.treeview.selected = ()
+        self.table._selection_changed(None)
+        self.assertEqual(self.model.selection, {3})
+
+    def test_shrinking_model_deletes_items(self):
+        self.table.refresh()
+        self.model.clear()
+        self.table.reset()
+        self.assertEqual(self.treeview.items, {})
+        self.assertEqual(self.positions[-1], (0.0, 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
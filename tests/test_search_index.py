@@ -0,0 +1,55 @@
+import unittest
+
+from search_index import SearchIndex
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.set_row(0, 'Łukasz Wiśniewski', {'Łukasz Wiśniewski', 'John Doe'})
+        self.index.set_row(1, 'Weekend trip', {'Zoë Müller', 'Łukasz Wiśniewski', 'John Doe'})
+        self.index.set_row(2, 'Zoë Müller', {'Zoë Müller', 'John Doe'})
+
+    def test_folded_matches(self):
+        self.assertEqual(self.index.search('wisniewski'), {0, 1})
+        self.assertEqual(self.index.search('ZOE'), {1, 2})
+        self.assertEqual(self.index.search('trip'), {1})
+        self.assertEqual(self.index.search('MÜ'), {1, 2})
+        self.assertEqual(self.index.search('nobody'), set())
+        self.assertEqual(self.index.search('  '), set())
+
+    def test_rows_are_indexed_as_they_are_set(self):
+        self.assertEqual(sorted(self.index.texts),
+                         ['john doe', 'weekend trip', 'zoe muller', 'łukasz wisniewski'])
+        self.index.remove_row(0)
+        self.assertEqual(self.index.search('wisniewski'), {1})
+        self.index.set_row(1, 'Weekend trip', {'John Doe'})
+        self.assertEqual(self.index.search('wisniewski'), set())
+
+    def test_shared_names_are_indexed_once(self):
+        self.assertEqual(self.index.rows[self.index.ids['john doe']], {0, 1, 2})
+        self.assertEqual(self.index.rows[self.index.ids['zoe muller']], {1, 2})
+        self.assertEqual(list(self.index.postings['mul']), [self.index.ids['zoe muller']])
+
+    def test_growing_query_refines_last_matches(self):
+        self.index.search('do')
+        self.assertEqual(self.index.last[1], [self.index.ids['john doe']])
+        self.assertEqual(self.index.search('doe'), {0, 1, 2})
+        self.assertEqual(self.index.search('john doe'), {0, 1, 2})
+        # A different query starts over
+        self.assertEqual(self.index.search('week'), {1})
+
+    def test_reindexing_a_row_drops_its_old_texts(self):
+        self.index.search('trip')
+        self.index.set_row(1, 'Renamed', {'Alice'})
+        self.assertEqual(self.index.search('trip'), set())
+        self.assertEqual(self.index.search('alice'), {1})
+        self.assertEqual(self.index.search('zoe'), {2})
+        self.assertNotIn(self.index.ids['weekend trip'], self.index.rows)
+        # The text comes back with a row using it again
+        self.index.set_row(3, 'Weekend Trip', set())
+        self.assertEqual(self.index.search('trip'), {3})
+
+
+if __name__ == '__main__':
+    unittest.main()
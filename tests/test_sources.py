@@ -0,0 +1,57 @@
+import os
+import shutil
+import unittest
+import zipfile
+
+import extraction
+import sources
+from tests.test_extraction import OPTIONS, make_inbox
+
+
+def by_title(conversations):
+    return sorted(conversations, key=lambda conversation: conversation[0])
+
+
+class TestZipSource(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir, self.inbox = make_inbox()
+        # A conversation with two files, so one of its halves lands in each part
+        group = os.path.join(self.inbox, 'group1_4437375262993687')
+        shutil.copy(os.path.join(group, 'messages.json'), os.path.join(group, 'message_2.json'))
+
+        # Split the export over two archives the way Facebook does
+        parts = [os.path.join(self.temp_dir, f'facebook-johndoe-part{number}.zip') for number in (1, 2)]
+        with zipfile.ZipFile(parts[0], 'w', zipfile.ZIP_DEFLATED) as first, \
+                zipfile.ZipFile(parts[1], 'w', zipfile.ZIP_DEFLATED) as second:
+            paths = sorted(os.path.join(root, file) for root, _, files in os.walk(self.inbox) for file in files)
+            for index, path in enumerate(paths):
+                name = 'your_facebook_activity/messages/inbox/' + os.path.relpath(path, self.inbox).replace(os.sep, '/')
+                (first if index % 2 else second).write(path, name)
+            first.writestr('your_facebook_activity/messages/photos/photo.json', '{}')
+            # Thread folders outside the inbox aren't conversations of the source
+            first.write(os.path.join(group, 'messages.json'),
+                        'your_facebook_activity/messages/archived_threads/group1_4437375262993687/message_1.json')
+        self.archives = sources.ZIP_SEPARATOR.join(parts)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_conversations_match_unpacked_folder(self):
+        self.assertTrue(sources.is_archive(self.archives))
+        self.assertFalse(sources.is_archive(self.inbox))
+        self.assertEqual(sorted(sources.list_conversations(self.archives)), sorted(os.listdir(self.inbox)))
+
+        unpacked = by_title(extraction.extract_all_conversations(self.inbox, OPTIONS))
+        for workers in (1, 2):
+            self.assertEqual(by_title(extraction.extract_all_conversations(self.archives, OPTIONS, workers)), unpacked)
+
+    def test_streamed_members_match(self):
+        streaming = OPTIONS._replace(stream_min_bytes=0)
+        self.assertEqual(
+            by_title(extraction.extract_all_conversations(self.archives, streaming)),
+            by_title(extraction.extract_all_conversations(self.inbox, OPTIONS))
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import io
+import time
+import unittest
+from contextlib import redirect_stdout
+
+from stall_watchdog import BUCKETS, StallWatchdog
+
+
+class FakeWindow:
+    """Collects the callbacks scheduled with after() instead of running an event loop"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+
+def block_event_loop(seconds):
+    time.sleep(seconds)
+
+
+class TestStallWatchdog(unittest.TestCase):
+    def test_histogram_buckets(self):
+        watchdog = StallWatchdog(FakeWindow(), threshold=1)
+        for delay in (0, 0.01, 0.07, 0.3, 10):
+            watchdog.record(delay)
+        self.assertEqual(sum(watchdog.histogram), 5)
+        self.assertEqual(watchdog.histogram[0], 2)
+        self.assertEqual(watchdog.histogram[-1], 1)
+        self.assertEqual(len(watchdog.histogram_lines()), len(BUCKETS) + 1)
+        self.assertEqual(len(watchdog.stalls), 1)
+
+    def test_stall_is_logged_with_main_thread_stack(self):
+        window = FakeWindow()
+        watchdog = StallWatchdog(window, threshold=0.05, interval_ms=10)
+        watchdog.start()
+        try:
+            # The heartbeat can't run while the "event loop" is busy here
+            block_event_loop(0.3)
+            output = io.StringIO()
+            with redirect_stdout(output):
+                window.scheduled.pop(0)()
+        finally:
+            watchdog.stop()
+
+        [(duration, stack)] = watchdog.stalls
+        self.assertGreaterEqual(duration, 0.2)
+        self.assertIn('block_event_loop', stack)
+        self.assertIn('Event loop stalled', output.getvalue())
+        # The next heartbeat is scheduled, and a prompt one isn't a stall
+        window.scheduled.pop(0)()
+        self.assertEqual(len(watchdog.stalls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
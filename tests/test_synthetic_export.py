@@ -0,0 +1,56 @@
+import filecmp
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import extraction
+from columns import ColumnStore
+from tests.test_extraction import OPTIONS
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from synthetic_export import generate_export  # noqa: E402
+
+
+class TestSyntheticExport(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def generate(self, name, **kwargs):
+        arguments = dict(conversations=12, messages=40, participants=4, messages_per_file=15, e2e_contacts=4,
+                         username='John Doe', seed=7)
+        arguments.update(kwargs)
+        return generate_export(os.path.join(self.temp_dir, name), **arguments)
+
+    def test_same_seed_same_export(self):
+        first, second = self.generate('a'), self.generate('b')
+        self.assertEqual(sorted(os.listdir(first)), sorted(os.listdir(second)))
+        for folder in os.listdir(first):
+            _, mismatch, errors = filecmp.cmpfiles(
+                os.path.join(first, folder), os.path.join(second, folder),
+                os.listdir(os.path.join(first, folder)), shallow=False
+            )
+            self.assertEqual((mismatch, errors), ([], []))
+
+    def test_export_extracts(self):
+        for schema in ('legacy', 'mixed'):
+            inbox = self.generate(schema, schema=schema)
+            conversations = extraction.extract_all_conversations(inbox, OPTIONS, store=ColumnStore())
+            # Half of the e2e contacts continue a private chat and are merged into it
+            self.assertEqual(len(conversations), 12 + 2)
+            self.assertTrue(any(len(os.listdir(os.path.join(inbox, folder))) > 1
+                                for folder in os.listdir(inbox) if folder != 'e2e'))
+            names = {name for conversation in conversations for name in conversation[1]}
+            self.assertIn('John Doe', names)
+            # Mojibake is repaired, no name keeps UTF-8 bytes read as Latin-1
+            self.assertFalse(any('Ã' in name or 'Å' in name for name in names))
+            self.assertTrue(any(not name.isascii() for name in names))
+
+
+if __name__ == '__main__':
+    unittest.main()